@@ -0,0 +1,145 @@
+"""
+Measures the query count, latency and peak memory of every endpoint of the dairy, poultry and inventory routers
+against a seeded farm, and fails when an endpoint exceeds its query budget or an earlier report.
+
+The file doesn't match the test file pattern, so the regular test run skips it. Run it on its own:
+
+    python -m pytest benchmarks/bench_endpoints.py --rows 10000 --benchmark-json report.json
+    python -m pytest benchmarks/bench_endpoints.py --rows 10000 --baseline report.json
+
+Query budgets live in `query_budgets.json`, per URL name with a default for the others. A budget is the number of
+queries an endpoint needs regardless of the size of the farm, so raise it only with the change that needs it.
+"""
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+import dairy.urls
+import dairy_inventory.urls
+import poultry.urls
+import poultry_inventory.urls
+from benchmarks.utils import percentile
+
+URL_MODULES = [dairy.urls, poultry.urls, dairy_inventory.urls, poultry_inventory.urls]
+
+# Query parameters of the endpoints that reject a request without them
+QUERY_PARAMS = {
+    "dairy:cows-inbreeding": lambda farm: {"sire": farm["bull"], "dam": farm["milking_cow"]},
+}
+
+
+@dataclass
+class Endpoint:
+    """
+    A GET endpoint of a router.
+
+    Attributes:
+    - `name`: The namespaced URL name.
+    - `model`: The model whose first row is the object of detail endpoints, `None` for list endpoints.
+    """
+
+    name: str
+    model: type = None
+
+    def url(self, farm):
+        args = []
+        if self.model is not None:
+            pk = self.model.objects.order_by("pk").values_list("pk", flat=True).first()
+            if pk is None:
+                pytest.skip(f"No {self.model.__name__} was seeded.")
+            args = [pk]
+        return reverse(self.name, args=args)
+
+
+def get_model(viewset):
+    if viewset.queryset is not None:
+        return viewset.queryset.model
+    return viewset.serializer_class.Meta.model
+
+
+def collect_endpoints():
+    """
+    Returns an `Endpoint` per list, retrieve and GET extra action of the routers in `URL_MODULES`.
+    """
+    endpoints = []
+    for module in URL_MODULES:
+        router = module.router
+        for prefix, viewset, basename in router.registry:
+            name = f"{module.app_name}:{basename or router.get_default_basename(viewset)}"
+            if hasattr(viewset, "list"):
+                endpoints.append(Endpoint(f"{name}-list"))
+            if hasattr(viewset, "retrieve"):
+                endpoints.append(Endpoint(f"{name}-detail", get_model(viewset)))
+            for action in viewset.get_extra_actions():
+                if "get" in action.mapping:
+                    model = get_model(viewset) if action.detail else None
+                    endpoints.append(Endpoint(f"{name}-{action.url_name}", model))
+    return endpoints
+
+
+def timed_get(client, url, params):
+    started = time.perf_counter()
+    response = client.get(url, params)
+    if response.streaming:
+        # Streamed bodies are produced while they are consumed
+        b"".join(response.streaming_content)
+    return response, time.perf_counter() - started
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", collect_endpoints(), ids=lambda endpoint: endpoint.name)
+def test_endpoint(endpoint, setup_users, seeded_farm, query_budgets, baseline, benchmark_report, request):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {setup_users['farm_owner_token']}")
+    url = endpoint.url(seeded_farm)
+    params = QUERY_PARAMS.get(endpoint.name, lambda farm: {})(seeded_farm)
+
+    # Warms up the URL resolver, serializer fields and connection before anything is measured
+    response, _ = timed_get(client, url, params)
+    if response.status_code == 405:
+        pytest.skip(f"{endpoint.name} doesn't serve GET requests.")
+    assert response.status_code < 400, response.content[:500] if not response.streaming else response.status_code
+
+    with CaptureQueriesContext(connection) as context:
+        timed_get(client, url, params)
+    queries = len(context.captured_queries)
+
+    latencies = [timed_get(client, url, params)[1] for _ in range(request.config.getoption("--repeat"))]
+
+    tracemalloc.start()
+    timed_get(client, url, params)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        "url": url,
+        "status": response.status_code,
+        "queries": queries,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "peak_memory_kib": round(peak_memory / 1024, 1),
+    }
+    benchmark_report[endpoint.name] = result
+
+    budget = query_budgets["endpoints"].get(endpoint.name, query_budgets["default"])
+    assert queries <= budget, (
+        f"{endpoint.name} ran {queries} queries, its budget is {budget}:\n"
+        + "\n".join(query["sql"] for query in context.captured_queries)
+    )
+
+    previous = baseline.get(endpoint.name)
+    if previous:
+        tolerance = request.config.getoption("--latency-tolerance")
+        assert queries <= previous["queries"], f"{endpoint.name} ran {queries} queries, {previous['queries']} before."
+        assert result["p95_ms"] <= previous["p95_ms"] * tolerance, (
+            f"{endpoint.name} took {result['p95_ms']} ms at p95, {previous['p95_ms']} ms before."
+        )
+        assert result["peak_memory_kib"] <= previous["peak_memory_kib"] * tolerance, (
+            f"{endpoint.name} peaked at {result['peak_memory_kib']} KiB, {previous['peak_memory_kib']} KiB before."
+        )
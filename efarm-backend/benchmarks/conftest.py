@@ -0,0 +1,80 @@
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+import pytest
+import rest_framework
+
+from benchmarks.seed import seed_flocks, seed_herd
+from tests.conftest import isolated_cache  # noqa: F401
+from tests.dairy.tests.conftest import setup_users  # noqa: F401
+
+QUERY_BUDGETS = Path(__file__).with_name("query_budgets.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--rows", type=int, default=1000, help="The number of record rows to seed, e.g. 1000, 10000 or 100000.")
+    group.addoption("--repeat", type=int, default=20, help="The number of timed requests per endpoint.")
+    group.addoption("--benchmark-json", default=None, help="Where to write the JSON report of the run.")
+    group.addoption("--baseline", default=None, help="A JSON report of an earlier run that this run must not exceed.")
+    group.addoption(
+        "--latency-tolerance",
+        type=float,
+        default=1.5,
+        help="How many times the baseline p95 latency and peak memory an endpoint may take.",
+    )
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker, request):
+    # Seeded once per run, outside the transactions the benchmarks roll back
+    rows = request.config.getoption("--rows")
+    with django_db_blocker.unblock():
+        request.config.seeded_farm = {"rows": rows, **seed_herd(rows), **seed_flocks(rows)}
+
+
+@pytest.fixture(scope="session")
+def seeded_farm(django_db_setup, request):
+    return request.config.seeded_farm
+
+
+@pytest.fixture(scope="session")
+def query_budgets():
+    with open(QUERY_BUDGETS) as file:
+        return json.load(file)
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    path = request.config.getoption("--baseline")
+    if not path:
+        return {}
+    with open(path) as file:
+        return json.load(file)["endpoints"]
+
+
+@pytest.fixture(scope="session")
+def benchmark_report(request):
+    endpoints = {}
+    yield endpoints
+
+    path = request.config.getoption("--benchmark-json")
+    if not path:
+        return
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": request.config.getoption("--rows"),
+        "repeat": request.config.getoption("--repeat"),
+        "versions": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "djangorestframework": rest_framework.VERSION,
+        },
+        "endpoints": dict(sorted(endpoints.items())),
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
@@ -0,0 +1,77 @@
+"""
+Measures the throughput and peak memory of the milk record exports against the JSON list serializer.
+
+Runs against a throwaway test database, so it never touches the configured one:
+
+    python -m benchmarks.export_throughput --rows 50000
+"""
+import argparse
+import io
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from benchmarks.utils import measure, test_database
+from dairy.exporters import MilkExporter
+from dairy.models import Cow, CowBreed, Milk
+from dairy.serializers import MilkSerializer
+
+
+def seed_milk_records(rows, cows=50):
+    breed = CowBreed.objects.create(name="Friesian")
+    herd = Cow.objects.bulk_create(
+        Cow(
+            name=f"Cow {chr(ord('a') + index % 26)}{chr(ord('a') + index // 26)}",
+            breed=breed,
+            date_of_birth=date(2020, 1, 1),
+            gender="Female",
+        )
+        for index in range(cows)
+    )
+    for cow in herd:
+        cow.tag_number = Cow.manager.get_tag_number(cow)
+    Cow.objects.bulk_update(herd, ["tag_number"])
+
+    Milk.objects.bulk_create(
+        (Milk(cow=herd[index % cows], amount_in_kgs=Decimal("12.50")) for index in range(rows)),
+        batch_size=5000,
+    )
+
+
+def run(rows, chunk_size):
+    seed_milk_records(rows)
+    exporter = MilkExporter(chunk_size=chunk_size)
+
+    def export_csv_stream():
+        for line in exporter.iter_csv():
+            pass
+
+    def export_parquet():
+        with tempfile.TemporaryFile() as file:
+            exporter.write_parquet(file)
+
+    def serialize_json_list():
+        MilkSerializer(Milk.objects.all(), many=True).data
+
+    print(f"Exporting {rows:,} milk records in chunks of {chunk_size:,}")
+    measure("CSV stream", rows, export_csv_stream)
+    measure("CSV file", rows, lambda: exporter.write_csv(io.StringIO()))
+    try:
+        measure("Parquet file", rows, export_parquet)
+    except ValueError as e:
+        print(f"{'Parquet file':<28} skipped: {e}")
+    measure("JSON list serializer", rows, serialize_json_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=MilkExporter.chunk_size)
+    args = parser.parse_args()
+
+    with test_database():
+        run(args.rows, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measures the lactation curve analytics on synthetic daily milk yields.
+
+The vectorized Wood's curve fit is compared with fitting one lactation at a time on in-memory arrays, and the
+whole pipeline, from the daily yield query to the yield figures, is timed on a throwaway test database:
+
+    python -m benchmarks.lactation_curves --rows 5000000 --db-rows 200000
+"""
+import argparse
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.utils import timezone
+
+from benchmarks.utils import measure, test_database
+from dairy.analytics import DailyYields, LactationCurveAnalyzer
+from dairy.models import Cow, CowBreed, Lactation, Milk
+
+LACTATION_DAYS = 300
+
+
+def synthetic_daily_yields(rows, seed=0):
+    """
+    Generates Wood's curve shaped daily yields with noise, `LACTATION_DAYS` days per lactation.
+    """
+    rng = np.random.default_rng(seed)
+    lactations = max(rows // LACTATION_DAYS, 1)
+    group = np.repeat(np.arange(lactations), LACTATION_DAYS)
+    days_in_milk = np.tile(np.arange(1, LACTATION_DAYS + 1), lactations)
+    a = rng.uniform(15, 25, lactations)[group]
+    b = rng.uniform(0.15, 0.25, lactations)[group]
+    c = rng.uniform(0.003, 0.005, lactations)[group]
+    yields = a * days_in_milk**b * np.exp(-c * days_in_milk) * rng.normal(1, 0.05, len(group))
+    return DailyYields(np.arange(1, lactations + 1), group, days_in_milk, yields)
+
+
+def fit_one_lactation_at_a_time(daily_yields):
+    parameters = []
+    for group in range(len(daily_yields.lactation_ids)):
+        in_group = daily_yields.group == group
+        t = daily_yields.days_in_milk[in_group].astype(np.float64)
+        design = np.column_stack([np.ones_like(t), np.log(t), -t])
+        solution, *rest = np.linalg.lstsq(design, np.log(daily_yields.yields[in_group]), rcond=None)
+        parameters.append(solution)
+    return parameters
+
+
+def seed_milk_records(rows):
+    breed = CowBreed.objects.create(name="Friesian")
+    lactations = max(rows // LACTATION_DAYS, 1)
+    start_date = timezone.localdate() - timedelta(days=LACTATION_DAYS + 1)
+    cows = Cow.objects.bulk_create(
+        Cow(
+            name=f"Cow {chr(ord('a') + index % 26)}{chr(ord('a') + index // 26 % 26)}",
+            breed=breed,
+            date_of_birth=date(2020, 1, 1),
+            gender="Female",
+        )
+        for index in range(lactations)
+    )
+    lactations = Lactation.objects.bulk_create(Lactation(cow=cow, start_date=start_date) for cow in cows)
+
+    rng = np.random.default_rng(0)
+    for day in range(1, LACTATION_DAYS + 1):
+        amounts = 20 * day**0.2 * np.exp(-0.004 * day) * rng.normal(1, 0.05, len(lactations))
+        milk_records = Milk.objects.bulk_create(
+            Milk(cow_id=lactation.cow_id, lactation=lactation, amount_in_kgs=Decimal(f"{amount:.2f}"))
+            for lactation, amount in zip(lactations, amounts)
+        )
+        milking_date = timezone.make_aware(datetime.combine(start_date + timedelta(days=day), time(6)))
+        Milk.objects.filter(id__gte=milk_records[0].id, id__lte=milk_records[-1].id).update(
+            milking_date=milking_date
+        )
+    return lactations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Daily yields for the in-memory fit.")
+    parser.add_argument("--db-rows", type=int, default=200_000, help="Milk records for the database run.")
+    args = parser.parse_args()
+
+    daily_yields = synthetic_daily_yields(args.rows)
+    lactations = len(daily_yields.lactation_ids)
+    print(f"{args.rows:,} daily yields in {lactations:,} lactations")
+    analyzer = measure("Vectorized fit", args.rows, lambda: LactationCurveAnalyzer(daily_yields))
+    measure("Yield figures", args.rows, analyzer.analyze)
+
+    sample = synthetic_daily_yields(min(args.rows, 300_000))
+    measure("One lactation at a time", len(sample.group), lambda: fit_one_lactation_at_a_time(sample))
+
+    if args.db_rows:
+        with test_database():
+            lactations = seed_milk_records(args.db_rows)
+            print(f"{args.db_rows:,} milk records in {len(lactations):,} lactations")
+            measure(
+                "Query, fit and figures",
+                args.db_rows,
+                lambda: LactationCurveAnalyzer.for_lactations(lactations).analyze(),
+            )
+
+
+if __name__ == "__main__":
+    main()
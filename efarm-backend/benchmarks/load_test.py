@@ -0,0 +1,200 @@
+"""
+Compares the requests/s and latency of the dashboard endpoints served over WSGI, by gunicorn, and over ASGI, by
+uvicorn, against a seeded farm.
+
+Both servers run the same number of worker processes against a throwaway test database, with the response cache
+off so that every request computes its dashboard. The requests are sent over keep-alive connections by
+`--concurrency` simultaneous clients, cycling through the dashboard endpoints:
+
+    python -m benchmarks.load_test --rows 10000 --workers 2 --concurrency 32 --requests 2000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from benchmarks.utils import percentile, test_database
+from django.conf import settings
+from django.db import connection
+
+import dairy.urls
+from benchmarks.seed import seed_herd
+from efarm.async_views import AsyncAPIView
+
+SERVER_SETTINGS = "benchmarks.load_test_settings"
+STARTUP_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class LoadResult:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+
+def get_dashboard_paths():
+    return [
+        f"/dairy/{pattern.pattern}"
+        for pattern in dairy.urls.urlpatterns
+        if issubclass(getattr(pattern.callback, "view_class", object), AsyncAPIView)
+    ]
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_server_commands(port, workers, threads):
+    bind = f"127.0.0.1:{port}"
+    return {
+        "wsgi (gunicorn)": [
+            sys.executable, "-m", "gunicorn", "efarm.wsgi:application", "--bind", bind,
+            "--workers", str(workers), "--threads", str(threads), "--log-level", "warning",
+        ],
+        "asgi (uvicorn)": [
+            sys.executable, "-m", "uvicorn", "efarm.asgi:application", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+    }
+
+
+def wait_for_server(port, process):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"The server didn't accept connections within {STARTUP_TIMEOUT_SECONDS} s")
+
+
+async def read_response(reader):
+    """
+    Reads an HTTP/1.1 response and returns its status code and whether the server keeps the connection open.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("The server closed the connection")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("connection") != "close"
+
+
+async def run_client(port, paths, requests, result):
+    reader = writer = None
+    for path in paths:
+        if next(requests, None) is None:
+            break
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: application/json\r\n\r\n".encode())
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            status, keep_alive = None, False
+        if status == 200:
+            result.latencies.append(time.perf_counter() - started)
+        else:
+            result.errors += 1
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(port, paths, concurrency, requests):
+    # The clients share one budget of requests, and start on different endpoints
+    remaining = iter(range(requests))
+    results = [LoadResult() for _ in range(concurrency)]
+    await asyncio.gather(
+        *(
+            run_client(port, itertools.islice(itertools.cycle(paths), index, None), remaining, result)
+            for index, result in enumerate(results)
+        )
+    )
+    return results
+
+
+def report(name, results, elapsed):
+    latencies = [latency for result in results for latency in result.latencies] or [0]
+    requests = sum(len(result.latencies) for result in results)
+    errors = sum(result.errors for result in results)
+    print(
+        f"{name:<16} {requests:8,} requests {requests / elapsed:10,.1f} requests/s "
+        f"{percentile(latencies, 50) * 1000:8.1f} ms p50 {percentile(latencies, 99) * 1000:8.1f} ms p99 "
+        f"{errors:6,} errors"
+    )
+
+
+def run(args, env):
+    paths = get_dashboard_paths()
+    print(
+        f"{len(paths)} dashboard endpoints, {args.requests:,} requests from {args.concurrency} clients, "
+        f"{args.workers} workers per server"
+    )
+    port = get_free_port()
+    for name, command in get_server_commands(port, args.workers, args.threads).items():
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            wait_for_server(port, process)
+            # Warms up the workers and their database connections
+            asyncio.run(run_load(port, paths, args.concurrency, args.concurrency * len(paths)))
+            started = time.perf_counter()
+            results = asyncio.run(run_load(port, paths, args.concurrency, args.requests))
+            report(name, results, time.perf_counter() - started)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="The approximate number of milk records.")
+    parser.add_argument("--workers", type=int, default=2, help="The number of worker processes per server.")
+    parser.add_argument("--threads", type=int, default=1, help="The number of threads per gunicorn worker.")
+    parser.add_argument("--concurrency", type=int, default=32, help="The number of simultaneous clients.")
+    parser.add_argument("--requests", type=int, default=2000, help="The number of requests per server.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == "sqlite":
+            settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = str(Path(directory) / "load_test.sqlite3")
+        with test_database():
+            seed_herd(args.rows)
+            # The servers share the test database, whose name the test runner set
+            env = {
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": SERVER_SETTINGS,
+                "EFARM_DATABASE_NAME": str(connection.settings_dict["NAME"]),
+            }
+            connection.close()
+            run(args, env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Settings of the servers started by `benchmarks.load_test`: the project settings as deployed, without the response
+cache, so that every request computes its dashboard rather than reading it from the cache.
+"""
+from efarm.settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }
+}
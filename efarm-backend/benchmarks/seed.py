@@ -0,0 +1,283 @@
+"""
+Seeds herds and flocks of a configurable size for the benchmarks.
+
+Cows and flocks are loaded through the register importers, so they pass the same validation and get the same
+ancestry, lactations, breeding calendar and inventories as an imported farm. The record histories, which make up
+most of the rows, are inserted with `bulk_create`.
+"""
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from dairy.choices import *
+from dairy.importers import HerdImporter
+from dairy.models import (
+    Barn,
+    BreedingEvent,
+    Cow,
+    CowInPenMovement,
+    CowPen,
+    CullingRecord,
+    Heat,
+    Insemination,
+    Inseminator,
+    Lactation,
+    Milk,
+    Pregnancy,
+    QuarantineRecord,
+    WeightRecord,
+)
+from dairy.signals import milk_records_bulk_created
+from efarm.clock import todays_date
+from jobs.worker import run_batch
+from poultry.choices import *
+from poultry.importers import FlockImporter
+from poultry.models import (
+    EggCollection,
+    Flock,
+    FlockBreed,
+    FlockBreedInformation,
+    FlockInspectionRecord,
+    FlockMovement,
+    HousingStructure,
+)
+
+BATCH_SIZE = 5000
+
+
+def alphabetic_name(prefix, index):
+    """
+    Returns a unique name made of letters only, as the cow name validation requires.
+    """
+    letters = ""
+    index += 26**3
+    while index:
+        index, remainder = divmod(index, 26)
+        letters = chr(ord("a") + remainder) + letters
+    return f"{prefix} {letters}"
+
+
+def import_register(importer, rows):
+    file = io.StringIO()
+    writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    file.seek(0)
+
+    result = importer.run(file)
+    if result.rejected:
+        raise ValueError(f"The seeded register was rejected: {result.rejected[:3]}")
+    return result
+
+
+def run_queued_jobs():
+    # Applies the inventory updates that the seeded records queued
+    while run_batch():
+        pass
+
+
+def seed_herd(rows):
+    """
+    Seeds a herd whose record histories hold about `rows` rows.
+
+    The herd has `rows // 10` cows: bulls, milking cows with an ongoing lactation, and their calves. The milking
+    cows have a heat record each, a third of them are pregnant after an insemination, and there are `rows` milk
+    records and a weight record per cow.
+
+    Returns:
+    - `dict`: The number of cows and the IDs of a bull and a milking cow, for endpoints that take them as
+              parameters.
+    """
+    today = todays_date()
+    cows = max(rows // 10, 30)
+    bulls = max(cows // 10, 1)
+    dams = (cows - bulls) // 2
+    calves = cows - bulls - dams
+    breeds = [CowBreedChoices.FRIESIAN, CowBreedChoices.AYRSHIRE, CowBreedChoices.JERSEY]
+
+    register = []
+    for index in range(bulls):
+        register.append(
+            {
+                "reference": f"B{index}",
+                "name": alphabetic_name("Bull", index),
+                "breed": breeds[index % len(breeds)],
+                "date_of_birth": today - timedelta(days=900 + index % 500),
+                "gender": SexChoices.MALE,
+                "category": CowCategoryChoices.BULL,
+                "current_production_status": CowProductionStatusChoices.MATURE_BULL,
+                "current_pregnancy_status": "",
+                "sire": "",
+                "dam": "",
+                "lactation_start_date": "",
+            }
+        )
+    for index in range(dams):
+        register.append(
+            {
+                "reference": f"D{index}",
+                "name": alphabetic_name("Dam", index),
+                "breed": breeds[index % len(breeds)],
+                "date_of_birth": today - timedelta(days=1100 + index % 700),
+                "gender": SexChoices.FEMALE,
+                "category": CowCategoryChoices.MILKING_COW,
+                "current_production_status": CowProductionStatusChoices.OPEN,
+                "current_pregnancy_status": CowPregnancyChoices.OPEN,
+                "sire": "",
+                "dam": "",
+                "lactation_start_date": today - timedelta(days=10 + index % 280),
+            }
+        )
+    for index in range(calves):
+        register.append(
+            {
+                "reference": f"C{index}",
+                "name": alphabetic_name("Calf", index),
+                "breed": breeds[index % len(breeds)],
+                "date_of_birth": today - timedelta(days=5 + index % 20),
+                "gender": SexChoices.FEMALE if index % 2 else SexChoices.MALE,
+                "category": CowCategoryChoices.CALF,
+                "current_production_status": CowProductionStatusChoices.CALF,
+                "current_pregnancy_status": "",
+                "sire": f"B{index % bulls}",
+                "dam": f"D{index % dams}",
+                "lactation_start_date": "",
+            }
+        )
+    import_register(HerdImporter(), register)
+
+    milking_cows = list(Cow.objects.filter(category=CowCategoryChoices.MILKING_COW).order_by("id"))
+    lactations = dict(Lactation.objects.values_list("cow_id", "id"))
+    now = timezone.now()
+
+    Heat.objects.bulk_create(
+        (Heat(cow=cow, observation_time=now - timedelta(days=index % 40)) for index, cow in enumerate(milking_cows)),
+        batch_size=BATCH_SIZE,
+    )
+    pregnancies = Pregnancy.objects.bulk_create(
+        (
+            Pregnancy(cow=cow, start_date=todays_date() - timedelta(days=30 + index % 150))
+            for index, cow in enumerate(milking_cows[::3])
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    inseminator = Inseminator.objects.create(
+        first_name="Ian", last_name="Seminator", phone_number="+254711111111", sex=SexChoices.MALE,
+        license_number="BENCH-0001",
+    )
+    Insemination.objects.bulk_create(
+        (
+            Insemination(cow=pregnancy.cow, pregnancy=pregnancy, success=True, inseminator=inseminator)
+            for pregnancy in pregnancies
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    milk_records = Milk.objects.bulk_create(
+        (
+            Milk(
+                cow=cow,
+                lactation_id=lactations[cow.id],
+                amount_in_kgs=Decimal("12.50"),
+            )
+            for cow in (milking_cows[index % len(milking_cows)] for index in range(rows))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    milk_records_bulk_created.send(sender=Milk, instances=milk_records)
+
+    all_cows = list(Cow.objects.order_by("id"))
+    WeightRecord.objects.bulk_create(
+        (WeightRecord(cow=cow, weight_in_kgs=Decimal("350.00")) for cow in all_cows), batch_size=BATCH_SIZE
+    )
+    CullingRecord.objects.bulk_create(
+        CullingRecord(cow=cow, reason=CullingReasonChoices.AGE) for cow in all_cows[: max(cows // 100, 1)]
+    )
+    QuarantineRecord.objects.bulk_create(
+        QuarantineRecord(cow=cow, reason=QuarantineReasonChoices.SICK_COW)
+        for cow in all_cows[-max(cows // 100, 1):]
+    )
+
+    barn = Barn.objects.create(name="BARN A", capacity=cows)
+    calf_pen = CowPen.objects.create(
+        barn=barn, pen_type=CowPenTypeChoices.FIXED, category=CowPenCategoriesChoices.CALF_PEN, capacity=5
+    )
+    heifer_pen = CowPen.objects.create(
+        barn=barn, pen_type=CowPenTypeChoices.FIXED, category=CowPenCategoriesChoices.HEIFER_PEN, capacity=5
+    )
+    CowInPenMovement.objects.create(cow=all_cows[-1], previous_pen=heifer_pen, new_pen=calf_pen)
+
+    # The heats and pregnancies were inserted without signals
+    BreedingEvent.objects.refresh()
+    run_queued_jobs()
+
+    return {
+        "cows": cows,
+        "bull": all_cows[0].id,
+        "milking_cow": milking_cows[-1].id,
+    }
+
+
+def seed_flocks(rows):
+    """
+    Seeds `rows // 100` layer flocks with `rows` egg collections and `rows // 10` inspection records.
+
+    Returns:
+    - `dict`: The number of flocks.
+    """
+    housing_structures = [
+        HousingStructure.objects.create(
+            house_type=HousingStructureTypeChoices.DEEP_LITTER_HOUSE,
+            category=HousingStructureCategoryChoices.BROODER_CHICK_HOUSE,
+        )
+        for index in range(2)
+    ]
+    flocks = max(rows // 100, 10)
+    register = [
+        {
+            "source": FlockSourceChoices.KEN_CHICK,
+            "breed": FlockBreedTypeChoices.KENBRO,
+            "date_of_hatching": todays_date() - timedelta(weeks=index % 3),
+            "chicken_type": ChickenTypeChoices.LAYERS,
+            "initial_number_of_birds": 300,
+            "current_rearing_method": RearingMethodChoices.DEEP_LITTER,
+            "current_housing_structure": housing_structures[0].id,
+        }
+        for index in range(flocks)
+    ]
+    import_register(FlockImporter(), register)
+
+    FlockBreedInformation.objects.create(
+        breed=FlockBreed.objects.get(name=FlockBreedTypeChoices.KENBRO),
+        chicken_type=ChickenTypeChoices.LAYERS,
+        average_mature_weight_in_kgs=Decimal("2.50"),
+        average_egg_production=275,
+        maturity_age_in_weeks=17,
+    )
+
+    flock_ids = list(Flock.objects.order_by("id").values_list("id", flat=True))
+    EggCollection.objects.bulk_create(
+        (
+            EggCollection(flock_id=flock_ids[index % len(flock_ids)], collected_eggs=80, broken_eggs=index % 5)
+            for index in range(rows)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    FlockInspectionRecord.objects.bulk_create(
+        (
+            FlockInspectionRecord(flock_id=flock_ids[index % len(flock_ids)], number_of_dead_birds=index % 3)
+            for index in range(max(rows // 10, 1))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    FlockMovement.objects.create(
+        flock=Flock.objects.get(id=flock_ids[0]),
+        from_structure=housing_structures[0],
+        to_structure=housing_structures[1],
+    )
+    run_queued_jobs()
+
+    return {"flocks": flocks}
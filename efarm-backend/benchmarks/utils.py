@@ -0,0 +1,56 @@
+import math
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "efarm.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test.utils import get_runner, setup_test_environment, teardown_test_environment  # noqa: E402
+
+
+@contextmanager
+def test_database():
+    """
+    Runs the block against a throwaway test database, so benchmarks never touch the configured one.
+    """
+    setup_test_environment()
+    runner = get_runner(settings)(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+def measure(name, rows, function):
+    """
+    Runs `function` once and prints its duration, throughput and peak traced memory.
+
+    Returns:
+    - The return value of `function`.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<28} {elapsed:8.3f} s {rows / elapsed:12,.0f} rows/s {peak / 1024 / 1024:10.2f} MiB peak"
+    )
+    return result
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank `percent` percentile of `values`.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
@@ -0,0 +1,175 @@
+"""
+Measures the write throughput of simultaneous milk and egg collection writers, and counts the writes that failed
+on a lock, against the configured database backend.
+
+Runs against a throwaway test database, so it never touches the configured one. SQLite runs on a file rather than
+in memory, so its journal mode and locking behave as in production. Run it once per backend or journal mode:
+
+    python -m benchmarks.write_concurrency --writers 8 --writes 50
+    python -m benchmarks.write_concurrency --writers 8 --writes 50 --journal-mode delete
+    EFARM_DATABASE_ENGINE=postgresql python -m benchmarks.write_concurrency --writers 8 --writes 50
+"""
+import argparse
+import itertools
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks.utils import percentile, test_database
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+from benchmarks.seed import import_register, seed_herd
+from dairy.choices import CowCategoryChoices
+from dairy.models import Cow, Milk
+from efarm.clock import todays_date
+from poultry.choices import *
+from poultry.importers import FlockImporter
+from poultry.models import EggCollection, Flock, HousingStructure
+
+# Egg collections are limited to three per flock and day
+COLLECTIONS_PER_FLOCK = 3
+
+
+@dataclass
+class WriterResult:
+    writes: int = 0
+    lock_errors: int = 0
+    latencies: list = field(default_factory=list)
+    error: Exception = None
+
+
+def is_lock_error(error):
+    message = str(error).lower()
+    return "locked" in message or "deadlock" in message or "could not serialize" in message
+
+
+def seed_laying_flocks(flocks):
+    housing_structure = HousingStructure.objects.create(
+        house_type=HousingStructureTypeChoices.DEEP_LITTER_HOUSE,
+        category=HousingStructureCategoryChoices.LAYERS_HOUSE,
+    )
+    register = [
+        {
+            "source": FlockSourceChoices.KEN_CHICK,
+            "breed": FlockBreedTypeChoices.KENBRO,
+            "date_of_hatching": todays_date() - timedelta(weeks=20),
+            "chicken_type": ChickenTypeChoices.LAYERS,
+            "initial_number_of_birds": 300,
+            "current_rearing_method": RearingMethodChoices.DEEP_LITTER,
+            "current_housing_structure": housing_structure.id,
+        }
+        for index in range(flocks)
+    ]
+    import_register(FlockImporter(), register)
+    return list(Flock.objects.order_by("id"))
+
+
+def run_writer(write, writes, barrier, result):
+    barrier.wait()
+    try:
+        for _ in range(writes):
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    write()
+            except OperationalError as e:
+                if not is_lock_error(e):
+                    raise
+                result.lock_errors += 1
+            else:
+                result.writes += 1
+                result.latencies.append(time.perf_counter() - started)
+    except Exception as e:
+        result.error = e
+    finally:
+        # Every thread opens a connection of its own
+        connection.close()
+
+
+def report(name, results, elapsed):
+    writes = sum(result.writes for result in results)
+    lock_errors = sum(result.lock_errors for result in results)
+    latencies = [latency for result in results for latency in result.latencies] or [0]
+    print(
+        f"{name:<16} {writes:8,} writes {writes / elapsed:10,.1f} writes/s "
+        f"{percentile(latencies, 50) * 1000:8.1f} ms p50 {percentile(latencies, 95) * 1000:8.1f} ms p95 "
+        f"{lock_errors:6,} lock errors"
+    )
+
+
+def run(writers, writes):
+    milk_writers = (writers + 1) // 2
+    egg_writers = writers - milk_writers
+
+    seed_herd(max(milk_writers * 10, 100))
+    cows = list(Cow.objects.filter(category=CowCategoryChoices.MILKING_COW))
+    flocks = seed_laying_flocks(-(-egg_writers * writes // COLLECTIONS_PER_FLOCK) or 1)
+    egg_collections = itertools.count()
+
+    def write_milk():
+        Milk.objects.create(cow=cows[threading.get_ident() % len(cows)], amount_in_kgs=Decimal("12.50"))
+
+    def write_egg_collection():
+        flock = flocks[next(egg_collections) // COLLECTIONS_PER_FLOCK]
+        EggCollection.objects.create(flock=flock, collected_eggs=80, broken_eggs=1)
+
+    # The seeding connection is not shared with the writers
+    connection.close()
+
+    barrier = threading.Barrier(writers + 1)
+    results = {"milk": [], "egg collections": []}
+    threads = []
+    writer_kinds = [("milk", write_milk, milk_writers), ("egg collections", write_egg_collection, egg_writers)]
+    for kind, write, count in writer_kinds:
+        for _ in range(count):
+            result = WriterResult()
+            results[kind].append(result)
+            threads.append(threading.Thread(target=run_writer, args=(write, writes, barrier, result)))
+
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    for result in itertools.chain(*results.values()):
+        if result.error is not None:
+            raise result.error
+
+    description = connection.vendor
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            description += f", journal_mode={cursor.fetchone()[0]}"
+    print(f"{writers} writers of {writes} writes each on {description}, {elapsed:.2f} s")
+    for kind, kind_results in results.items():
+        report(kind, kind_results, elapsed)
+    report("total", list(itertools.chain(*results.values())), elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8, help="The number of simultaneous writers, half of them milk.")
+    parser.add_argument("--writes", type=int, default=50, help="The number of writes per writer.")
+    parser.add_argument("--journal-mode", default=None, help="Overrides SQLITE_PRAGMAS['JOURNAL_MODE'], e.g. delete.")
+    args = parser.parse_args()
+
+    if args.journal_mode:
+        settings.SQLITE_PRAGMAS = {**getattr(settings, "SQLITE_PRAGMAS", {}), "JOURNAL_MODE": args.journal_mode}
+
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == "sqlite":
+            settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = str(Path(directory) / "benchmark.sqlite3")
+        with test_database():
+            run(args.writers, args.writes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+from dataclasses import dataclass
+
+import numpy as np
+from django.db.models import FloatField, Sum
+from django.db.models.functions import Cast, TruncDate
+
+from dairy.models import Milk
+
+STANDARD_LACTATION_DAYS = 305
+
+
+@dataclass
+class DailyYields:
+    """
+    The daily milk yields of a set of lactations as flat NumPy arrays, one element per milking day.
+
+    Attributes:
+    - `lactation_ids` (ndarray): The sorted IDs of the lactations, the position of an ID is its group number.
+    - `group` (ndarray): The group number of the lactation each day belongs to.
+    - `days_in_milk` (ndarray): The number of days since the start of the lactation, 0 on the start date.
+    - `yields` (ndarray): The milk produced on the day in kilograms.
+    """
+
+    lactation_ids: np.ndarray
+    group: np.ndarray
+    days_in_milk: np.ndarray
+    yields: np.ndarray
+
+    @classmethod
+    def load(cls, lactations):
+        """
+        Reads the daily yields of the given lactations in a single query.
+
+        The milk records of each day are summed by the database and the days in milk are worked out with array
+        arithmetic, so no model instances are created for the milk records.
+
+        Args:
+        - `lactations`: The lactations, only their `id` and `start_date` are used.
+
+        Returns:
+        - `DailyYields`: The daily yields of the lactations.
+        """
+        start_dates = {lactation.id: lactation.start_date for lactation in lactations}
+        rows = list(
+            Milk.objects.filter(lactation_id__in=start_dates)
+            .annotate(day=TruncDate("milking_date"))
+            .values_list("lactation_id", "day")
+            .annotate(daily_yield=Sum(Cast("amount_in_kgs", FloatField())))
+            .order_by()
+        )
+
+        lactation_ids = np.array(sorted(start_dates), dtype=np.int64)
+        start_dates = np.array(
+            [start_dates[lactation_id] for lactation_id in lactation_ids], dtype="datetime64[D]"
+        )
+        if not rows:
+            empty = np.array([], dtype=np.int64)
+            return cls(lactation_ids, empty, empty, np.array([], dtype=np.float64))
+
+        row_lactation_ids, days, yields = zip(*rows)
+        group = np.searchsorted(lactation_ids, np.array(row_lactation_ids, dtype=np.int64))
+        days_in_milk = (np.array(days, dtype="datetime64[D]") - start_dates[group]).astype(np.int64)
+        return cls(lactation_ids, group, days_in_milk, np.array(yields, dtype=np.float64))
+
+
+def fit_wood_curves(group, days_in_milk, yields, groups, min_days=5):
+    """
+    Fits Wood's lactation curve `y = a * t^b * e^(-c * t)` to every lactation at once.
+
+    The curve is linear in its logarithm, `ln y = ln a + b ln t - c t`, so each lactation is a three-parameter
+    least squares problem. The normal equations of all lactations are accumulated with `np.bincount` and solved
+    as one batch of 3x3 systems.
+
+    Args:
+    - `group`: The group number of every daily yield.
+    - `days_in_milk`: The day in milk of every daily yield, days before day 1 are left out of the fit.
+    - `yields`: The daily yields, days without milk are left out of the fit.
+    - `groups`: The number of lactations.
+    - `min_days`: The number of milking days a lactation needs before a curve is fitted.
+
+    Returns:
+    - `ndarray`: The `(a, b, c)` parameters per lactation, NaN where there is too little data or the data does not
+                 follow the usual rise and decline of a lactation (`b` and `c` must be positive).
+    """
+    usable = (days_in_milk >= 1) & (yields > 0)
+    group = group[usable]
+    t = days_in_milk[usable].astype(np.float64)
+    ln_y = np.log(yields[usable])
+    terms = [np.ones_like(t), np.log(t), -t]
+
+    normal_matrix = np.empty((groups, 3, 3))
+    normal_vector = np.empty((groups, 3))
+    for i, term in enumerate(terms):
+        normal_vector[:, i] = np.bincount(group, weights=term * ln_y, minlength=groups)
+        for j in range(i, 3):
+            normal_matrix[:, i, j] = normal_matrix[:, j, i] = np.bincount(
+                group, weights=term * terms[j], minlength=groups
+            )
+
+    parameters = np.full((groups, 3), np.nan)
+    solvable = np.bincount(group, minlength=groups) >= min_days
+    if solvable.any():
+        solvable[solvable] = np.linalg.cond(normal_matrix[solvable]) < 1e12
+    if solvable.any():
+        ln_a, b, c = np.linalg.solve(normal_matrix[solvable], normal_vector[solvable][..., None])[..., 0].T
+        parameters[solvable] = np.column_stack([np.exp(ln_a), b, c])
+
+    parameters[~((parameters[:, 1] > 0) & (parameters[:, 2] > 0))] = np.nan
+    return parameters
+
+
+def wood_daily_yields(parameters, days=STANDARD_LACTATION_DAYS):
+    """
+    Evaluates Wood's curve for days 1 to `days` of every lactation.
+
+    Returns:
+    - `ndarray`: A `(lactations, days)` array of predicted daily yields.
+    """
+    a, b, c = (parameters[:, [index]] for index in range(3))
+    t = np.arange(1, days + 1, dtype=np.float64)
+    return a * t**b * np.exp(-c * t)
+
+
+def persistency(daily_yields):
+    """
+    Returns the yield of days 101 to 200 as a percentage of the yield of days 1 to 100, per row of daily yields.
+    """
+    return daily_yields[..., 100:200].sum(axis=-1) / daily_yields[..., :100].sum(axis=-1) * 100
+
+
+class LactationCurveAnalyzer:
+    """
+    Works out the lactation curves and the yield figures used for culling and breeding decisions.
+
+    For every lactation:
+    - `days_recorded`, `total_yield`, `peak_yield` and `days_to_peak`: Taken from the recorded daily yields.
+    - `yield_305_days`: The yield of a standard 305 day lactation.
+    - `persistency`: The yield of days 101 to 200 as a percentage of the yield of days 1 to 100.
+    - `method`: "wood" when Wood's curve fits the lactation, in which case the 305 day yield and persistency are
+      read from the fitted curve and are projections for ongoing lactations. Otherwise "interpolation", where
+      they are read from the recorded days with linear interpolation between them, and persistency is only given
+      once day 200 has been recorded.
+    """
+
+    block_size = 1024
+
+    def __init__(self, daily_yields, min_days=5):
+        self.daily_yields = daily_yields
+        self.groups = len(daily_yields.lactation_ids)
+        self.parameters = fit_wood_curves(
+            daily_yields.group, daily_yields.days_in_milk, daily_yields.yields, self.groups, min_days
+        )
+        # Sort the days by lactation and then day in milk, so the days of a lactation are a contiguous slice
+        self.order = np.lexsort((daily_yields.days_in_milk, daily_yields.group))
+        self.bounds = np.searchsorted(daily_yields.group[self.order], np.arange(self.groups + 1))
+
+    @classmethod
+    def for_lactations(cls, lactations, min_days=5):
+        return cls(DailyYields.load(lactations), min_days=min_days)
+
+    def analyze(self):
+        """
+        Returns the yield figures of every lactation.
+
+        Returns:
+        - `dict`: The figures per lactation ID.
+        """
+        data = self.daily_yields
+        groups = self.groups
+        days_recorded = np.bincount(data.group, minlength=groups)
+        total_yield = np.bincount(data.group, weights=data.yields, minlength=groups)
+
+        peak_yield = np.full(groups, np.nan)
+        days_to_peak = np.full(groups, -1)
+        if len(data.group):
+            # Sort by lactation and then yield, so the last day of each lactation is its peak
+            order = np.lexsort((data.yields, data.group))
+            sorted_group = data.group[order]
+            last = np.flatnonzero(np.r_[sorted_group[1:] != sorted_group[:-1], True])
+            peak_yield[sorted_group[last]] = data.yields[order][last]
+            days_to_peak[sorted_group[last]] = data.days_in_milk[order][last]
+
+        yield_305_days = np.full(groups, np.nan)
+        lactation_persistency = np.full(groups, np.nan)
+        fitted = ~np.isnan(self.parameters[:, 0])
+        fitted_groups = np.flatnonzero(fitted)
+        for start in range(0, len(fitted_groups), self.block_size):
+            block = fitted_groups[start:start + self.block_size]
+            curves = wood_daily_yields(self.parameters[block])
+            yield_305_days[block] = curves.sum(axis=1)
+            lactation_persistency[block] = persistency(curves)
+
+        for group in np.flatnonzero(~fitted & (days_recorded > 0)):
+            curve = self.interpolate(group)
+            if not len(curve):
+                continue
+            yield_305_days[group] = curve.sum()
+            if len(curve) >= 200:
+                lactation_persistency[group] = persistency(curve)
+
+        return {
+            int(lactation_id): {
+                "days_recorded": int(days_recorded[group]),
+                "total_yield": round(float(total_yield[group]), 2),
+                "peak_yield": _round(peak_yield[group]),
+                "days_to_peak": int(days_to_peak[group]) if days_recorded[group] else None,
+                "yield_305_days": _round(yield_305_days[group]),
+                "persistency": _round(lactation_persistency[group]),
+                "method": ("wood" if fitted[group] else "interpolation") if days_recorded[group] else None,
+                "wood_parameters": dict(zip("abc", map(float, self.parameters[group])))
+                if fitted[group]
+                else None,
+            }
+            for group, lactation_id in enumerate(data.lactation_ids)
+        }
+
+    def curve(self, lactation_id):
+        """
+        Returns the recorded and fitted daily yields of a lactation, for plotting its curve.
+
+        Returns:
+        - `dict`: The recorded `[day_in_milk, yield]` pairs and the daily yields of days 1 to 305.
+        """
+        group = int(np.searchsorted(self.daily_yields.lactation_ids, lactation_id))
+        days_in_milk, yields = self.recorded_days(group)
+        if not np.isnan(self.parameters[group, 0]):
+            fitted = wood_daily_yields(self.parameters[[group]])[0]
+        elif len(days_in_milk):
+            fitted = self.interpolate(group)
+        else:
+            fitted = np.array([])
+
+        return {
+            "recorded": [[int(day), round(float(amount), 2)] for day, amount in zip(days_in_milk, yields)],
+            "fitted": [round(float(amount), 2) for amount in fitted],
+        }
+
+    def recorded_days(self, group):
+        days = self.order[self.bounds[group]:self.bounds[group + 1]]
+        return self.daily_yields.days_in_milk[days], self.daily_yields.yields[days]
+
+    def interpolate(self, group):
+        """
+        Returns the daily yields of a lactation from day 1 up to its last recorded day (at most day 305),
+        interpolating linearly between the recorded days.
+        """
+        days_in_milk, yields = self.recorded_days(group)
+        last_day = min(int(days_in_milk[-1]), STANDARD_LACTATION_DAYS)
+        return np.interp(np.arange(1, last_day + 1), days_in_milk, yields)
+
+    @staticmethod
+    def summarize(figures):
+        """
+        Averages the yield figures of a herd, leaving out lactations without the figure.
+
+        Args:
+        - `figures`: The figures per lactation, as returned by `analyze()`.
+
+        Returns:
+        - `dict`: The herd averages and the number of lactations with milk records.
+        """
+        summary = {"lactations": len(figures)}
+        summary["lactations_with_records"] = sum(1 for figure in figures.values() if figure["days_recorded"])
+        for name in ("yield_305_days", "peak_yield", "days_to_peak", "persistency"):
+            values = [figure[name] for figure in figures.values() if figure[name] is not None]
+            summary[f"average_{name}"] = round(sum(values) / len(values), 2) if values else None
+        return summary
+
+
+def _round(value):
+    return None if np.isnan(value) else round(float(value), 2)
@@ -106,6 +106,13 @@ class LactationStageChoices(models.TextChoices):
     ENDED = "Ended"
 
 
+class BreedingEventTypeChoices(models.TextChoices):
+    HEAT_CHECK = "Heat Check"
+    PREGNANCY_CHECK = "Pregnancy Check"
+    DRY_OFF = "Dry Off"
+    CALVING = "Calving"
+
+
 class CullingReasonChoices(models.TextChoices):
     # MEDICAL_REASONS
     INJURIES = "Injuries"
@@ -0,0 +1,43 @@
+from dairy.filters import MilkFilterSet, TreatmentFilterSet
+from dairy.models import Milk, Treatment
+from efarm.exporters import RecordExporter
+
+
+class MilkExporter(RecordExporter):
+    """
+    Exports the milk records, with the tag number of the cow and the lactation each record belongs to.
+    """
+
+    model = Milk
+    filterset_class = MilkFilterSet
+    columns = [
+        ("id", "id"),
+        ("milking_date", "milking_date"),
+        ("cow", "cow__tag_number"),
+        ("lactation", "lactation_id"),
+        ("amount_in_kgs", "amount_in_kgs"),
+    ]
+    ordering = ("milking_date", "id")
+    file_name = "milk"
+
+
+class TreatmentExporter(RecordExporter):
+    """
+    Exports the treatments, with the tag number of the treated cow and the name of the disease.
+    """
+
+    model = Treatment
+    filterset_class = TreatmentFilterSet
+    columns = [
+        ("id", "id"),
+        ("date_of_treatment", "date_of_treatment"),
+        ("cow", "cow__tag_number"),
+        ("disease", "disease__name"),
+        ("treatment_method", "treatment_method"),
+        ("treatment_status", "treatment_status"),
+        ("duration", "duration"),
+        ("cost", "cost"),
+        ("notes", "notes"),
+    ]
+    ordering = ("date_of_treatment", "id")
+    file_name = "treatments"
@@ -1,4 +1,7 @@
+import re
+
 from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
 
 from dairy.models import *
 
@@ -20,6 +23,24 @@ class CaseInsensitiveBooleanFilter(filters.BooleanFilter):
         return super().filter(qs, value)
 
 
+class TagNumberFilter(filters.CharFilter):
+    """
+    Looks up cows by tag number through the tag number index.
+
+    A complete tag number (e.g. "AY-2023-12") is matched exactly, anything shorter is treated as a prefix.
+    Tag numbers are stored in upper case, so the value is normalised before the lookup. A prefix is looked up as
+    a range of the unique index: SQLite compiles `startswith` to a case-insensitive LIKE, which no index serves.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        value = value.strip().upper()
+        if re.fullmatch(r"[A-Z]{2}-\d{4}-\d+", value):
+            return qs.filter(**{f"{self.field_name}__exact": value})
+        return qs.filter(**{f"{self.field_name}__gte": value, f"{self.field_name}__lt": value + "\uffff"})
+
+
 class CowFilterSet(filters.FilterSet):
     breed = filters.CharFilter(field_name="breed__name", lookup_expr="icontains")
     is_bought = CaseInsensitiveBooleanFilter(field_name="is_bought")
@@ -47,7 +68,7 @@ class CowFilterSet(filters.FilterSet):
     current_production_status = filters.CharFilter(
         field_name="current_production_status", lookup_expr="icontains"
     )
-    tag_number = filters.CharFilter(field_name="tag_number", lookup_expr="icontains")
+    tag_number = TagNumberFilter(field_name="tag_number")
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
 
     class Meta:
@@ -90,7 +111,7 @@ class InseminatorFilterSet(filters.FilterSet):
 
 
 class InseminationFilterSet(filters.FilterSet):
-    cow = filters.CharFilter(field_name="cow__tag_number", lookup_expr="icontains")
+    cow = TagNumberFilter(field_name="cow__tag_number")
     inseminator = filters.CharFilter(
         field_name="inseminator__first_name", lookup_expr="icontains"
     )
@@ -118,7 +139,7 @@ class InseminationFilterSet(filters.FilterSet):
 
 
 class PregnancyFilterSet(filters.FilterSet):
-    cow = filters.CharFilter(field_name="cow__tag_number", lookup_expr="icontains")
+    cow = TagNumberFilter(field_name="cow__tag_number")
     start_date = filters.DateFilter(field_name="start_date")
     year = filters.NumberFilter(field_name="start_date__year", lookup_expr="exact")
     month = filters.NumberFilter(field_name="start_date__month", lookup_expr="exact")
@@ -149,8 +170,24 @@ class LactationFilterSet(filters.FilterSet):
         fields = ["start_date", "year", "month", "lactation_number"]
 
 
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+class BreedingEventFilterSet(filters.FilterSet):
+    start_date = filters.DateFilter(field_name="due_date", lookup_expr="gte")
+    end_date = filters.DateFilter(field_name="due_date", lookup_expr="lte")
+    # A comma separated list of event types, e.g. "Heat Check,Calving"
+    event_type = CharInFilter(field_name="event_type", lookup_expr="in")
+    cow = TagNumberFilter(field_name="cow__tag_number")
+
+    class Meta:
+        model = BreedingEvent
+        fields = ["start_date", "end_date", "event_type", "cow"]
+
+
 class MilkFilterSet(filters.FilterSet):
-    cow = filters.CharFilter(field_name="cow__tag_number", lookup_expr="icontains")
+    cow = TagNumberFilter(field_name="cow__tag_number")
     milking_date = filters.DateTimeFilter(field_name="milking_date")
     day_of_milking = filters.NumberFilter(
         field_name="milking_date__day", lookup_expr="exact"
@@ -172,7 +209,7 @@ class MilkFilterSet(filters.FilterSet):
 
 
 class WeightRecordFilterSet(filters.FilterSet):
-    cow = filters.CharFilter(field_name="cow__tag_number", lookup_expr="icontains")
+    cow = TagNumberFilter(field_name="cow__tag_number")
     day_of_weighing = filters.NumberFilter(field_name="date__day", lookup_expr="exact")
     month_of_weighing = filters.NumberFilter(
         field_name="date__month", lookup_expr="exact"
@@ -204,3 +241,19 @@ class QuarantineRecordFilterSet(filters.FilterSet):
     class Meta:
         model = QuarantineRecord
         fields = ["reason"]
+
+
+class TreatmentFilterSet(filters.FilterSet):
+    cow = TagNumberFilter(field_name="cow__tag_number")
+    disease = filters.CharFilter(field_name="disease__name", lookup_expr="icontains")
+    treatment_status = filters.CharFilter(lookup_expr="iexact")
+    month_of_treatment = filters.NumberFilter(
+        field_name="date_of_treatment__month", lookup_expr="exact"
+    )
+    year_of_treatment = filters.NumberFilter(
+        field_name="date_of_treatment__year", lookup_expr="exact"
+    )
+
+    class Meta:
+        model = Treatment
+        fields = ["cow", "disease", "treatment_status", "month_of_treatment", "year_of_treatment"]
@@ -0,0 +1,211 @@
+from django.core.exceptions import ValidationError
+
+from dairy.models import BreedingEvent, Cow, CowAncestry, CowBreed, Lactation
+from dairy.validators import CowValidator, LactationValidator
+from dairy_inventory.models import CowInventory
+from efarm.caching import bump_generations
+from efarm.importers import RegisterImporter, parse_boolean
+
+
+class HerdImporter(RegisterImporter):
+    """
+    Imports a herd register, creating a cow per row and the current lactation of cows that are being milked.
+
+    Breeds, sires and dams are resolved through in-memory maps and the cow validators run in batch mode: a cow in
+    the register has no pregnancy records yet and its calves are the rows that name it as their dam, so no row
+    needs a query of its own. Cows, their ancestry and lactations are inserted with `bulk_create`, the breeding
+    calendar is scheduled per chunk and the cow inventory is recomputed once at the end of the import.
+
+    Columns:
+    - `reference`: An optional identifier that later rows use to name the cow as their sire or dam.
+    - `name`, `breed`, `date_of_birth` and `gender`: Required.
+    - `availability_status`, `current_pregnancy_status`, `category`, `current_production_status`, `is_bought` and
+      `date_of_death`: Optional, with the same defaults as cows created through the API.
+    - `sire` and `dam`: The reference of an earlier row or the tag number of a cow already in the farm.
+    - `lactation_start_date` and `lactation_number`: Optional, creates the current lactation of the cow.
+    """
+
+    needs_scan = True
+    cow_fields = [
+        "name",
+        "date_of_birth",
+        "gender",
+        "availability_status",
+        "current_pregnancy_status",
+        "category",
+        "current_production_status",
+        "is_bought",
+        "date_of_death",
+    ]
+
+    def prepare(self):
+        self.breeds = {breed.name: breed for breed in CowBreed.objects.all()}
+        self.dam_references = set()
+        self.cows_by_reference = {}
+        self.pending_cows = []
+        self.pending_lactations = []
+
+    def scan(self, row):
+        if row.get("dam"):
+            self.dam_references.add(row["dam"])
+
+    def import_chunk(self, chunk):
+        parent_references = {
+            row[column]
+            for row_number, row in chunk
+            for column in ("sire", "dam")
+            if row.get(column) and row[column] not in self.cows_by_reference
+        }
+        existing_parents = {
+            cow.tag_number: cow
+            for cow in Cow.objects.filter(tag_number__in=parent_references).only(
+                "id", "tag_number", "gender"
+            )
+        }
+
+        for row_number, row in chunk:
+            try:
+                cow, lactation = self.build_cow(row, existing_parents)
+            except ValidationError as e:
+                self.reject(row_number, row, e)
+                continue
+
+            if any(parent is not None and parent.pk is None for parent in (cow.sire, cow.dam)):
+                # The parent is in the same chunk and must get its ID first
+                self.flush()
+
+            self.pending_cows.append(cow)
+            if lactation:
+                self.pending_lactations.append(lactation)
+            if row.get("reference"):
+                self.cows_by_reference[row["reference"]] = cow
+
+        self.flush()
+
+    def build_cow(self, row, existing_parents):
+        """
+        Builds and validates an unsaved cow, and its current lactation if the row has one, from a register row.
+
+        Raises:
+        - `ValidationError`: If the row is invalid.
+        """
+        if row.get("reference") and row["reference"] in self.cows_by_reference:
+            raise ValidationError(
+                {"reference": [f"The reference '{row['reference']}' is used by an earlier row."]}
+            )
+
+        data = {name: row[name] for name in self.cow_fields if row.get(name)}
+        if "is_bought" in data:
+            data["is_bought"] = parse_boolean(data["is_bought"])
+
+        cow = Cow(breed=self.get_breed(row.get("breed", "")), **data)
+        exclude = ["breed", "sire", "dam", "tag_number"]
+        if cow.date_of_death is None:
+            # Like the API, a cow that is alive has no date of death
+            exclude.append("date_of_death")
+        cow.clean_fields(exclude=exclude)
+        cow.sire = self.get_parent(row, "sire", existing_parents)
+        cow.dam = self.get_parent(row, "dam", existing_parents)
+
+        age = Cow.manager.calculate_age(cow)
+        calf_records = [row["reference"]] if row.get("reference") in self.dam_references else []
+        try:
+            CowValidator.validate_cow_age(age, cow.date_of_birth)
+            CowValidator.validate_uniqueness(cow.name)
+            CowValidator.validate_date_of_death(cow.availability_status, cow.date_of_death)
+            CowValidator.validate_sire_dam_relationship(cow.sire, cow.dam)
+            CowValidator.validate_age_category(
+                age, cow.category, cow.gender, calf_records, cow.is_bought, cow, has_pregnancies=False
+            )
+            CowValidator.validate_pregnancy_status(
+                cow,
+                age,
+                cow.current_pregnancy_status,
+                cow.availability_status,
+                cow.gender,
+                has_pregnancies=False,
+            )
+            CowValidator.validate_production_status(
+                cow.current_production_status,
+                cow.gender,
+                cow.category,
+                age,
+                calf_records,
+                cow.is_bought,
+                cow,
+                has_pregnancies=False,
+            )
+        except ValidationError as e:
+            raise ValidationError({"non_field_errors": e.messages})
+
+        return cow, self.build_lactation(row, cow)
+
+    def build_lactation(self, row, cow):
+        if not row.get("lactation_start_date"):
+            return None
+
+        lactation = Lactation(
+            cow=cow,
+            start_date=row["lactation_start_date"],
+            lactation_number=row.get("lactation_number") or 1,
+        )
+        lactation.clean_fields(exclude=["cow", "pregnancy", "end_date"])
+        try:
+            LactationValidator.validate_age(lactation.start_date, cow)
+            LactationValidator.validate_fields(
+                lactation.start_date, None, lactation.lactation_number, cow, lactation
+            )
+        except ValidationError as e:
+            raise ValidationError({"lactation_start_date": e.messages})
+        return lactation
+
+    def get_breed(self, name):
+        if name not in self.breeds:
+            try:
+                self.breeds[name] = CowBreed.objects.create(name=name)
+            except ValidationError as e:
+                raise ValidationError({"breed": e.messages})
+        return self.breeds[name]
+
+    def get_parent(self, row, column, existing_parents):
+        reference = row.get(column)
+        if not reference:
+            return None
+        parent = self.cows_by_reference.get(reference) or existing_parents.get(reference)
+        if parent is None:
+            raise ValidationError(
+                {
+                    column: [
+                        f"No cow with the reference or tag number '{reference}' was found. Parents must be "
+                        f"listed before their offspring."
+                    ]
+                }
+            )
+        return parent
+
+    def flush(self):
+        """
+        Inserts the pending cows and lactations.
+        """
+        if not self.pending_cows:
+            return
+
+        cows = Cow.objects.bulk_create(self.pending_cows)
+        # The tag number embeds the ID, so it can only be set once the cows have been inserted
+        for cow in cows:
+            cow.tag_number = Cow.manager.get_tag_number(cow)
+        Cow.objects.bulk_update(cows, ["tag_number"])
+        CowAncestry.objects.add_cows(cows)
+        Lactation.objects.bulk_create(self.pending_lactations)
+        if self.pending_lactations:
+            BreedingEvent.objects.refresh([lactation.cow_id for lactation in self.pending_lactations])
+
+        self.result.created += len(cows)
+        self.pending_cows = []
+        self.pending_lactations = []
+
+    def finish(self):
+        if self.result.created:
+            CowInventory.objects.recompute()
+            # The cows and lactations were inserted without signals
+            bump_generations(Cow, Lactation)
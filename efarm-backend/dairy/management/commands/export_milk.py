@@ -0,0 +1,9 @@
+from dairy.exporters import MilkExporter
+from efarm.exporters import RecordExportCommand
+
+
+class Command(RecordExportCommand):
+    help = "Exports the milk records as CSV or Parquet, optionally filtered like the milk list endpoint."
+
+    exporter_class = MilkExporter
+    record_name = "milk records"
@@ -0,0 +1,9 @@
+from dairy.exporters import TreatmentExporter
+from efarm.exporters import RecordExportCommand
+
+
+class Command(RecordExportCommand):
+    help = "Exports the treatments as CSV or Parquet, optionally filtered by cow, disease, status and date."
+
+    exporter_class = TreatmentExporter
+    record_name = "treatments"
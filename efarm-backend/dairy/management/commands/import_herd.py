@@ -0,0 +1,9 @@
+from dairy.importers import HerdImporter
+from efarm.importers import RegisterImportCommand
+
+
+class Command(RegisterImportCommand):
+    help = "Imports a herd register, creating the cows and their current lactations in bulk."
+
+    importer_class = HerdImporter
+    record_name = "cows"
@@ -1,8 +1,31 @@
+from collections import defaultdict
 from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from django.db import models
 from .choices import *
-from dairy.utils import *
+from efarm.clock import todays_date
 
 
 class CowManager(models.Manager):
@@ -20,6 +43,7 @@ class CowManager(models.Manager):
     - `get_sold_cows()`: Returns a queryset of sold cows.
     - `get_dead_cows()`: Returns a queryset of dead cows.
     - `get_calf_records(cow)`: Returns a list of calf records associated with the cow.
+    - `get_annotated_cows()`: Returns a queryset of cows with age, age in farm and parity computed in SQL.
 
     """
 
@@ -41,33 +65,39 @@ class CowManager(models.Manager):
         return f"{first_letters_of_breed}-{year_of_birth}-{counter}"
 
     @staticmethod
-    def calculate_age(cow):
+    def calculate_age(cow, as_of_date=None):
         """
         Calculates and returns the age of a cow in days.
 
         Args:
         - `cow`: The cow object.
+        - `as_of_date`: The date to calculate the age at, defaults to the as-of date of the request.
 
         Returns:
         - The age of the cow in days.
 
         """
-        age_in_days = (todays_date - cow.date_of_birth).days
+        if hasattr(cow, "annotated_age"):
+            return cow.annotated_age.days
+        age_in_days = ((as_of_date or todays_date()) - cow.date_of_birth).days
         return age_in_days
 
     @staticmethod
-    def calculate_age_in_farm(cow):
+    def calculate_age_in_farm(cow, as_of_date=None):
         """
         Calculates and returns the age of a cow in days since introduction to the farm.
 
         Args:
         - `cow`: The cow object.
+        - `as_of_date`: The date to calculate the age at, defaults to the as-of date of the request.
 
         Returns:
         - The age of the cow in days since introduction to the farm.
 
         """
-        age_in_days = (todays_date - cow.date_introduced_in_farm).days
+        if hasattr(cow, "annotated_age_in_farm"):
+            return cow.annotated_age_in_farm.days
+        age_in_days = ((as_of_date or todays_date()) - cow.date_introduced_in_farm).days
         return age_in_days
 
     def get_calf_records(self, cow):
@@ -98,12 +128,56 @@ class CowManager(models.Manager):
         Returns:
         - The parity of the cow.
         """
+        if hasattr(cow, "annotated_parity"):
+            return cow.annotated_parity
         if cow.gender == SexChoices.FEMALE:
             calf_records = cow.calf_records
             return len(calf_records)
         else:
             return 0
 
+    def get_annotated_cows(self, as_of_date=None):
+        """
+        Returns a queryset of cows with the age, age in farm and parity computed by the database.
+
+        The values are exposed as `annotated_age`, `annotated_age_in_farm` and `annotated_parity`, which the
+        corresponding `Cow` properties read instead of querying per cow.
+
+        Args:
+        - `as_of_date`: The date to calculate the ages at, defaults to the as-of date of the request.
+
+        Returns:
+        - A queryset of cows with the breed joined and the annotations applied.
+
+        """
+        today = Value(as_of_date or todays_date(), output_field=DateField())
+        calves_count = (
+            self.model.objects.filter(dam=OuterRef("pk"))
+            .order_by()
+            .values("dam")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return (
+            self.select_related("breed")
+            .annotate(
+                annotated_age=ExpressionWrapper(
+                    today - F("date_of_birth"), output_field=DurationField()
+                ),
+                annotated_age_in_farm=ExpressionWrapper(
+                    today - F("date_introduced_in_farm"), output_field=DurationField()
+                ),
+                annotated_parity=Case(
+                    When(
+                        gender=SexChoices.FEMALE,
+                        then=Coalesce(Subquery(calves_count), 0),
+                    ),
+                    default=0,
+                    output_field=IntegerField(),
+                ),
+            )
+        )
+
     def get_available_cows(self):
         """
         Returns a queryset of available (alive) cows.
@@ -175,20 +249,254 @@ class CowManager(models.Manager):
         cow.save()
 
 
+class CowAncestryManager(models.Manager):
+    """
+    Custom manager for the CowAncestry closure table.
+
+    Every cow has a row for itself at depth 0 and a row for each ancestor at every generation the ancestor appears
+    in, with the number of pedigree paths that lead to it. The rows are added when cows are created and rebuilt for
+    a cow and its descendants when their parents change, so ancestors, descendants and inbreeding are read with a
+    single indexed query instead of one query per generation.
+
+    Inbreeding follows Henderson's decomposition of the numerator relationship matrix: the relationship of a sire
+    and a dam is the sum, over their common ancestors, of the genes each inherits from the ancestor (1/2 per
+    generation along every path) times the Mendelian sampling variance of the ancestor. The inbreeding
+    coefficient of their offspring is half of that relationship.
+
+    Methods:
+    - `add_cows(cows)`: Adds the ancestry of newly created cows and stores their inbreeding coefficients.
+    - `rebuild(cow_ids)`: Rebuilds the ancestry of cows whose parents changed, and of their descendants.
+    - `get_inbreeding(sire_id, dam_id)`: Calculates the inbreeding coefficient of a proposed mating.
+    - `get_pedigree(cow_id, generations)`: Returns the pedigree tree of a cow.
+    - `get_descendants(cow_id)`: Returns the descendants of a cow with the generation they belong to.
+    """
+
+    # Also used by the migration that builds the table for the existing herd
+    use_in_migrations = True
+
+    pedigree_fields = (
+        "descendant_id",
+        "ancestor_id",
+        "depth",
+        "paths",
+        "ancestor__inbreeding_coefficient",
+        "ancestor__sire__inbreeding_coefficient",
+        "ancestor__dam__inbreeding_coefficient",
+    )
+
+    @property
+    def cow_model(self):
+        return self.model._meta.get_field("descendant").related_model
+
+    @staticmethod
+    def mendelian_sampling_variance(*parent_inbreeding):
+        """
+        Returns the Mendelian sampling variance of a cow given the inbreeding coefficients of its known parents.
+        """
+        known = [inbreeding for inbreeding in parent_inbreeding if inbreeding is not None]
+        return 1 - len(known) / 4 - sum(known) / 4
+
+    def load_ancestry(self, cow_ids):
+        """
+        Reads the ancestry of the given cows, with the inbreeding data of every ancestor, in one query.
+
+        Returns:
+        - `tuple`: The `{(ancestor_id, depth): paths}` ancestry per cow ID, and the
+                   `(inbreeding_coefficient, mendelian_sampling_variance)` of every ancestor.
+        """
+        ancestry = defaultdict(dict)
+        ancestors = {}
+        if not cow_ids:
+            return ancestry, ancestors
+
+        rows = self.filter(descendant_id__in=cow_ids).values_list(*self.pedigree_fields)
+        for descendant_id, ancestor_id, depth, paths, inbreeding, sire_inbreeding, dam_inbreeding in rows:
+            ancestry[descendant_id][(ancestor_id, depth)] = paths
+            ancestors[ancestor_id] = (
+                inbreeding,
+                self.mendelian_sampling_variance(sire_inbreeding, dam_inbreeding),
+            )
+        return ancestry, ancestors
+
+    @staticmethod
+    def get_relationship(sire_ancestry, dam_ancestry, ancestors):
+        """
+        Returns the contribution of each common ancestor to the relationship of a sire and a dam.
+        """
+
+        def gene_contributions(ancestry):
+            contributions = defaultdict(float)
+            for (ancestor_id, depth), paths in ancestry.items():
+                contributions[ancestor_id] += paths * 0.5**depth
+            return contributions
+
+        sire_contributions = gene_contributions(sire_ancestry)
+        dam_contributions = gene_contributions(dam_ancestry)
+        return {
+            ancestor_id: sire_contributions[ancestor_id]
+            * dam_contributions[ancestor_id]
+            * ancestors[ancestor_id][1]
+            for ancestor_id in sire_contributions.keys() & dam_contributions.keys()
+        }
+
+    def add_cows(self, cows):
+        """
+        Adds the ancestry rows of newly created cows and stores their inbreeding coefficients.
+
+        The ancestry of the parents that are not among the new cows is read in one query, so a batch of cows costs
+        the same number of queries as a single cow. Parents must come before their offspring in `cows`.
+
+        Args:
+        - `cows`: The new cows, with their IDs.
+        """
+        cows = list(cows)
+        if not cows:
+            return
+
+        new_cow_ids = {cow.id for cow in cows}
+        ancestry, ancestors = self.load_ancestry(
+            {
+                parent_id
+                for cow in cows
+                for parent_id in (cow.sire_id, cow.dam_id)
+                if parent_id and parent_id not in new_cow_ids
+            }
+        )
+
+        rows = []
+        inbred_cows = []
+        for cow in cows:
+            cow_ancestry = {(cow.id, 0): 1}
+            for parent_id in (cow.sire_id, cow.dam_id):
+                for (ancestor_id, depth), paths in ancestry.get(parent_id, {}).items():
+                    key = (ancestor_id, depth + 1)
+                    cow_ancestry[key] = cow_ancestry.get(key, 0) + paths
+
+            inbreeding = 0.0
+            if cow.sire_id and cow.dam_id:
+                relationship = self.get_relationship(
+                    ancestry.get(cow.sire_id, {}), ancestry.get(cow.dam_id, {}), ancestors
+                )
+                inbreeding = sum(relationship.values()) / 2
+
+            ancestry[cow.id] = cow_ancestry
+            ancestors[cow.id] = (
+                inbreeding,
+                self.mendelian_sampling_variance(
+                    *(ancestors.get(parent_id, (0.0,))[0] for parent_id in (cow.sire_id, cow.dam_id) if parent_id)
+                ),
+            )
+            if cow.inbreeding_coefficient != inbreeding:
+                cow.inbreeding_coefficient = inbreeding
+                inbred_cows.append(cow)
+            rows.extend(
+                self.model(ancestor_id=ancestor_id, descendant_id=cow.id, depth=depth, paths=paths)
+                for (ancestor_id, depth), paths in cow_ancestry.items()
+            )
+
+        with transaction.atomic():
+            self.bulk_create(rows, batch_size=1000)
+            if inbred_cows:
+                self.cow_model.objects.bulk_update(inbred_cows, ["inbreeding_coefficient"])
+
+    def rebuild(self, cow_ids):
+        """
+        Rebuilds the ancestry rows of cows whose parents changed, and of all their descendants.
+
+        Args:
+        - `cow_ids`: The IDs of the cows whose parents changed.
+        """
+        # The deepest generation a cow is found at below the changed cows puts its parents before it
+        generations = dict(
+            self.filter(ancestor_id__in=cow_ids)
+            .values("descendant_id")
+            .annotate(generation=Max("depth"))
+            .values_list("descendant_id", "generation")
+        )
+        cow_ids = set(generations) | set(cow_ids)
+
+        with transaction.atomic():
+            self.filter(descendant_id__in=cow_ids).delete()
+            cows = self.cow_model.objects.filter(id__in=cow_ids).only(
+                "id", "sire_id", "dam_id", "inbreeding_coefficient"
+            )
+            self.add_cows(sorted(cows, key=lambda cow: generations.get(cow.id, 0)))
+
+    def get_inbreeding(self, sire_id, dam_id):
+        """
+        Calculates the inbreeding coefficient of the offspring of a proposed mating.
+
+        Args:
+        - `sire_id`: The ID of the sire.
+        - `dam_id`: The ID of the dam.
+
+        Returns:
+        - `tuple`: The inbreeding coefficient and the contribution of each common ancestor to it.
+        """
+        ancestry, ancestors = self.load_ancestry([sire_id, dam_id])
+        relationship = self.get_relationship(ancestry[sire_id], ancestry[dam_id], ancestors)
+        contributions = {ancestor_id: value / 2 for ancestor_id, value in relationship.items()}
+        return sum(contributions.values()), contributions
+
+    def get_pedigree(self, cow_id, generations):
+        """
+        Returns the pedigree tree of a cow up to the given number of generations.
+
+        Returns:
+        - `dict`: The cow with its `sire` and `dam` nested the same way, None where a parent is unknown.
+        """
+        cows = {}
+        rows = self.filter(descendant_id=cow_id, depth__lte=generations).values_list(
+            "ancestor_id", "ancestor__name", "ancestor__tag_number", "ancestor__sire_id", "ancestor__dam_id"
+        )
+        for ancestor_id, name, tag_number, sire_id, dam_id in rows:
+            cows[ancestor_id] = (name, tag_number, sire_id, dam_id)
+
+        def build_tree(ancestor_id, generation):
+            if ancestor_id not in cows:
+                return None
+            name, tag_number, sire_id, dam_id = cows[ancestor_id]
+            tree = {"id": ancestor_id, "name": name, "tag_number": tag_number}
+            if generation < generations:
+                tree["sire"] = build_tree(sire_id, generation + 1)
+                tree["dam"] = build_tree(dam_id, generation + 1)
+            return tree
+
+        return build_tree(cow_id, 0)
+
+    def get_descendants(self, cow_id):
+        """
+        Returns the descendants of a cow, with the nearest generation each of them belongs to.
+
+        Returns:
+        - `QuerySet`: The `cow`, `name`, `tag_number` and `generation` of every descendant, nearest first.
+        """
+        return (
+            self.filter(ancestor_id=cow_id, depth__gt=0)
+            .values(
+                cow=F("descendant_id"),
+                name=F("descendant__name"),
+                tag_number=F("descendant__tag_number"),
+            )
+            .annotate(generation=Min("depth"))
+            .order_by("generation", "cow")
+        )
+
+
 class InseminationManager(models.Manager):
     @staticmethod
-    def days_since_insemination(insemination):
-        elapsed_time = todays_date - insemination.date_of_insemination.date()
+    def days_since_insemination(insemination, as_of_date=None):
+        elapsed_time = (as_of_date or todays_date()) - insemination.date_of_insemination.date()
         return int(f"{elapsed_time.days}")
 
 
 class PregnancyManager(models.Manager):
     @staticmethod
-    def pregnancy_duration(pregnancy):
+    def pregnancy_duration(pregnancy, as_of_date=None):
         if pregnancy.start_date and not (
             pregnancy.date_of_calving and pregnancy.pregnancy_outcome
         ):
-            return (todays_date - pregnancy.start_date).days
+            return ((as_of_date or todays_date()) - pregnancy.start_date).days
         if pregnancy.date_of_calving and pregnancy.pregnancy_outcome:
             return "Ended"
 
@@ -227,7 +535,7 @@ class PregnancyManager(models.Manager):
 
 class LactationManager(models.Manager):
     @staticmethod
-    def days_in_lactation(lactation):
+    def days_in_lactation(lactation, as_of_date=None):
         """
         Calculate the number of days in the lactation period.
         If the lactation has ended, return the difference between the end date and start date.
@@ -236,13 +544,13 @@ class LactationManager(models.Manager):
         if lactation.end_date:
             return (lactation.end_date - lactation.start_date).days
         else:
-            return (todays_date - lactation.start_date).days
+            return ((as_of_date or todays_date()) - lactation.start_date).days
 
-    def lactation_stage(self, lactation):
+    def lactation_stage(self, lactation, as_of_date=None):
         """
         Determine the stage of lactation based on the number of days.
         """
-        days_in_lactation = self.days_in_lactation(lactation)
+        days_in_lactation = self.days_in_lactation(lactation, as_of_date)
 
         if lactation.end_date:
             return LactationStageChoices.ENDED
@@ -255,9 +563,371 @@ class LactationManager(models.Manager):
         else:
             return LactationStageChoices.DRY
 
+    def get_latest_lactations(self, cow_ids):
+        """
+        Returns the most recent lactation of each of the given cows in a single query.
+
+        Args:
+        - `cow_ids`: The ids of the cows to look up.
+
+        Returns:
+        - `dict`: A mapping of cow id to its most recent lactation. Cows without lactations are omitted.
+        """
+        latest_lactations = {}
+        for lactation in self.filter(cow_id__in=cow_ids).order_by("cow_id", "start_date"):
+            latest_lactations[lactation.cow_id] = lactation
+        return latest_lactations
+
     @staticmethod
     def lactation_end_date_formatted(lactation):
         if lactation.end_date:
             return lactation.end_date.strftime("%Y-%m-%d")
         else:
             return "Ongoing"
+
+
+class BreedingEventManager(models.Manager):
+    """
+    Custom manager for the BreedingEvent table, the precomputed breeding calendar.
+
+    The events of a cow are worked out from its heat, pregnancy and lactation records with the rules below and are
+    refreshed whenever one of those records changes, so the work list is a range scan of an indexed table instead
+    of evaluating the properties of every record in Python. Only alive female cows have events.
+    - Heat check: 21 days after the last observed heat, or 60 days after calving when no heat has been observed
+      since, for cows that are not pregnant.
+    - Pregnancy check: 21 days after the start of an unconfirmed pregnancy, the earliest date a scan is accepted.
+    - Dry off: When an ongoing lactation reaches the dry stage at 275 days.
+    - Calving: The due date of an ongoing pregnancy, 285 days after its start.
+
+    Methods:
+    - `schedule(cow_ids)`: Works out the events the given cows should have.
+    - `refresh(cow_ids)`: Brings the stored events of the given cows in line with their records.
+    """
+
+    # Also used by the migration that schedules the events of the existing herd
+    use_in_migrations = True
+
+    heat_cycle_days = 21
+    calving_to_heat_days = 60
+    pregnancy_check_days = 21
+    dry_off_days = 275
+
+    key_fields = ("cow_id", "event_type", "due_date", "heat_id", "pregnancy_id", "lactation_id")
+
+    def get_related_model(self, field_name):
+        return self.model._meta.get_field(field_name).related_model
+
+    def get_key(self, event):
+        return tuple(getattr(event, field_name) for field_name in self.key_fields)
+
+    def schedule(self, cow_ids=None):
+        """
+        Works out the events the given cows should have from their records, in three queries.
+
+        Args:
+        - `cow_ids`: The IDs of the cows, or None for the whole herd.
+
+        Returns:
+        - `list`: The unsaved `BreedingEvent` instances.
+        """
+        Cow = self.get_related_model("cow")
+        Heat = self.get_related_model("heat")
+        Pregnancy = self.get_related_model("pregnancy")
+        Lactation = self.get_related_model("lactation")
+
+        herd = Cow.objects.filter(
+            gender=SexChoices.FEMALE, availability_status=CowAvailabilityChoices.ALIVE
+        )
+        if cow_ids is not None:
+            herd = herd.filter(id__in=cow_ids)
+
+        ongoing_pregnancies = defaultdict(list)
+        for pregnancy in (
+            Pregnancy.objects.filter(
+                cow__in=herd.values("id"),
+                date_of_calving__isnull=True,
+                pregnancy_failed_date__isnull=True,
+            )
+            .filter(Q(pregnancy_outcome__isnull=True) | Q(pregnancy_outcome=""))
+            .exclude(pregnancy_status=PregnancyStatusChoices.FAILED)
+            .only("id", "cow_id", "start_date", "pregnancy_status", "pregnancy_outcome")
+        ):
+            ongoing_pregnancies[pregnancy.cow_id].append(pregnancy)
+
+        ongoing_lactations = defaultdict(list)
+        for lactation_id, cow_id, start_date in Lactation.objects.filter(
+            cow__in=herd.values("id"), end_date__isnull=True
+        ).values_list("id", "cow_id", "start_date"):
+            ongoing_lactations[cow_id].append((start_date, lactation_id))
+
+        latest_heats = Heat.objects.filter(cow=OuterRef("pk")).order_by("-observation_time")
+        cows = herd.annotate(
+            latest_heat_id=Subquery(latest_heats.values("id")[:1]),
+            latest_heat_time=Subquery(latest_heats.values("observation_time")[:1]),
+        ).values_list("id", "current_pregnancy_status", "latest_heat_id", "latest_heat_time")
+
+        events = []
+        for cow_id, pregnancy_status, heat_id, heat_time in cows:
+            for pregnancy in ongoing_pregnancies[cow_id]:
+                if pregnancy.pregnancy_status == PregnancyStatusChoices.UNCONFIRMED:
+                    events.append(
+                        self.model(
+                            cow_id=cow_id,
+                            event_type=BreedingEventTypeChoices.PREGNANCY_CHECK,
+                            due_date=pregnancy.start_date + timedelta(days=self.pregnancy_check_days),
+                            pregnancy_id=pregnancy.id,
+                        )
+                    )
+                events.append(
+                    self.model(
+                        cow_id=cow_id,
+                        event_type=BreedingEventTypeChoices.CALVING,
+                        due_date=PregnancyManager.due_date(pregnancy),
+                        pregnancy_id=pregnancy.id,
+                    )
+                )
+
+            for start_date, lactation_id in ongoing_lactations[cow_id]:
+                events.append(
+                    self.model(
+                        cow_id=cow_id,
+                        event_type=BreedingEventTypeChoices.DRY_OFF,
+                        due_date=start_date + timedelta(days=self.dry_off_days),
+                        lactation_id=lactation_id,
+                    )
+                )
+
+            if ongoing_pregnancies[cow_id] or pregnancy_status == CowPregnancyChoices.PREGNANT:
+                continue
+            heat_date = timezone.localdate(heat_time) if heat_time else None
+            calving_date, lactation_id = max(ongoing_lactations[cow_id], default=(None, None))
+            if calving_date and (heat_date is None or heat_date < calving_date):
+                # No heat has been observed since calving
+                events.append(
+                    self.model(
+                        cow_id=cow_id,
+                        event_type=BreedingEventTypeChoices.HEAT_CHECK,
+                        due_date=calving_date + timedelta(days=self.calving_to_heat_days),
+                        lactation_id=lactation_id,
+                    )
+                )
+            elif heat_date:
+                events.append(
+                    self.model(
+                        cow_id=cow_id,
+                        event_type=BreedingEventTypeChoices.HEAT_CHECK,
+                        due_date=heat_date + timedelta(days=self.heat_cycle_days),
+                        heat_id=heat_id,
+                    )
+                )
+        return events
+
+    def refresh(self, cow_ids=None):
+        """
+        Brings the stored events of the given cows in line with their records.
+
+        Events that are still due are kept as they are, so their IDs, which identify them in calendar feeds, stay
+        stable. Only the outdated events are deleted and the new ones inserted.
+
+        Args:
+        - `cow_ids`: The IDs of the cows whose records changed, or None to refresh the whole herd.
+        """
+        existing = self.all() if cow_ids is None else self.filter(cow_id__in=cow_ids)
+        scheduled = {self.get_key(event): event for event in self.schedule(cow_ids)}
+
+        outdated = [
+            event_id
+            for event_id, *key in existing.values_list("id", *self.key_fields)
+            if scheduled.pop(tuple(key), None) is None
+        ]
+        if outdated:
+            self.filter(id__in=outdated).delete()
+        if scheduled:
+            self.bulk_create(scheduled.values(), batch_size=1000)
+
+
+class MilkManager(models.Manager):
+    """
+    Custom manager for the Milk model.
+
+    Methods:
+    - `bulk_record(entries)`: Validates and records the milk entries of a whole milking session.
+    """
+
+    def bulk_record(self, entries):
+        """
+        Validates and records the milk entries of a whole milking session.
+
+        The cows and their latest lactations are fetched in one pass and every entry is validated in memory, so
+        the number of queries does not grow with the size of the session. Valid entries are inserted with a
+        single `bulk_create` and the `milk_records_bulk_created` signal is sent inside the same transaction so
+        that the inventory can be updated with one aggregated delta.
+
+        Args:
+        - `entries`: A list of `(index, data)` pairs where `data` holds the `cow` id and `amount_in_kgs`.
+
+        Returns:
+        - `tuple`: The created milk records and a list of `{"index", "cow", "errors"}` dicts for the rejected
+          entries.
+        """
+        from dairy.models import Cow, Lactation
+        from dairy.signals import milk_records_bulk_created
+        from dairy.validators import MilkValidator
+
+        cow_ids = {data["cow"] for index, data in entries}
+        cows = Cow.objects.in_bulk(cow_ids)
+        lactations = Lactation.manager.get_latest_lactations(cow_ids)
+
+        milk_records = []
+        errors = []
+        for index, data in entries:
+            cow = cows.get(data["cow"])
+            if cow is None:
+                errors.append(
+                    {
+                        "index": index,
+                        "cow": data["cow"],
+                        "errors": {
+                            "cow": [f'Invalid pk "{data["cow"]}" - object does not exist.']
+                        },
+                    }
+                )
+                continue
+
+            lactation = lactations.get(cow.id)
+            try:
+                MilkValidator.validate_amount_in_kgs(data["amount_in_kgs"])
+                MilkValidator.validate_cow_status(cow)
+                MilkValidator.validate_lactation(lactation)
+            except ValidationError as e:
+                errors.append(
+                    {
+                        "index": index,
+                        "cow": cow.id,
+                        "errors": {"non_field_errors": e.messages},
+                    }
+                )
+                continue
+
+            milk_records.append(
+                self.model(
+                    cow=cow, amount_in_kgs=data["amount_in_kgs"], lactation=lactation
+                )
+            )
+
+        if milk_records:
+            with transaction.atomic():
+                milk_records = self.bulk_create(milk_records)
+                milk_records_bulk_created.send(sender=self.model, instances=milk_records)
+
+        return milk_records, errors
+
+
+class DailyMilkProductionManager(models.Manager):
+    """
+    Custom manager for the DailyMilkProduction model.
+
+    Methods:
+    - `record_milk(milk_records)`: Adds milk records to the daily totals of their cows.
+    - `refresh(cow_id, date)`: Recomputes the daily totals of a cow from its milk records.
+    """
+
+    @staticmethod
+    def get_milking_day(milking_date):
+        return timezone.localdate(milking_date)
+
+    def record_milk(self, milk_records):
+        """
+        Adds milk records to the daily totals of their cows.
+
+        The existing rollup rows of the affected cows and days are read (and locked) in one query, then updated
+        with `bulk_update`, and the missing ones are inserted with `bulk_create`, so a whole milking session costs
+        the same number of queries as a single record.
+
+        Args:
+        - `milk_records`: The newly saved milk records.
+        """
+        sessions = {}
+        for milk in milk_records:
+            key = (milk.cow_id, self.get_milking_day(milk.milking_date))
+            session = sessions.setdefault(
+                key,
+                {
+                    "total_amount_in_kgs": Decimal("0.00"),
+                    "number_of_milkings": 0,
+                    "first_milking_time": milk.milking_date,
+                    "last_milking_time": milk.milking_date,
+                },
+            )
+            session["total_amount_in_kgs"] += Decimal(str(milk.amount_in_kgs))
+            session["number_of_milkings"] += 1
+            session["first_milking_time"] = min(session["first_milking_time"], milk.milking_date)
+            session["last_milking_time"] = max(session["last_milking_time"], milk.milking_date)
+
+        if not sessions:
+            return
+
+        with transaction.atomic():
+            existing = {
+                (production.cow_id, production.date): production
+                for production in self.select_for_update().filter(
+                    cow_id__in={cow_id for cow_id, date in sessions},
+                    date__in={date for cow_id, date in sessions},
+                )
+            }
+
+            updated = []
+            created = []
+            for (cow_id, date), session in sessions.items():
+                production = existing.get((cow_id, date))
+                if production is None:
+                    created.append(self.model(cow_id=cow_id, date=date, **session))
+                    continue
+
+                production.total_amount_in_kgs += session["total_amount_in_kgs"]
+                production.number_of_milkings += session["number_of_milkings"]
+                production.first_milking_time = min(
+                    production.first_milking_time, session["first_milking_time"]
+                )
+                production.last_milking_time = max(
+                    production.last_milking_time, session["last_milking_time"]
+                )
+                updated.append(production)
+
+            if updated:
+                self.bulk_update(
+                    updated,
+                    [
+                        "total_amount_in_kgs",
+                        "number_of_milkings",
+                        "first_milking_time",
+                        "last_milking_time",
+                    ],
+                )
+            if created:
+                self.bulk_create(created)
+
+    def refresh(self, cow_id, date):
+        """
+        Recomputes the daily totals of a cow from its milk records, removing the row when there are none left.
+
+        Used when a milk record is edited or deleted, where the first and last milking times can not be derived
+        from the change alone.
+
+        Args:
+        - `cow_id`: The id of the cow.
+        - `date`: The milking day to recompute.
+        """
+        from dairy.models import Milk
+
+        totals = Milk.objects.filter(cow_id=cow_id, milking_date__date=date).aggregate(
+            total_amount_in_kgs=Sum("amount_in_kgs"),
+            number_of_milkings=Count("id"),
+            first_milking_time=Min("milking_date"),
+            last_milking_time=Max("milking_date"),
+        )
+
+        if not totals["number_of_milkings"]:
+            self.filter(cow_id=cow_id, date=date).delete()
+        else:
+            self.update_or_create(cow_id=cow_id, date=date, defaults=totals)
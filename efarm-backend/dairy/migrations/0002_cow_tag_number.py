@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:08
+
+from django.db import migrations, models
+
+
+def backfill_tag_numbers(apps, schema_editor):
+    Cow = apps.get_model("dairy", "Cow")
+
+    cows = []
+    for cow in Cow.objects.select_related("breed").only(
+        "id", "date_of_birth", "breed__name"
+    ).iterator(chunk_size=500):
+        cow.tag_number = (
+            f"{cow.breed.name[:2].upper()}-{cow.date_of_birth.strftime('%Y')}-{cow.id}"
+        )
+        cows.append(cow)
+    Cow.objects.bulk_update(cows, ["tag_number"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cow',
+            name='tag_number',
+            field=models.CharField(editable=False, max_length=32, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_tag_numbers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='cow',
+            index=models.Index(fields=['tag_number'], name='cow_tag_number_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
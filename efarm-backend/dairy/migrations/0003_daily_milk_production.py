@@ -0,0 +1,54 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_milk_production(apps, schema_editor):
+    Milk = apps.get_model("dairy", "Milk")
+    DailyMilkProduction = apps.get_model("dairy", "DailyMilkProduction")
+
+    daily_totals = (
+        Milk.objects.annotate(date=TruncDate("milking_date"))
+        .values("cow_id", "date")
+        .annotate(
+            total_amount_in_kgs=Sum("amount_in_kgs"),
+            number_of_milkings=Count("id"),
+            first_milking_time=Min("milking_date"),
+            last_milking_time=Max("milking_date"),
+        )
+        .order_by()
+    )
+    DailyMilkProduction.objects.bulk_create(
+        (DailyMilkProduction(**totals) for totals in daily_totals.iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0002_cow_tag_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMilkProduction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_amount_in_kgs', models.DecimalField(decimal_places=2, default=0.0, max_digits=6)),
+                ('number_of_milkings', models.PositiveSmallIntegerField(default=0)),
+                ('first_milking_time', models.DateTimeField()),
+                ('last_milking_time', models.DateTimeField()),
+                ('cow', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_milk_production', to='dairy.cow')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailymilkproduction',
+            constraint=models.UniqueConstraint(fields=('date', 'cow'), name='unique_daily_milk_production_per_cow'),
+        ),
+        migrations.RunPython(backfill_daily_milk_production, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0003_daily_milk_production'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cow',
+            index=models.Index(condition=models.Q(('availability_status', 'Alive')), fields=['gender'], name='cow_alive_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heat',
+            index=models.Index(fields=['cow', 'observation_time'], name='heat_cow_observation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='insemination',
+            index=models.Index(fields=['cow', 'date_of_insemination'], name='insemination_cow_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lactation',
+            index=models.Index(fields=['cow', 'start_date'], name='lactation_cow_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lactation',
+            index=models.Index(condition=models.Q(('end_date__isnull', True)), fields=['cow'], name='lactation_open_per_cow_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='milk',
+            index=models.Index(fields=['cow', 'milking_date'], name='milk_cow_milking_date_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:24
+
+import django.core.validators
+import efarm.clock
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='semen',
+            name='date_of_expiry',
+            field=models.DateField(error_messages={'min_value': 'Invalid date entry, Date of expiry must be in future'}, validators=[django.core.validators.MinValueValidator(efarm.clock.todays_date)]),
+        ),
+        migrations.AlterField(
+            model_name='semen',
+            name='date_of_production',
+            field=models.DateField(error_messages={'max_value': 'Invalid date entry, Dates of production must not be in future'}, validators=[django.core.validators.MaxValueValidator(efarm.clock.todays_date)]),
+        ),
+        migrations.AlterField(
+            model_name='symptoms',
+            name='date_observed',
+            field=models.DateField(error_messages={'max_value': 'The date of observation cannot be in the future!.'}, validators=[django.core.validators.MaxValueValidator(efarm.clock.todays_date)]),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:50
+
+import dairy.managers
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_cow_ancestry(apps, schema_editor):
+    Cow = apps.get_model("dairy", "Cow")
+    CowAncestry = apps.get_model("dairy", "CowAncestry")
+
+    # Add parents before their offspring, so that every cow's parents have their ancestry when it is added
+    cows = {cow.id: cow for cow in Cow.objects.only("id", "sire_id", "dam_id", "inbreeding_coefficient")}
+    ordered_cows = []
+    added = set()
+
+    def add(cow):
+        for parent_id in (cow.sire_id, cow.dam_id):
+            if parent_id in cows and parent_id not in added:
+                add(cows[parent_id])
+        if cow.id not in added:
+            added.add(cow.id)
+            ordered_cows.append(cow)
+
+    for cow in cows.values():
+        add(cow)
+    CowAncestry.objects.add_cows(ordered_cows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0005_as_of_date_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cow',
+            name='inbreeding_coefficient',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='CowAncestry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('paths', models.PositiveIntegerField(default=1)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='dairy.cow')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='dairy.cow')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='cow_ancestry_ancestor_idx')],
+            },
+            managers=[
+                ('objects', dairy.managers.CowAncestryManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='cowancestry',
+            constraint=models.UniqueConstraint(fields=('descendant', 'ancestor', 'depth'), name='unique_cow_ancestry'),
+        ),
+        migrations.RunPython(build_cow_ancestry, migrations.RunPython.noop),
+    ]
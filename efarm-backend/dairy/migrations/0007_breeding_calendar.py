@@ -0,0 +1,40 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:56
+
+import dairy.managers
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def schedule_breeding_events(apps, schema_editor):
+    BreedingEvent = apps.get_model("dairy", "BreedingEvent")
+    BreedingEvent.objects.refresh()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0006_cow_ancestry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BreedingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('Heat Check', 'Heat Check'), ('Pregnancy Check', 'Pregnancy Check'), ('Dry Off', 'Dry Off'), ('Calving', 'Calving')], max_length=15)),
+                ('due_date', models.DateField()),
+                ('cow', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='breeding_events', to='dairy.cow')),
+                ('heat', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dairy.heat')),
+                ('lactation', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dairy.lactation')),
+                ('pregnancy', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dairy.pregnancy')),
+            ],
+            options={
+                'ordering': ['due_date', 'event_type', 'cow_id'],
+                'indexes': [models.Index(fields=['due_date', 'event_type'], name='breeding_event_due_idx')],
+            },
+            managers=[
+                ('objects', dairy.managers.BreedingEventManager()),
+            ],
+        ),
+        migrations.RunPython(schedule_breeding_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 01:24
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0007_breeding_calendar'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cow',
+            name='cow_tag_number_prefix_idx',
+        ),
+    ]
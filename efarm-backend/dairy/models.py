@@ -1,4 +1,4 @@
-from datetime import date, datetime, timedelta
+from datetime import timedelta
 
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -60,8 +60,19 @@ class Cow(models.Model):
     - `date_introduced_in_farm` (date): The date the cow was introduced to the farm.
     - `is_bought` (bool): Indicates whether the cow was bought or not.
     - `date_of_death` (date or None): The date of death of the cow, if applicable.
+    - `tag_number` (str): The tag number of the cow, kept in sync with the breed, year of birth and ID on save.
+    - `inbreeding_coefficient` (float): The inbreeding coefficient of the cow, calculated from its pedigree.
     """
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["gender"],
+                name="cow_alive_gender_idx",
+                condition=models.Q(availability_status="Alive"),
+            ),
+        ]
+
     name = models.CharField(max_length=35)
     breed = models.ForeignKey(
         CowBreed, on_delete=models.PROTECT, db_index=True, related_name="cows"
@@ -97,17 +108,12 @@ class Cow(models.Model):
     date_introduced_in_farm = models.DateField(auto_now_add=True)
     is_bought = models.BooleanField(default=False)
     date_of_death = models.DateField(null=True)
+    tag_number = models.CharField(max_length=32, unique=True, null=True, editable=False)
+    inbreeding_coefficient = models.FloatField(default=0.0, editable=False)
 
     objects = models.Manager()
     manager = CowManager()
 
-    @property
-    def tag_number(self):
-        """
-        Returns the tag number of the cow.
-        """
-        return Cow.manager.get_tag_number(self)
-
     @property
     def parity(self):
         """
@@ -147,12 +153,13 @@ class Cow(models.Model):
         )
         CowValidator.validate_gender_update(self.pk, self.gender)
         CowValidator.validate_sire_dam_relationship(self.sire, self.dam)
+        CowValidator.validate_pedigree(self.pk, self.sire, self.dam)
 
     def __str__(self):
         """
         Returns a string representation of the cow.
         """
-        return self.tag_number
+        return self.tag_number or Cow.manager.get_tag_number(self)
 
     def save(self, *args, **kwargs):
         """
@@ -160,6 +167,11 @@ class Cow(models.Model):
         """
         self.clean()
         super().save(*args, **kwargs)
+        # The tag number embeds the ID, so it can only be set once the cow has been saved
+        tag_number = Cow.manager.get_tag_number(self)
+        if self.tag_number != tag_number:
+            self.tag_number = tag_number
+            Cow.objects.filter(pk=self.pk).update(tag_number=tag_number)
         # CowValidator.validate_introduction_date(self.date_introduced_in_farm)
         CowValidator.validate_age_category(
             self.age,
@@ -187,6 +199,42 @@ class Cow(models.Model):
         )
 
 
+class CowAncestry(models.Model):
+    """
+    Represents an ancestor of a cow in the herd pedigree, as a row of an ancestry closure table.
+
+    Every cow has a row for itself at depth 0. An ancestor that appears in more than one generation of a cow's
+    pedigree has a row per generation, and an ancestor reached along several paths in the same generation has
+    the number of paths in `paths`.
+
+    Attributes:
+    - `ancestor` (Cow): The ancestor.
+    - `descendant` (Cow): The descendant.
+    - `depth` (int): The number of generations between the two, 1 for a parent and 2 for a grandparent.
+    - `paths` (int): The number of pedigree paths that lead from the descendant to the ancestor at this depth.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["descendant", "ancestor", "depth"], name="unique_cow_ancestry"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["ancestor", "depth"], name="cow_ancestry_ancestor_idx"),
+        ]
+
+    ancestor = models.ForeignKey(Cow, on_delete=models.CASCADE, related_name="descendant_links")
+    descendant = models.ForeignKey(Cow, on_delete=models.CASCADE, related_name="ancestor_links")
+    depth = models.PositiveSmallIntegerField()
+    paths = models.PositiveIntegerField(default=1)
+
+    objects = CowAncestryManager()
+
+    def __str__(self):
+        return f"{self.ancestor} is an ancestor of {self.descendant} at depth {self.depth}"
+
+
 class Inseminator(models.Model):
     """
     Represents an inseminator responsible for cow insemination.
@@ -223,6 +271,13 @@ class Heat(models.Model):
     - `cow` (Cow): The cow associated with the heat observation.
     """
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["cow", "observation_time"], name="heat_cow_observation_idx"
+            ),
+        ]
+
     observation_time = models.DateTimeField()
     cow = models.ForeignKey(Cow, on_delete=models.CASCADE, related_name="heat_records")
 
@@ -361,6 +416,11 @@ class Insemination(models.Model):
 
     class Meta:
         ordering = ["-date_of_insemination"]
+        indexes = [
+            models.Index(
+                fields=["cow", "date_of_insemination"], name="insemination_cow_date_idx"
+            ),
+        ]
 
     date_of_insemination = models.DateTimeField(auto_now_add=True)
     cow = models.ForeignKey(Cow, on_delete=models.PROTECT, related_name="inseminations")
@@ -423,6 +483,16 @@ class Lactation(models.Model):
 
     class Meta:
         get_latest_by = "-start_date"
+        indexes = [
+            models.Index(
+                fields=["cow", "start_date"], name="lactation_cow_start_date_idx"
+            ),
+            models.Index(
+                fields=["cow"],
+                name="lactation_open_per_cow_idx",
+                condition=models.Q(end_date__isnull=True),
+            ),
+        ]
 
     start_date = models.DateField()
     end_date = models.DateField(null=True)
@@ -495,6 +565,42 @@ class Lactation(models.Model):
         super().save(*args, **kwargs)
 
 
+class BreedingEvent(models.Model):
+    """
+    Represents a breeding task that is due for a cow, such as a heat check or calving.
+
+    The events are derived from the heat, pregnancy and lactation records by `BreedingEventManager` and kept up to
+    date as those records change, they are not edited directly.
+
+    Attributes:
+    - `cow` (Cow): The cow the task is for.
+    - `event_type` (str): The kind of task.
+    - `due_date` (date): The date the task is due.
+    - `heat` (Heat or None): The heat record the event follows from, for heat checks after a heat.
+    - `pregnancy` (Pregnancy or None): The pregnancy the event follows from, for pregnancy checks and calvings.
+    - `lactation` (Lactation or None): The lactation the event follows from, for dry offs and heat checks after
+                                       calving.
+    """
+
+    class Meta:
+        ordering = ["due_date", "event_type", "cow_id"]
+        indexes = [
+            models.Index(fields=["due_date", "event_type"], name="breeding_event_due_idx"),
+        ]
+
+    cow = models.ForeignKey(Cow, on_delete=models.CASCADE, related_name="breeding_events")
+    event_type = models.CharField(max_length=15, choices=BreedingEventTypeChoices.choices)
+    due_date = models.DateField()
+    heat = models.ForeignKey(Heat, on_delete=models.CASCADE, null=True, related_name="+")
+    pregnancy = models.ForeignKey(Pregnancy, on_delete=models.CASCADE, null=True, related_name="+")
+    lactation = models.ForeignKey(Lactation, on_delete=models.CASCADE, null=True, related_name="+")
+
+    objects = BreedingEventManager()
+
+    def __str__(self):
+        return f"{self.event_type} for {self.cow} on {self.due_date}"
+
+
 class Milk(models.Model):
     """
     Represents a milk record for a cow.
@@ -508,6 +614,11 @@ class Milk(models.Model):
 
     class Meta:
         get_latest_by = "-milking_date"
+        indexes = [
+            models.Index(
+                fields=["cow", "milking_date"], name="milk_cow_milking_date_idx"
+            ),
+        ]
 
     milking_date = models.DateTimeField(auto_now_add=True)
     cow = models.ForeignKey(Cow, on_delete=models.CASCADE, related_name="milk_records")
@@ -518,6 +629,9 @@ class Milk(models.Model):
         Lactation, on_delete=models.CASCADE, null=True, editable=False
     )
 
+    objects = models.Manager()
+    manager = MilkManager()
+
     def __str__(self):
         """
         Returns a string representation of the milk record.
@@ -542,6 +656,46 @@ class Milk(models.Model):
         super().save(*args, **kwargs)
 
 
+class DailyMilkProduction(models.Model):
+    """
+    Represents the milk produced by a cow on a single day, rolled up from its milk records.
+
+    The rows are kept up to date as milk records are added, edited and deleted, so the dashboards can read
+    daily totals without scanning the raw milk records.
+
+    Attributes:
+    - `date` (date): The milking day.
+    - `cow` (Cow): The cow that was milked.
+    - `total_amount_in_kgs` (Decimal): The total amount of milk produced on the day in kilograms.
+    - `number_of_milkings` (int): The number of milk records of the day.
+    - `first_milking_time` (datetime): The time of the first milking of the day.
+    - `last_milking_time` (datetime): The time of the last milking of the day.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "cow"], name="unique_daily_milk_production_per_cow"
+            )
+        ]
+
+    date = models.DateField()
+    cow = models.ForeignKey(
+        Cow, on_delete=models.CASCADE, related_name="daily_milk_production"
+    )
+    total_amount_in_kgs = models.DecimalField(
+        default=0.00, max_digits=6, decimal_places=2
+    )
+    number_of_milkings = models.PositiveSmallIntegerField(default=0)
+    first_milking_time = models.DateTimeField()
+    last_milking_time = models.DateTimeField()
+
+    objects = DailyMilkProductionManager()
+
+    def __str__(self):
+        return f"{self.total_amount_in_kgs} kgs of milk from {self.cow} on {self.date}"
+
+
 class WeightRecord(models.Model):
     cow = models.ForeignKey(Cow, on_delete=models.CASCADE)
     date = models.DateField(auto_now_add=True)
@@ -610,13 +764,13 @@ class Semen(models.Model):
     producer = models.CharField(max_length=64, choices=SemenSourceChoices.choices)
     semen_batch = models.CharField(max_length=64)
     date_of_production = models.DateField(
-        validators=[MaxValueValidator(date.today())],
+        validators=[MaxValueValidator(todays_date)],
         error_messages={
             "max_value": "Invalid date entry, Dates of production must not be in future"
         },
     )
     date_of_expiry = models.DateField(
-        validators=[MinValueValidator(date.today())],
+        validators=[MinValueValidator(todays_date)],
         error_messages={
             "min_value": "Invalid date entry, Date of expiry must be in future"
         },
@@ -685,7 +839,7 @@ class Symptoms(models.Model):
     type = models.CharField(max_length=20, choices=symptom_types)
     description = models.TextField()
     date_observed = models.DateField(
-        validators=[MaxValueValidator(date.today())],
+        validators=[MaxValueValidator(todays_date)],
         error_messages={
             "max_value": "The date of observation cannot be in the future!."
         },
@@ -930,7 +1084,7 @@ class Disease(models.Model):
         if self.recovered_date and self.occurrence_date > self.recovered_date:
             raise ValidationError("Recovered date must be after the occurrence date.")
 
-        if self.occurrence_date > datetime.now().date():
+        if self.occurrence_date > todays_date():
             raise ValidationError("Occurrence date cannot be in the future.")
 
         if not self.name:
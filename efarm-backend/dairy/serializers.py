@@ -105,12 +105,36 @@ class LactationSerializer(serializers.ModelSerializer):
         return lactation_instance
 
 
+class BreedingEventSerializer(serializers.ModelSerializer):
+    cow_name = serializers.ReadOnlyField(source="cow.name")
+    cow_tag_number = serializers.ReadOnlyField(source="cow.tag_number")
+
+    class Meta:
+        model = BreedingEvent
+        fields = [
+            "id",
+            "cow",
+            "cow_name",
+            "cow_tag_number",
+            "event_type",
+            "due_date",
+            "heat",
+            "pregnancy",
+            "lactation",
+        ]
+
+
 class MilkSerializer(serializers.ModelSerializer):
     class Meta:
         model = Milk
         fields = "__all__"
 
 
+class MilkBulkEntrySerializer(serializers.Serializer):
+    cow = serializers.IntegerField()
+    amount_in_kgs = serializers.DecimalField(max_digits=4, decimal_places=2)
+
+
 class WeightRecordSerializer(serializers.ModelSerializer):
     cow = serializers.PrimaryKeyRelatedField(queryset=Cow.objects.all())
 
@@ -1,7 +1,61 @@
-from django.db.models.signals import post_save, pre_save
-from django.dispatch import receiver
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal
 from datetime import timedelta
 from dairy.models import *
+from efarm.caching import bump_generations
+from efarm.instrumentation import receiver
+
+# Sent with the created `instances` after milk records are inserted with `bulk_create`, which skips the
+# model's save signals.
+milk_records_bulk_created = Signal()
+
+
+BREEDING_STATUS_FIELDS = ("gender", "availability_status", "current_pregnancy_status")
+
+
+@receiver(pre_save, sender=Cow)
+def remember_previous_state(sender, instance, **kwargs):
+    # Keep the stored parents and breeding status of an edited cow to tell whether its ancestry and breeding
+    # calendar have to be rebuilt
+    instance._previous_parents = instance._previous_breeding_status = None
+    if instance.pk:
+        previous = Cow.objects.filter(pk=instance.pk).values_list(
+            "sire_id", "dam_id", *BREEDING_STATUS_FIELDS
+        ).first()
+        if previous:
+            instance._previous_parents = previous[:2]
+            instance._previous_breeding_status = previous[2:]
+
+
+@receiver(post_save, sender=Cow)
+def update_cow_ancestry(sender, instance, created, **kwargs):
+    if created:
+        CowAncestry.objects.add_cows([instance])
+    elif getattr(instance, "_previous_parents", None) != (instance.sire_id, instance.dam_id):
+        CowAncestry.objects.rebuild([instance.pk])
+
+
+@receiver(post_save, sender=Cow)
+def update_breeding_calendar_of_cow(sender, instance, created, **kwargs):
+    # A new cow has no breeding records yet
+    breeding_status = tuple(getattr(instance, field) for field in BREEDING_STATUS_FIELDS)
+    if not created and getattr(instance, "_previous_breeding_status", None) != breeding_status:
+        BreedingEvent.objects.refresh([instance.pk])
+
+
+@receiver(pre_delete, sender=Cow)
+def remember_offspring(sender, instance, **kwargs):
+    instance._offspring_ids = list(
+        Cow.objects.filter(Q(sire=instance) | Q(dam=instance)).values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Cow)
+def rebuild_offspring_ancestry(sender, instance, **kwargs):
+    # The offspring lose the deleted cow as a parent, and the ancestors they were related to through it
+    if getattr(instance, "_offspring_ids", None):
+        CowAncestry.objects.rebuild(instance._offspring_ids)
 
 
 @receiver(post_save, sender=Pregnancy)
@@ -35,6 +89,23 @@ def create_lactation(sender, instance, **kwargs):
         )
 
 
+@receiver(post_save, sender=Heat)
+@receiver(post_save, sender=Pregnancy)
+@receiver(post_save, sender=Lactation)
+def update_breeding_calendar(sender, instance, **kwargs):
+    BreedingEvent.objects.refresh([instance.cow_id])
+
+
+@receiver(post_delete, sender=Heat)
+@receiver(post_delete, sender=Pregnancy)
+@receiver(post_delete, sender=Lactation)
+def update_breeding_calendar_after_delete(sender, instance, origin=None, **kwargs):
+    # Records deleted along with their cow or another record are left to the deletion they cascade from, whose
+    # events may not have been deleted yet
+    if isinstance(origin, sender) or getattr(origin, "model", None) is sender:
+        BreedingEvent.objects.refresh([instance.cow_id])
+
+
 @receiver(post_save, sender=Insemination)
 def create_pregnancy_from_successful_insemination(sender, instance, **kwargs):
     if instance.success and not instance.pregnancy:
@@ -57,6 +128,53 @@ def set_lactation_for_new_milk(sender, instance, **kwargs):
             instance.lactation = most_recent_lactation
 
 
+@receiver(pre_save, sender=Milk)
+def remember_previous_milk_record(sender, instance, **kwargs):
+    # Keep the stored amount, cow and milking time of an edited milk record in one read: the milk inventory only
+    # applies the difference in amount, and the daily production fixes up the day the record was moved from
+    instance._previous_amount_in_kgs = instance._previous_milking_day = None
+    if instance.pk:
+        previous = Milk.objects.filter(pk=instance.pk).values_list(
+            "amount_in_kgs", "cow_id", "milking_date"
+        ).first()
+        if previous:
+            instance._previous_amount_in_kgs = previous[0]
+            instance._previous_milking_day = previous[1:]
+
+
+@receiver(post_save, sender=Milk)
+def update_daily_milk_production(sender, instance, created, **kwargs):
+    if created:
+        DailyMilkProduction.objects.record_milk([instance])
+        return
+
+    milking_day = (
+        instance.cow_id,
+        DailyMilkProduction.objects.get_milking_day(instance.milking_date),
+    )
+    previous = getattr(instance, "_previous_milking_day", None)
+    if previous:
+        previous_milking_day = (
+            previous[0],
+            DailyMilkProduction.objects.get_milking_day(previous[1]),
+        )
+        if previous_milking_day != milking_day:
+            DailyMilkProduction.objects.refresh(*previous_milking_day)
+    DailyMilkProduction.objects.refresh(*milking_day)
+
+
+@receiver(post_delete, sender=Milk)
+def remove_deleted_milk_from_daily_production(sender, instance, **kwargs):
+    DailyMilkProduction.objects.refresh(
+        instance.cow_id, DailyMilkProduction.objects.get_milking_day(instance.milking_date)
+    )
+
+
+@receiver(milk_records_bulk_created, sender=Milk)
+def update_daily_milk_production_in_bulk(sender, instances, **kwargs):
+    DailyMilkProduction.objects.record_milk(instances)
+
+
 @receiver(post_save, sender=CullingRecord)
 def set_cow_production_status_to_culled(sender, instance, **kwargs):
     cow = instance.cow
@@ -70,3 +188,17 @@ def set_cow_production_status_to_quarantined(sender, instance, **kwargs):
     if instance.start_date and instance.end_date is None:
         cow.current_production_status == CowProductionStatusChoices.QUARANTINED
         cow.save()
+
+
+# Registered last, so the counters are bumped after the other receivers have updated the derived tables
+@receiver(post_save, sender=Cow)
+@receiver(post_save, sender=Milk)
+@receiver(post_save, sender=Pregnancy)
+@receiver(post_save, sender=Lactation)
+@receiver(post_delete, sender=Cow)
+@receiver(post_delete, sender=Milk)
+@receiver(post_delete, sender=Pregnancy)
+@receiver(post_delete, sender=Lactation)
+@receiver(milk_records_bulk_created, sender=Milk)
+def invalidate_cached_dashboards(sender, **kwargs):
+    bump_generations(sender)
@@ -13,6 +13,7 @@ router.register(r'insemination-records', InseminationViewset, basename='insemina
 router.register(r'milk-records', MilkViewSet, basename='milk-records')
 router.register(r'lactation-records', LactationViewSet, basename='lactation-records')
 router.register(r'pregnancy-records', PregnancyViewSet, basename='pregnancy-records')
+router.register(r'work-list', BreedingCalendarViewSet, basename='work-list')
 # router.register(r'symptoms-records', SymptomsViewSet, basename='symptoms-records')
 router.register(r'weight-records', WeightRecordViewSet, basename='weight-records')
 router.register(r'culling-records', CullingRecordViewSet, basename='culling-records')
@@ -1,9 +1,10 @@
 from datetime import timedelta
 
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from dairy.choices import *
-from dairy.utils import *
+from efarm.clock import todays_date
 
 
 class CowBreedValidator:
@@ -55,9 +56,14 @@ class CowValidator:
     - `validate_gender_update(pk, gender)`: Validates the update of the cow's gender based on the existence of the primary key.
     - `validate_name(name)`: Validates the name of the cow.
     - `validate_sire_dam_relationship(sire, dam)`: Validates the sire-dam relationship.
+    - `validate_pedigree(cow_id, sire, dam)`: Validates that a cow is not made an ancestor of itself.
     - `validate_introduction_date(date_introduced_in_farm)`: Validates the date of introduction to the farm.
     - `validate_production_status(production_status, gender, category, age, calf_records, is_bought )`: Validates the production status of the cow based on its gender, category, and age.
     - `validate_age_category(age, category, gender, calf_records, is_bought)`: Validates the age category of the cow based on its age, gender, calf records, and whether it was bought.
+    - `has_calving_history(calf_records, cow)`: Checks whether a cow has calf or pregnancy records.
+
+    The checks that look up pregnancy records accept `has_pregnancies` so that callers validating many new cows
+    at once can pass it in instead of querying per cow.
     """
 
     @staticmethod
@@ -99,7 +105,7 @@ class CowValidator:
             raise ValidationError(
                 f"Cow cannot be older than 7 years! Current age specified: {round((age / 365), 2)} years"
             )
-        if date_of_birth > todays_date:
+        if date_of_birth > todays_date():
             raise ValidationError(
                 f"Date of birth cannot be in the future. You entered {date_of_birth}"
             )
@@ -122,18 +128,18 @@ class CowValidator:
                 raise ValidationError(
                     "Sorry, this cow died! Update its status by adding the date of death."
                 )
-            if date_of_death > todays_date:
+            if date_of_death > todays_date():
                 raise ValidationError(
                     f"Date of death cannot be in the future. You entered {date_of_death}"
                 )
-            if (todays_date - date_of_death).days > 1:
+            if (todays_date() - date_of_death).days > 1:
                 raise ValidationError(
                     "Date of death entries longer than 24 hours ago are not allowed."
                 )
 
     @staticmethod
     def validate_pregnancy_status(
-        cow, age, pregnancy_status, availability_status, gender
+        cow, age, pregnancy_status, availability_status, gender, has_pregnancies=None
     ):
         """
         Validates the pregnancy status of the cow based on its age, availability status, and gender.
@@ -143,6 +149,7 @@ class CowValidator:
         - `age`: The age of the cow in days.
         - `availability_status`: The availability status of the cow.
         - `gender`: The gender of the cow.
+        - `has_pregnancies`: Whether the cow has pregnancy records, queried when not given.
 
         Raises:
         - `ValidationError`: If the cow is set as pregnant and its age is less than 12 months,
@@ -172,13 +179,14 @@ class CowValidator:
                 f"Male cows can only have an 'Unavailable' status. You cannot set them as {pregnancy_status}."
             )
 
-        has_pregnancy_records = cow.pregnancies.exists()
+        if has_pregnancies is None:
+            has_pregnancies = cow.pregnancies.exists()
 
-        if has_pregnancy_records:
+        if has_pregnancies:
             latest_pregnancy = cow.pregnancies.latest("date_of_calving")
             if (
                 cow.current_pregnancy_status != CowPregnancyChoices.CALVED
-                and todays_date - latest_pregnancy.date_of_calving < timedelta(days=60)
+                and todays_date() - latest_pregnancy.date_of_calving < timedelta(days=60)
             ):
                 raise ValidationError(
                     f"This cow gave birth recently and must be marked as 'Calved'. Not ({cow.current_pregnancy_status})"
@@ -220,24 +228,45 @@ class CowValidator:
         """
         Validates the sire-dam relationship.
         """
-        if sire or dam and sire.gender != SexChoices.MALE:
+        if sire and sire.gender != SexChoices.MALE:
             raise ValidationError("The sire should be a male cow.")
-        if dam or sire and dam.gender != SexChoices.FEMALE:
+        if dam and dam.gender != SexChoices.FEMALE:
             raise ValidationError("The dam should be a female cow.")
 
+    @staticmethod
+    def validate_pedigree(cow_id, sire, dam):
+        """
+        Validates that neither parent of a cow is the cow itself or one of its descendants.
+
+        Args:
+        - `cow_id`: The ID of the cow, None for a new cow, which can't have descendants yet.
+        - `sire`: The sire of the cow.
+        - `dam`: The dam of the cow.
+
+        Raises:
+        - `ValidationError`: If the parents would make the cow an ancestor of itself.
+        """
+        from dairy.models import CowAncestry
+
+        parent_ids = [parent.pk for parent in (sire, dam) if parent]
+        if not cow_id or not parent_ids:
+            return
+        if CowAncestry.objects.filter(ancestor_id=cow_id, descendant_id__in=parent_ids).exists():
+            raise ValidationError("A cow cannot be the parent of itself or of its ancestors.")
+
     @staticmethod
     def validate_introduction_date(date_introduced_in_farm):
         """
         Validates the date of introduction to the farm.
         """
-        if date_introduced_in_farm > todays_date:
+        if date_introduced_in_farm > todays_date():
             raise ValidationError(
                 f"Date of introduction cannot be in the future: ({date_introduced_in_farm})."
             )
 
     @staticmethod
     def validate_production_status(
-        production_status, gender, category, age, calf_records, is_bought, cow
+        production_status, gender, category, age, calf_records, is_bought, cow, has_pregnancies=None
     ):
         """
         Validates the production status of the cow based on its gender, category, age, and calf records.
@@ -249,13 +278,12 @@ class CowValidator:
         - `age`: The age of the cow in days.
         - `calf_records`: A list of calf records for the cow.
         - `is_bought`: A boolean indicating if the cow is bought or not.
+        - `has_pregnancies`: Whether the cow has pregnancy records, queried when not given.
 
         Raises:
         - `ValidationError`: If the production status is invalid based on the cow's gender, category, age,
          and calf records.
         """
-        from dairy.models import Pregnancy
-
         if production_status not in CowProductionStatusChoices.values:
             raise ValidationError(
                 f"Invalid cow production status: '{production_status}'."
@@ -345,9 +373,8 @@ class CowValidator:
                                 f"Lactating', or 'Dry' production status, not '{production_status}'."
                             )
                     else:
-                        if (
-                            any(calf_records)
-                            or len(list(Pregnancy.objects.filter(cow=cow))) > 0
+                        if CowValidator.has_calving_history(
+                            calf_records, cow, has_pregnancies
                         ):
                             if production_status not in [
                                 CowProductionStatusChoices.OPEN,
@@ -370,9 +397,30 @@ class CowValidator:
                     raise ValidationError(f"Invalid cow category: '{category}'.")
 
     @staticmethod
-    def validate_age_category(age, category, gender, calf_records, is_bought, cow):
+    def has_calving_history(calf_records, cow, has_pregnancies=None):
+        """
+        Checks whether a cow has calved, from its calf records or its pregnancy records.
+
+        Args:
+        - `calf_records`: A list of calf records for the cow.
+        - `cow`: The cow object.
+        - `has_pregnancies`: Whether the cow has pregnancy records, queried when not given.
+
+        Returns:
+        - `bool`: True if the cow has calf or pregnancy records.
+        """
         from dairy.models import Pregnancy
 
+        if any(calf_records):
+            return True
+        if has_pregnancies is None:
+            has_pregnancies = Pregnancy.objects.filter(cow=cow).exists()
+        return has_pregnancies
+
+    @staticmethod
+    def validate_age_category(
+        age, category, gender, calf_records, is_bought, cow, has_pregnancies=None
+    ):
         if category not in CowCategoryChoices.values:
             raise ValidationError(f"Invalid cow category: ({category}).")
 
@@ -403,9 +451,8 @@ class CowValidator:
                     )
             else:
                 if gender == SexChoices.FEMALE:
-                    if (
-                        any(calf_records)
-                        or len(list(Pregnancy.objects.filter(cow=cow))) > 0
+                    if CowValidator.has_calving_history(
+                        calf_records, cow, has_pregnancies
                     ):
                         if category != CowCategoryChoices.MILKING_COW:
                             raise ValidationError(
@@ -569,7 +616,7 @@ class PregnancyValidator:
                 "Pregnancy is marked as failed, provide the date of failure"
             )
 
-        if (todays_date - start_sate) < timedelta(
+        if (todays_date() - start_sate) < timedelta(
             days=21
         ) and pregnancy_status != PregnancyStatusChoices.UNCONFIRMED:
             raise ValidationError(
@@ -584,14 +631,14 @@ class PregnancyValidator:
         pregnancy_scan_date,
         pregnancy_failed_date,
     ):
-        if start_date > todays_date:
+        if start_date > todays_date():
             raise ValidationError("Start date cannot be in the future.")
 
         if date_of_calving and start_date:
             if date_of_calving < start_date:
                 raise ValidationError("Date of calving must be after the start date.")
 
-            if date_of_calving > todays_date:
+            if date_of_calving > todays_date():
                 raise ValidationError("Calving date cannot be in the future.")
 
             min_days_between_calving_and_start = 270
@@ -613,7 +660,7 @@ class PregnancyValidator:
                     "Pregnancy scan date must be after the start date."
                 )
 
-            if pregnancy_scan_date.date() > todays_date:
+            if pregnancy_scan_date.date() > todays_date():
                 raise ValidationError("Pregnancy scan date cannot be in the future.")
 
             min_days_after_start_date_for_scan = 21
@@ -630,7 +677,7 @@ class PregnancyValidator:
                 )
 
         if pregnancy_failed_date and start_date:
-            if pregnancy_failed_date > todays_date:
+            if pregnancy_failed_date > todays_date():
                 raise ValidationError("Pregnancy failed date cannot be in the future.")
 
             if pregnancy_failed_date < start_date:
@@ -729,10 +776,10 @@ class LactationValidator:
 
     @staticmethod
     def validate_fields(start_date, pregnancy, lactation_number, cow, lactation):
-        if start_date > todays_date:
+        if start_date > todays_date():
             raise ValidationError("Start date cannot be in the future.")
 
-        if lactation.end_date and lactation.end_date > todays_date:
+        if lactation.end_date and lactation.end_date > todays_date():
             raise ValidationError("Start date cannot be in the future.")
 
         if cow.is_bought and pregnancy is not None:
@@ -759,6 +806,13 @@ class MilkValidator:
     def validate_cow_eligibility(cow):
         from dairy.models import Lactation
 
+        MilkValidator.validate_cow_status(cow)
+
+        lactation = Lactation.objects.filter(cow=cow).latest()
+        MilkValidator.validate_lactation(lactation)
+
+    @staticmethod
+    def validate_cow_status(cow):
         if cow.availability_status == CowAvailabilityChoices.DEAD:
             raise ValidationError("Cannot add milk record for a dead cow.")
 
@@ -773,7 +827,8 @@ class MilkValidator:
                 f"Cow is less than 21 months old and should not have a milk record. It is currently: {round((cow.age / 30.417), 2)} months old"
             )
 
-        lactation = Lactation.objects.filter(cow=cow).latest()
+    @staticmethod
+    def validate_lactation(lactation):
         if lactation is None:
             raise ValidationError("Cannot add milk entry, cow has no active lactation")
 
@@ -2,18 +2,27 @@ import os
 
 from django.conf import settings
 from django.db.models import Sum
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework import viewsets
-from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.decorators import action
+from rest_framework.exceptions import MethodNotAllowed, PermissionDenied
 from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
+from efarm.async_views import AsyncAPIView, gather_queries
+from efarm.caching import cache_response
+from efarm.ical import CalendarEvent, iter_ical
+from efarm.mixins import RecordExportMixin, RegisterImportMixin, StreamingListMixin
+from efarm.pagination import RecordCursorPagination
+from dairy.analytics import LactationCurveAnalyzer
+from dairy.exporters import MilkExporter
 from dairy.filters import *
+from dairy.importers import HerdImporter
 from dairy.permissions import *
 from dairy.serializers import *
+from users.permissions import HasActionRole
 
 
 class CowBreedViewSet(viewsets.ModelViewSet):
@@ -23,18 +32,12 @@ class CowBreedViewSet(viewsets.ModelViewSet):
     filterset_class = CowBreedFilterSet
     ordering_fields = ["name"]
 
-    def get_permissions(self):
-        if self.action in ["create"]:
-            # Only farm owner and farm manager should be allowed to create cow breeds
-            permission_classes = [CanAddCowBreed]
-        elif self.action in ["destroy"]:
-            # Only farm owner and farm manager should be allowed to delete cow breeds
-            permission_classes = [CanDeleteCowBreed]
-        else:
-            # For viewing cow breeds, allow farm owner, farm manager, assistant farm manager, team leader,
-            # and farm worker
-            permission_classes = [CanViewCowBreeds]
-        return [permission() for permission in permission_classes]
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddCowBreed,
+        "destroy": CanDeleteCowBreed,
+        "default": CanViewCowBreeds,
+    }
 
     def update(self, request, *args, **kwargs):
         # Disallow update for cow breeds since the name is selected from choices
@@ -65,25 +68,92 @@ class CowBreedViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CowViewSet(viewsets.ModelViewSet):
+class CowViewSet(RegisterImportMixin, viewsets.ModelViewSet):
     queryset = Cow.objects.all()
     serializer_class = CowSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = CowFilterSet
     ordering_fields = ["date_of_birth", "name", "gender", "breed"]
+    register_importer_class = HerdImporter
+    max_pedigree_generations = 10
+
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddCow,
+        "import_register": CanAddCow,
+        "destroy": CanDeleteCow,
+        "update": CanUpdateCow,
+        "partial_update": CanUpdateCow,
+        "default": CanViewCow,
+    }
+
+    def get_queryset(self):
+        if self.action in ["list", "retrieve"]:
+            # Compute age and parity in SQL, as of the request date, to avoid per-cow queries when serializing
+            return Cow.manager.get_annotated_cows(as_of_date=todays_date())
+        return super().get_queryset()
+
+    @action(detail=True, methods=["get"])
+    def pedigree(self, request, *args, **kwargs):
+        # The ancestors of the cow as a tree, read from the ancestry closure table in one query
+        try:
+            generations = int(request.query_params.get("generations", 3))
+        except ValueError:
+            generations = 0
+        if not 1 <= generations <= self.max_pedigree_generations:
+            return Response(
+                {
+                    "detail": f"Generations should be a number from 1 to {self.max_pedigree_generations}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-    def get_permissions(self):
-        if self.action == "create":
-            permission_classes = [CanAddCow]
-        elif self.action == "destroy":
-            permission_classes = [CanDeleteCow]
-        elif self.action in ["update", "partial_update"]:
-            permission_classes = [CanUpdateCow]
-        else:
-            # For viewing cow breeds, allow farm owner, farm manager, assistant farm manager, team leader,
-            # and farm worker
-            permission_classes = [CanViewCow]
-        return [permission() for permission in permission_classes]
+        cow = self.get_object()
+        return Response(CowAncestry.objects.get_pedigree(cow.id, generations), status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def descendants(self, request, *args, **kwargs):
+        cow = self.get_object()
+        return Response(list(CowAncestry.objects.get_descendants(cow.id)), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def inbreeding(self, request, *args, **kwargs):
+        # The inbreeding coefficient of the calf of a proposed mating, and the common ancestors behind it
+        parent_ids = {}
+        for parent in ("sire", "dam"):
+            parent_id = request.query_params.get(parent, "")
+            if not parent_id.isdigit():
+                return Response(
+                    {"detail": f"Provide the ID of the {parent} as the '{parent}' query parameter."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            parent_ids[parent] = int(parent_id)
+
+        parents = Cow.objects.in_bulk(parent_ids.values())
+        sire = parents.get(parent_ids["sire"])
+        dam = parents.get(parent_ids["dam"])
+        if sire is None or dam is None:
+            raise Http404("No cow matches the given sire or dam.")
+        try:
+            CowValidator.validate_sire_dam_relationship(sire, dam)
+        except ValidationError as e:
+            return Response({"detail": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        inbreeding_coefficient, contributions = CowAncestry.objects.get_inbreeding(sire.id, dam.id)
+        return Response(
+            {
+                "sire": sire.id,
+                "dam": dam.id,
+                "inbreeding_coefficient": round(inbreeding_coefficient, 6),
+                "common_ancestors": [
+                    {"cow": ancestor_id, "contribution": round(contribution, 6)}
+                    for ancestor_id, contribution in sorted(
+                        contributions.items(), key=lambda item: item[1], reverse=True
+                    )
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -108,27 +178,31 @@ class CowViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class HeatViewSet(viewsets.ModelViewSet):
+class HeatViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = Heat.objects.all()
     serializer_class = HeatSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = HeatFilterSet
     ordering_fields = ["-observation_time"]
-
-    def get_permissions(self):
-        if self.action == "create":
-            permission_classes = [CanAddHeatRecord]
-        if self.action in ["update", "partial_update", "destroy"]:
-            permission_classes = [CanUpdateAndDeleteHeatRecord]
-        else:
-            # For viewing cow breeds, allow farm owner, farm manager, assistant farm manager, team leader,
-            # and farm worker
-            permission_classes = [CanViewHeatRecord]
-        return [permission() for permission in permission_classes]
+    ordering = ("-observation_time", "-id")
+    pagination_class = RecordCursorPagination
+
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddHeatRecord,
+        "update": CanUpdateAndDeleteHeatRecord,
+        "partial_update": CanUpdateAndDeleteHeatRecord,
+        "destroy": CanUpdateAndDeleteHeatRecord,
+        "default": CanViewHeatRecord,
+    }
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -141,6 +215,11 @@ class HeatViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -176,17 +255,23 @@ class InseminatorViewset(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class InseminationViewset(viewsets.ModelViewSet):
+class InseminationViewset(StreamingListMixin, viewsets.ModelViewSet):
     queryset = Insemination.objects.all()
     serializer_class = InseminationSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = InseminationFilterSet
     ordering_fields = ["date_of_insemination", "success", "cow"]
+    ordering = ("-date_of_insemination", "-id")
+    pagination_class = RecordCursorPagination
     permission_classes = [CanActOnInseminationRecord]
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -201,6 +286,11 @@ class InseminationViewset(viewsets.ModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -229,27 +319,31 @@ class InseminationViewset(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class PregnancyViewSet(viewsets.ModelViewSet):
+class PregnancyViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = Pregnancy.objects.all()
     serializer_class = PregnancySerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = PregnancyFilterSet
     ordering_fields = ["-start_date"]
-
-    def get_permissions(self):
-        if self.action == "create":
-            permission_classes = [CanAddPregnancyRecord]
-        elif self.action in ["update", "partial_update"]:
-            permission_classes = [CanUpdatePregnancyRecord]
-        elif self.action == "destroy":
-            permission_classes = [CanDeletePregnancyRecord]
-        else:
-            permission_classes = [CanViewPregnancyRecord]
-        return [permission() for permission in permission_classes]
+    ordering = ("-start_date", "-id")
+    pagination_class = RecordCursorPagination
+
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddPregnancyRecord,
+        "update": CanUpdatePregnancyRecord,
+        "partial_update": CanUpdatePregnancyRecord,
+        "destroy": CanDeletePregnancyRecord,
+        "default": CanViewPregnancyRecord,
+    }
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -263,28 +357,31 @@ class PregnancyViewSet(viewsets.ModelViewSet):
                     {"detail": "No Pregnancy records found."}, status=status.HTTP_200_OK
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class LactationViewSet(viewsets.ModelViewSet):
+class LactationViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = LactationSerializer
     queryset = Lactation.objects.all()
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = LactationFilterSet
     ordering_fields = ["-start_date"]
+    ordering = ("-start_date", "-id")
+    pagination_class = RecordCursorPagination
 
-    def get_permissions(self):
-        if self.action == "create":
-            permission_classes = [CanAddLactationRecord]
-        elif self.action == "destroy":
-            permission_classes = [CanDeleteLactationRecord]
-        else:
-            # For viewing lactation, allow farm owner, farm manager, assistant farm manager, team leader,
-            # and farm worker
-            permission_classes = [CanViewLactationRecord]
-        return [permission() for permission in permission_classes]
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddLactationRecord,
+        "destroy": CanDeleteLactationRecord,
+        "default": CanViewLactationRecord,
+    }
 
     def update(self, request, *args, **kwargs):
         raise MethodNotAllowed("PUT")
@@ -301,9 +398,52 @@ class LactationViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=True, methods=["get"])
+    def curve(self, request, *args, **kwargs):
+        # The lactation curve and yield figures of a single lactation, fitted from its daily milk yields
+        lactation = self.get_object()
+        analyzer = LactationCurveAnalyzer.for_lactations([lactation])
+        return Response(
+            {
+                "lactation": lactation.id,
+                "cow": lactation.cow_id,
+                "lactation_number": lactation.lactation_number,
+                **analyzer.analyze()[lactation.id],
+                **analyzer.curve(lactation.id),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="curve-summary")
+    def curve_summary(self, request, *args, **kwargs):
+        # The yield figures of every lactation matching the filters, fitted together, and the herd averages
+        lactations = list(
+            self.filter_queryset(self.get_queryset()).only("id", "cow_id", "lactation_number", "start_date")
+        )
+        figures = LactationCurveAnalyzer.for_lactations(lactations).analyze()
+        return Response(
+            {
+                **LactationCurveAnalyzer.summarize(figures),
+                "records": [
+                    {
+                        "lactation": lactation.id,
+                        "cow": lactation.cow_id,
+                        "lactation_number": lactation.lactation_number,
+                        **figures[lactation.id],
+                    }
+                    for lactation in lactations
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -317,28 +457,83 @@ class LactationViewSet(viewsets.ModelViewSet):
                     {"detail": "No Lactation records found."}, status=status.HTTP_200_OK
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class MilkViewSet(viewsets.ModelViewSet):
+class BreedingCalendarViewSet(viewsets.ReadOnlyModelViewSet):
+    # The breeding work list and its iCal feed, read from the precomputed breeding events. Without `start_date`
+    # and `end_date` the work list covers the next `work_list_days` days and the feed the next `calendar_days`.
+    queryset = BreedingEvent.objects.select_related("cow")
+    serializer_class = BreedingEventSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = BreedingEventFilterSet
+    work_list_days = 7
+    calendar_days = 365
+
+    permission_classes = [HasActionRole]
+    action_permissions = {"default": CanViewBreedingCalendar}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ["list", "ical"]:
+            return queryset
+
+        today = todays_date()
+        if not self.request.query_params.get("start_date"):
+            queryset = queryset.filter(due_date__gte=today)
+        if not self.request.query_params.get("end_date"):
+            days = self.calendar_days if self.action == "ical" else self.work_list_days
+            queryset = queryset.filter(due_date__lte=today + timedelta(days=days))
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def ical(self, request, *args, **kwargs):
+        events = self.filter_queryset(self.get_queryset()).values_list(
+            "id", "event_type", "due_date", "cow__name", "cow__tag_number"
+        )
+        host = request.get_host().split(":")[0]
+        calendar_events = (
+            CalendarEvent(
+                uid=f"breeding-event-{event_id}@{host}",
+                date=due_date,
+                summary=f"{event_type}: {cow_name} ({tag_number})",
+                categories=event_type,
+            )
+            for event_id, event_type, due_date, cow_name, tag_number in events.iterator()
+        )
+
+        response = StreamingHttpResponse(
+            iter_ical(calendar_events, "Breeding calendar"), content_type="text/calendar; charset=utf-8"
+        )
+        response["Content-Disposition"] = 'attachment; filename="breeding-calendar.ics"'
+        return response
+
+
+class MilkViewSet(RecordExportMixin, StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = MilkSerializer
     queryset = Milk.objects.all()
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = MilkFilterSet
     ordering_fields = ["-milking_date"]
-
-    def get_permissions(self):
-        if self.action == "create":
-            permission_classes = [CanAddMilk]
-        elif self.action == "destroy":
-            permission_classes = [CanDeleteMilk]
-        elif self.action == "partial_update":
-            permission_classes = [CanUpdateMilk]
-        else:
-            permission_classes = [CanViewMilk]
-        return [permission() for permission in permission_classes]
+    ordering = ("-milking_date", "-id")
+    pagination_class = RecordCursorPagination
+    record_exporter_class = MilkExporter
+
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddMilk,
+        "bulk": CanAddMilk,
+        "destroy": CanDeleteMilk,
+        "partial_update": CanUpdateMilk,
+        "default": CanViewMilk,
+    }
 
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -351,9 +546,48 @@ class MilkViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         raise MethodNotAllowed("PUT")
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        # Records a whole milking session at once; valid entries are saved even when others are rejected
+        if not isinstance(request.data, list):
+            return Response(
+                {"detail": "Expected a list of milk entries."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        entries = []
+        errors = []
+        for index, entry in enumerate(request.data):
+            entry_serializer = MilkBulkEntrySerializer(data=entry)
+            if entry_serializer.is_valid():
+                entries.append((index, entry_serializer.validated_data))
+            else:
+                errors.append(
+                    {
+                        "index": index,
+                        "cow": entry.get("cow") if isinstance(entry, dict) else None,
+                        "errors": entry_serializer.errors,
+                    }
+                )
+
+        milk_records, rejected_entries = Milk.manager.bulk_record(entries)
+        errors = sorted(errors + rejected_entries, key=lambda error: error["index"])
+
+        serializer = self.get_serializer(milk_records, many=True)
+        return Response(
+            {"created": serializer.data, "errors": errors},
+            status=status.HTTP_201_CREATED
+            if milk_records
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -365,22 +599,33 @@ class MilkViewSet(viewsets.ModelViewSet):
                     {"detail": "No Milk records found."}, status=status.HTTP_200_OK
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class WeightRecordViewSet(viewsets.ModelViewSet):
+class WeightRecordViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = WeightRecordSerializer
     queryset = WeightRecord.objects.all()
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = WeightRecordFilterSet
     ordering_fields = ["-date"]
+    ordering = ("-date", "-id")
+    pagination_class = RecordCursorPagination
     permission_classes = [CanActOnWeightRecord]
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -394,17 +639,24 @@ class WeightRecordViewSet(viewsets.ModelViewSet):
                     {"detail": "No Weight  records found."}, status=status.HTTP_200_OK
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CullingRecordViewSet(viewsets.ModelViewSet):
+class CullingRecordViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = CullingRecordSerializer
     queryset = CullingRecord.objects.all()
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = CullingRecordFilterSet
     ordering_fields = ["-date"]
+    ordering = ("-date", "-id")
+    pagination_class = RecordCursorPagination
     permission_classes = [CanActOnCullingRecord]
 
     def partial_update(self, request, *args, **kwargs):
@@ -416,6 +668,10 @@ class CullingRecordViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -429,22 +685,33 @@ class CullingRecordViewSet(viewsets.ModelViewSet):
                     {"detail": "No Culling records found."}, status=status.HTTP_200_OK
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class QuarantineRecordViewSet(viewsets.ModelViewSet):
+class QuarantineRecordViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = QuarantineRecordSerializer
     queryset = QuarantineRecord.objects.all()
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = QuarantineRecordFilterSet
     ordering_fields = ["-date"]
+    ordering = ("-start_date", "-id")
+    pagination_class = RecordCursorPagination
     permission_classes = [CanActOnQuarantineRecord]
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 return Response(
@@ -459,6 +726,11 @@ class QuarantineRecordViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -491,32 +763,21 @@ class BarnViewSet(viewsets.ModelViewSet):
     permission_classes = [CanActOnBarn]
 
 
-class MilkTodayView(APIView):
-    def get(self, request, format=None):
-        today = timezone.localdate()
-        start_of_today = timezone.datetime.combine(today, timezone.datetime.min.time())
-        end_of_today = timezone.datetime.combine(today, timezone.datetime.max.time())
-
+class MilkTodayView(AsyncAPIView):
+    @cache_response(Milk)
+    async def get(self, request, format=None):
+        today = todays_date()
         yesterday = today - timezone.timedelta(days=1)
-        start_of_yesterday = timezone.datetime.combine(
-            yesterday, timezone.datetime.min.time()
-        )
-        end_of_yesterday = timezone.datetime.combine(
-            yesterday, timezone.datetime.max.time()
-        )
 
-        total_milk_today = (
-            Milk.objects.filter(
-                milking_date__range=(start_of_today, end_of_today)
-            ).aggregate(Sum("amount_in_kgs"))["amount_in_kgs__sum"]
-            or 0
-        )
-        total_milk_yesterday = (
-            Milk.objects.filter(
-                milking_date__range=(start_of_yesterday, end_of_yesterday)
-            ).aggregate(Sum("amount_in_kgs"))["amount_in_kgs__sum"]
-            or 0
-        )
+        daily_totals = {
+            date: total_milk
+            async for date, total_milk in DailyMilkProduction.objects.filter(date__in=[today, yesterday])
+            .values("date")
+            .annotate(total_milk=Sum("total_amount_in_kgs"))
+            .values_list("date", "total_milk")
+        }
+        total_milk_today = daily_totals.get(today) or 0
+        total_milk_yesterday = daily_totals.get(yesterday) or 0
 
         milk_diff = total_milk_today - total_milk_yesterday
         percentage_difference = round(
@@ -532,49 +793,47 @@ class MilkTodayView(APIView):
         )
 
 
-class TotalAliveCowsView(APIView):
-    def get(self, request, format=None):
-        total_alive_cows = (
+class TotalAliveCowsView(AsyncAPIView):
+    @cache_response(Cow)
+    async def get(self, request, format=None):
+        total_alive_cows = await (
             Cow.objects.filter(availability_status="Alive")
             .values("id")
             .distinct()
-            .count()
+            .acount()
         )
         return Response({"total_alive_cows": total_alive_cows})
 
 
-class TotalAliveFemaleCowsView(APIView):
-    def get(self, request, format=None):
-        total_alive_female_cows = (
+class TotalAliveFemaleCowsView(AsyncAPIView):
+    @cache_response(Cow)
+    async def get(self, request, format=None):
+        total_alive_female_cows = await (
             Cow.objects.filter(availability_status="Alive", gender="Female")
             .values("id")
             .distinct()
-            .count()
+            .acount()
         )
         return Response({"total_alive_female_cows": total_alive_female_cows})
 
 
-class TotalAliveMaleCowsView(APIView):
-    def get(self, request, format=None):
-        total_alive_male_cows = (
+class TotalAliveMaleCowsView(AsyncAPIView):
+    @cache_response(Cow)
+    async def get(self, request, format=None):
+        total_alive_male_cows = await (
             Cow.objects.filter(availability_status="Alive", gender="Male")
             .values("id")
             .distinct()
-            .count()
+            .acount()
         )
         return Response({"total_alive_male_cows": total_alive_male_cows})
 
 
-class CowsMilkedTodayView(APIView):
-    def get(self, request, format=None):
-        today = timezone.localdate()
-        start_of_day = timezone.datetime.combine(today, timezone.datetime.min.time())
-        end_of_day = timezone.datetime.combine(today, timezone.datetime.max.time())
-        milking_cows = (
-            Milk.objects.filter(milking_date__range=(start_of_day, end_of_day))
-            .values("cow_id")
-            .distinct()
-        )
+class CowsMilkedTodayView(AsyncAPIView):
+    @cache_response(Milk, Lactation, Pregnancy, Cow)
+    async def get(self, request, format=None):
+        today = todays_date()
+        milking_cows = DailyMilkProduction.objects.filter(date=today).values("cow_id")
 
         eligible_cows = Lactation.objects.filter(
             cow__gender="Male",
@@ -583,12 +842,10 @@ class CowsMilkedTodayView(APIView):
             start_date__lte=today,
         ).values_list("cow_id", flat=True)
 
-        unmilked_cows = (
-            Cow.objects.filter(id__in=eligible_cows)
-            .exclude(id__in=milking_cows)
-            .count()
+        milked_cows, unmilked_cows = await gather_queries(
+            milking_cows.count,
+            Cow.objects.filter(id__in=eligible_cows).exclude(id__in=milking_cows).count,
         )
-        milked_cows = milking_cows.count()
 
         return Response(
             {
@@ -598,48 +855,51 @@ class CowsMilkedTodayView(APIView):
         )
 
 
-class MilkProductionWeeklyView(APIView):
-    def get(self, request, format=None):
-        today = timezone.localdate()
+class MilkProductionWeeklyView(AsyncAPIView):
+    @cache_response(Milk)
+    async def get(self, request, format=None):
+        today = todays_date()
         start_of_week = today - timezone.timedelta(days=today.weekday())
         end_of_week = start_of_week + timezone.timedelta(days=7)
-        milk_records = Milk.objects.filter(
-            milking_date__range=(start_of_week, end_of_week)
-        ).order_by("milking_date")
-
-        # Create a dictionary to store the milk records grouped by day
-        milk_production_data = {}
-        for record in milk_records:
-            day = record.milking_date.strftime("%A")
-            if day not in milk_production_data:
-                milk_production_data[day] = {
+        daily_totals = (
+            DailyMilkProduction.objects.filter(
+                date__gte=start_of_week, date__lt=end_of_week
+            )
+            .values("date")
+            .annotate(total_milk=Sum("total_amount_in_kgs"))
+            .order_by("date")
+        )
+
+        milk_production_data = []
+        async for daily_total in daily_totals:
+            day = daily_total["date"].strftime("%A")
+            milk_production_data.append(
+                {
                     "day": day,
-                    "total_milk": record.amount_in_kgs,
+                    "milk_records": [{"day": day, "total_milk": daily_total["total_milk"]}],
                 }
-            else:
-                milk_production_data[day]["total_milk"] += record.amount_in_kgs
-        milk_production_data = [
-            {"day": day, "milk_records": [record]}
-            for day, record in milk_production_data.items()
-        ]
+            )
 
         return Response(milk_production_data)
 
 
-class PregnantCowsView(APIView):
-    def get(self, request, format=None):
-        pregnancies_count = Pregnancy.objects.filter(
+class PregnantCowsView(AsyncAPIView):
+    @cache_response(Pregnancy)
+    async def get(self, request, format=None):
+        pregnancies_count = await Pregnancy.objects.filter(
             pregnancy_status="Confirmed", date_of_calving__isnull=True
-        ).count()
+        ).acount()
         return Response({"pregnancies_count": pregnancies_count})
 
 
-class LactatingCowsView(APIView):
-    def get(self, request, format=None):
-        lactating_cows = Lactation.objects.filter(end_date__isnull=True).values_list(
-            "cow__name", flat=True
-        )
-        lactating_cows_count = lactating_cows.count()
+class LactatingCowsView(AsyncAPIView):
+    @cache_response(Lactation, Cow)
+    async def get(self, request, format=None):
+        lactating_cows = [
+            name
+            async for name in Lactation.objects.filter(end_date__isnull=True).values_list("cow__name", flat=True)
+        ]
+        lactating_cows_count = len(lactating_cows)
         return Response(
             {
                 "lactating_cows_count": lactating_cows_count,
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from dairy_inventory.models import MilkInventory
+
+
+class Command(BaseCommand):
+    help = "Recomputes the milk inventory total from the recorded milk in a single aggregate query."
+
+    def handle(self, *args, **options):
+        previous_total, total_amount_in_kgs = MilkInventory.objects.reconcile()
+
+        if previous_total == total_amount_in_kgs:
+            self.stdout.write(
+                self.style.SUCCESS(f"Milk inventory is up to date at {total_amount_in_kgs} kgs.")
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Milk inventory corrected from {previous_total} kgs to {total_amount_in_kgs} kgs."
+                )
+            )
@@ -0,0 +1,195 @@
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from dairy.choices import CowAvailabilityChoices, SexChoices
+
+
+class MilkInventoryManager(models.Manager):
+    """
+    Custom manager for the MilkInventory model.
+
+    The farm keeps a single milk inventory row (`id=1`). Its total is only ever changed with database-side `F()`
+    increments so that concurrent milk records can not overwrite each other's updates.
+
+    Methods:
+    - `apply_delta(delta)`: Adds `delta` kgs to the inventory total and records the new total in the history.
+    - `reconcile()`: Recomputes the inventory total from the milk records.
+    """
+
+    INVENTORY_ID = 1
+
+    def apply_delta(self, delta):
+        """
+        Adds `delta` kgs (negative to remove milk) to the inventory total and records the new total in the history.
+
+        Args:
+        - `delta`: The change in kgs, as a `Decimal`.
+
+        Returns:
+        - `Decimal`: The inventory total after the update.
+        """
+        from dairy_inventory.models import MilkInventoryUpdateHistory
+
+        with transaction.atomic():
+            self.get_or_create(id=self.INVENTORY_ID)
+            self.filter(id=self.INVENTORY_ID).update(
+                total_amount_in_kgs=F("total_amount_in_kgs") + delta,
+                last_update=timezone.now(),
+            )
+            total_amount_in_kgs = self.filter(id=self.INVENTORY_ID).values_list(
+                "total_amount_in_kgs", flat=True
+            ).get()
+            MilkInventoryUpdateHistory.objects.create(amount_in_kgs=total_amount_in_kgs)
+        return total_amount_in_kgs
+
+    def reconcile(self):
+        """
+        Recomputes the inventory total from the milk records in a single aggregate query.
+
+        Returns:
+        - `tuple`: The total before and after reconciliation.
+        """
+        from dairy.models import Milk
+
+        with transaction.atomic():
+            milk_inventory, created = self.select_for_update().get_or_create(
+                id=self.INVENTORY_ID
+            )
+            previous_total = milk_inventory.total_amount_in_kgs
+            total_amount_in_kgs = Milk.objects.aggregate(
+                total=Sum("amount_in_kgs")
+            )["total"] or Decimal("0.00")
+
+            self.filter(id=self.INVENTORY_ID).update(
+                total_amount_in_kgs=total_amount_in_kgs, last_update=timezone.now()
+            )
+        return previous_total, total_amount_in_kgs
+
+
+class CowInventoryManager(models.Manager):
+    """
+    Custom manager for the CowInventory model.
+
+    The counters are kept up to date from the change in `availability_status` and `gender` of each saved or
+    deleted cow, so a cow save costs a single `UPDATE` instead of a count over the whole herd.
+
+    Methods:
+    - `get_inventory()`: Returns the cow inventory, creating it if it doesn't exist.
+    - `get_counters(availability_status, gender)`: Returns the counters a cow with these values contributes to.
+    - `apply_cow_change(previous, current)`: Moves a cow between counters.
+    - `recompute()`: Recomputes all counters with one grouped count over the cows.
+    """
+
+    COUNTER_FIELDS = [
+        "total_number_of_cows",
+        "number_of_male_cows",
+        "number_of_female_cows",
+        "number_of_sold_cows",
+        "number_of_dead_cows",
+    ]
+
+    def get_inventory(self):
+        cow_inventory = self.first()
+        if not cow_inventory:
+            cow_inventory = self.create()
+        return cow_inventory
+
+    @staticmethod
+    def get_counters(availability_status, gender):
+        """
+        Returns the counters a cow with the given availability status and gender contributes to.
+
+        Args:
+        - `availability_status`: The availability status of the cow.
+        - `gender`: The gender of the cow.
+
+        Returns:
+        - `list`: The names of the counter fields the cow is counted in.
+        """
+        if availability_status == CowAvailabilityChoices.ALIVE:
+            if gender == SexChoices.MALE:
+                return ["total_number_of_cows", "number_of_male_cows"]
+            if gender == SexChoices.FEMALE:
+                return ["total_number_of_cows", "number_of_female_cows"]
+            return ["total_number_of_cows"]
+        if availability_status == CowAvailabilityChoices.SOLD:
+            return ["number_of_sold_cows"]
+        if availability_status == CowAvailabilityChoices.DEAD:
+            return ["number_of_dead_cows"]
+        return []
+
+    def apply_cow_change(self, previous, current):
+        """
+        Moves a cow between counters and records the new herd size in the history when it changes.
+
+        Args:
+        - `previous`: The `(availability_status, gender)` of the cow before the change, or None for a new cow.
+        - `current`: The `(availability_status, gender)` of the cow after the change, or None for a deleted cow.
+
+        Returns:
+        - `bool`: Whether any counter changed.
+        """
+        from dairy_inventory.models import CowInventoryUpdateHistory
+
+        deltas = dict.fromkeys(self.COUNTER_FIELDS, 0)
+        if previous:
+            for field in self.get_counters(*previous):
+                deltas[field] -= 1
+        if current:
+            for field in self.get_counters(*current):
+                deltas[field] += 1
+
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return False
+
+        cow_inventory = self.first()
+        if not cow_inventory:
+            # The first count of the herd already includes this change
+            return self.recompute()
+
+        with transaction.atomic():
+            self.filter(pk=cow_inventory.pk).update(
+                last_update=timezone.now(),
+                **{field: F(field) + delta for field, delta in deltas.items()},
+            )
+            if "total_number_of_cows" in deltas:
+                cow_inventory.refresh_from_db()
+                CowInventoryUpdateHistory.objects.create(
+                    number_of_cows=cow_inventory.total_number_of_cows
+                )
+        return True
+
+    def recompute(self):
+        """
+        Recomputes all counters with one grouped count over the cows and records the new herd size in the
+        history when it changes.
+
+        Returns:
+        - `bool`: Whether any counter changed.
+        """
+        from dairy.models import Cow
+        from dairy_inventory.models import CowInventoryUpdateHistory
+
+        totals = dict.fromkeys(self.COUNTER_FIELDS, 0)
+        for group in Cow.objects.values("availability_status", "gender").annotate(
+            number_of_cows=Count("id")
+        ):
+            for field in self.get_counters(group["availability_status"], group["gender"]):
+                totals[field] += group["number_of_cows"]
+
+        with transaction.atomic():
+            cow_inventory = self.get_inventory()
+            if all(getattr(cow_inventory, field) == totals[field] for field in totals):
+                return False
+
+            total_changed = cow_inventory.total_number_of_cows != totals["total_number_of_cows"]
+            self.filter(pk=cow_inventory.pk).update(last_update=timezone.now(), **totals)
+            if total_changed:
+                CowInventoryUpdateHistory.objects.create(
+                    number_of_cows=totals["total_number_of_cows"]
+                )
+        return True
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:16
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy_inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='milkinventory',
+            name='total_amount_in_kgs',
+            field=models.DecimalField(decimal_places=2, default=0.0, editable=False, max_digits=12, validators=[django.core.validators.MinValueValidator(0.0)], verbose_name='Amount (kg)'),
+        ),
+        migrations.AlterField(
+            model_name='milkinventoryupdatehistory',
+            name='amount_in_kgs',
+            field=models.DecimalField(decimal_places=2, default=0.0, editable=False, max_digits=12, validators=[django.core.validators.MinValueValidator(0.0)], verbose_name='Total Amount (kg)'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy_inventory', '0002_milk_inventory_decimal_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cowpeninventory',
+            name='last_update',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -1,5 +1,6 @@
 from dairy.models import *
 from .choices import *
+from .managers import *
 
 
 class MilkInventory(models.Model):
@@ -23,10 +24,13 @@ class MilkInventory(models.Model):
         verbose_name_plural = "Milk Inventory"
         ordering = ['-last_update']
 
-    total_amount_in_kgs = models.FloatField(verbose_name="Amount (kg)", default=0.00,
-                                            validators=[MinValueValidator(0.00)], editable=False)
+    total_amount_in_kgs = models.DecimalField(verbose_name="Amount (kg)", default=0.00, max_digits=12,
+                                              decimal_places=2, validators=[MinValueValidator(0.00)],
+                                              editable=False)
     last_update = models.DateTimeField(auto_now=True)
 
+    objects = MilkInventoryManager()
+
     def __str__(self):
         return f"{self.total_amount_in_kgs} kg of milk in dairy_inventory (last updated " \
                f"{self.last_update.strftime('%Y-%m-%d %H:%M:%S')})"
@@ -50,7 +54,7 @@ class MilkInventoryUpdateHistory(models.Model):
     - `ordering`: A list of fields to use when ordering the model instances.
     """
 
-    amount_in_kgs = models.DecimalField(verbose_name="Total Amount (kg)", default=0.00, max_digits=7, decimal_places=2,
+    amount_in_kgs = models.DecimalField(verbose_name="Total Amount (kg)", default=0.00, max_digits=12, decimal_places=2,
                                         validators=[MinValueValidator(0.00)], editable=False)
     date = models.DateField(verbose_name='Date', auto_now_add=True)
 
@@ -76,6 +80,8 @@ class CowInventory(models.Model):
     number_of_dead_cows = models.PositiveIntegerField(verbose_name="Number of Dead Cows", default=0, editable=False)
     last_update = models.DateTimeField(auto_now=True)
 
+    objects = CowInventoryManager()
+
     def __str__(self):
         return f"{self.total_number_of_cows} cows in farm (last updated " \
                f"{self.last_update.strftime('%Y-%m-%d %H:%M:%S')})"
@@ -172,6 +178,7 @@ class CowPenInventory(models.Model):
     Fields:
     - `pen`: One-to-one relationship with the `CowPen` model, representing the cow pen associated with the inventory.
     - `number_of_cows`: The current number of cows in the cow pen.
+    - `last_update`: Date and time of the last update to the cow pen inventory.
 
     Methods:
     - `add_cow()`: Adds a cow to the cow pen inventory if the pen's capacity has not been exceeded.
@@ -181,6 +188,7 @@ class CowPenInventory(models.Model):
 
     pen = models.OneToOneField(CowPen, on_delete=models.CASCADE)
     number_of_cows = models.PositiveIntegerField(default=0)
+    last_update = models.DateTimeField(auto_now=True)
 
     def add_cow(self):
         """
@@ -1,39 +1,61 @@
-from django.db.models.signals import pre_save, post_save
-from django.dispatch import receiver
+from decimal import Decimal
 
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from efarm.instrumentation import receiver
+from jobs.backends import enqueue
+
+from dairy.signals import milk_records_bulk_created
 from .models import *
 
 
-@receiver(pre_save, sender=Milk)
-def update_milk_inventory(sender, instance, **kwargs):
-    # Update the milk inventory
-    milk_inventory, created = MilkInventory.objects.get_or_create(id=1)
-    milk_inventory.total_amount_in_kgs += float(instance.amount_in_kgs)
-    milk_inventory.save()
-    # Create a new milk inventory update history record
-    MilkInventoryUpdateHistory.objects.create(amount_in_kgs=milk_inventory.total_amount_in_kgs)
+def apply_milk_inventory_delta_on_commit(delta):
+    # Only touch the inventory once the milk record change is committed, and only if it changed anything
+    if delta:
+        transaction.on_commit(lambda: MilkInventory.objects.apply_delta(delta))
+
+
+@receiver(post_save, sender=Milk)
+def update_milk_inventory(sender, instance, created, **kwargs):
+    # Only the difference to the stored amount of an edited record, see dairy.signals.remember_previous_milk_record
+    previous_amount_in_kgs = getattr(instance, "_previous_amount_in_kgs", None) or Decimal("0.00")
+    apply_milk_inventory_delta_on_commit(Decimal(str(instance.amount_in_kgs)) - previous_amount_in_kgs)
+
+
+@receiver(post_delete, sender=Milk)
+def remove_deleted_milk_from_inventory(sender, instance, **kwargs):
+    apply_milk_inventory_delta_on_commit(-Decimal(str(instance.amount_in_kgs)))
+
+
+@receiver(milk_records_bulk_created, sender=Milk)
+def update_milk_inventory_in_bulk(sender, instances, **kwargs):
+    # Apply the whole milking session to the milk inventory as a single update
+    apply_milk_inventory_delta_on_commit(
+        sum((Decimal(str(instance.amount_in_kgs)) for instance in instances), Decimal("0.00"))
+    )
+
+
+@receiver(pre_save, sender=Cow)
+def remember_previous_cow_counters(sender, instance, **kwargs):
+    # Keep the stored status and gender of an edited cow so that only the change reaches the cow inventory
+    instance._previous_inventory_values = None
+    if instance.pk:
+        instance._previous_inventory_values = Cow.objects.filter(pk=instance.pk).values_list(
+            "availability_status", "gender"
+        ).first()
 
 
 @receiver(post_save, sender=Cow)
 def create_and_update_cow_inventory(sender, instance, **kwargs):
-    # Retrieve the CowInventory instance, or create a new one if it doesn't exist
-    cow_inventory: CowInventory = CowInventory.objects.first()
-    if not cow_inventory:
-        cow_inventory = CowInventory.objects.create()
-
-    # Update the fields of the CowInventory instance based on the Cow objects
-    cow_inventory.total_number_of_cows = Cow.objects.filter(availability_status='Alive').count()
-    cow_inventory.number_of_male_cows = Cow.objects.filter(availability_status='Alive', gender='Male').count()
-    cow_inventory.number_of_female_cows = Cow.objects.filter(availability_status='Alive', gender='Female').count()
-    cow_inventory.number_of_sold_cows = Cow.objects.filter(availability_status='Sold').count()
-    cow_inventory.number_of_dead_cows = Cow.objects.filter(availability_status='Dead').count()
+    CowInventory.objects.apply_cow_change(
+        getattr(instance, "_previous_inventory_values", None),
+        (instance.availability_status, instance.gender),
+    )
 
-    # Save the changes to the CowInventory instance
-    cow_inventory.save()
-    cow_inventory.refresh_from_db()
 
-    # Create a new history entry in CowInventoryUpdateHistory
-    CowInventoryUpdateHistory.objects.create(number_of_cows=cow_inventory.total_number_of_cows)
+@receiver(post_delete, sender=Cow)
+def remove_deleted_cow_from_inventory(sender, instance, **kwargs):
+    CowInventory.objects.apply_cow_change((instance.availability_status, instance.gender), None)
 
 
 @receiver(post_save, sender=CowPen)
@@ -60,53 +82,12 @@ def create_barn_inventory(sender, instance, created, **kwargs):
 @receiver(post_save, sender=CowInPenMovement)
 def update_cow_pen_inventory_and_barn_inventory(sender, instance, created, **kwargs):
 
-    # Signal receiver function to update cow pen inventory and barn inventory when a new CowInPenMovement instance is created.
+    # Signal receiver function to queue the cow pen inventory, barn inventory and barn movement updates of a new
+    # CowInPenMovement instance, see the dairy_inventory.apply_cow_in_pen_movements task.
 
     if created:
-        # Check if the cow is moving from a previous pen
-        if instance.previous_pen:
-            # Get the cow pen inventory for the pen the cow is moving from
-            old_pen_inventory: CowPenInventory = CowPenInventory.objects.get(pen=instance.previous_pen)
-            old_pen_inventory.remove_cow()
-
-            # Check if the previous pen is associated with a barn
-            if instance.previous_pen.barn:
-                # Get the barn inventory for the barn the cow is moving from
-                old_barn_inventory = BarnInventory.objects.get(barn=instance.previous_pen.barn)
-                old_barn_inventory.remove_cow()
-                old_barn_inventory.refresh_from_db()
-                BarnInventoryHistory.objects.create(
-                    barn_inventory=old_barn_inventory,
-                    number_of_cows=old_barn_inventory.number_of_cows
-                )
-
-        # Get the cow pen inventory for the pen the cow is moving to
-        new_pen_inventory: CowPenInventory = CowPenInventory.objects.get(pen=instance.new_pen)
-        new_pen_inventory.add_cow()
-
-        # Get the barn inventory for the barn the cow is moving to
-        new_barn_inventory: BarnInventory = BarnInventory.objects.get(barn=instance.new_pen.barn)
-        new_barn_inventory.add_cow()
-        new_barn_inventory.refresh_from_db()
-        BarnInventoryHistory.objects.create(
-            barn_inventory=new_barn_inventory,
-            number_of_cows=new_barn_inventory.number_of_cows
+        enqueue(
+            "dairy_inventory.apply_cow_in_pen_movements",
+            {"cow_in_pen_movement": instance.pk},
+            key=f"cow-in-pen-movement:{instance.pk}",
         )
-
-        # Check if the cow is moved into a pen that is not within a specific barn
-        if instance.previous_pen and instance.new_pen:
-            if instance.previous_pen.barn != instance.new_pen.barn:
-                # Create a CowInBarnMovement instance
-                CowInBarnMovement.objects.create(
-                    cow=instance.cow,
-                    previous_barn=instance.previous_pen.barn,
-                    new_barn=instance.new_pen.barn
-                )
-
-        # Create a CowInBarnMovement instance when moving into a pen without a previous pen
-        if instance.new_pen.barn:
-            CowInBarnMovement.objects.create(
-                cow=instance.cow,
-                previous_barn=None,
-                new_barn=instance.new_pen.barn
-            )
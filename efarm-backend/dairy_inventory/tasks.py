@@ -0,0 +1,65 @@
+from jobs.registry import task
+from .models import *
+
+
+@task("dairy_inventory.apply_cow_in_pen_movements")
+def apply_cow_in_pen_movements(payloads):
+    """
+    Updates the pen and barn inventories and records the barn movements of a batch of new cow in pen movements,
+    in the order the cows were moved.
+    """
+    movements = CowInPenMovement.objects.select_related("cow", "previous_pen__barn", "new_pen__barn").filter(
+        id__in=[payload["cow_in_pen_movement"] for payload in payloads]
+    ).order_by("id")
+    for movement in movements:
+        apply_cow_in_pen_movement(movement)
+
+
+def apply_cow_in_pen_movement(movement):
+    # Check if the cow is moving from a previous pen
+    if movement.previous_pen:
+        # Get the cow pen inventory for the pen the cow is moving from
+        old_pen_inventory: CowPenInventory = CowPenInventory.objects.get(pen=movement.previous_pen)
+        old_pen_inventory.remove_cow()
+
+        # Check if the previous pen is associated with a barn
+        if movement.previous_pen.barn:
+            # Get the barn inventory for the barn the cow is moving from
+            old_barn_inventory = BarnInventory.objects.get(barn=movement.previous_pen.barn)
+            old_barn_inventory.remove_cow()
+            old_barn_inventory.refresh_from_db()
+            BarnInventoryHistory.objects.create(
+                barn_inventory=old_barn_inventory,
+                number_of_cows=old_barn_inventory.number_of_cows
+            )
+
+    # Get the cow pen inventory for the pen the cow is moving to
+    new_pen_inventory: CowPenInventory = CowPenInventory.objects.get(pen=movement.new_pen)
+    new_pen_inventory.add_cow()
+
+    # Get the barn inventory for the barn the cow is moving to
+    new_barn_inventory: BarnInventory = BarnInventory.objects.get(barn=movement.new_pen.barn)
+    new_barn_inventory.add_cow()
+    new_barn_inventory.refresh_from_db()
+    BarnInventoryHistory.objects.create(
+        barn_inventory=new_barn_inventory,
+        number_of_cows=new_barn_inventory.number_of_cows
+    )
+
+    # Check if the cow is moved into a pen that is not within a specific barn
+    if movement.previous_pen and movement.new_pen:
+        if movement.previous_pen.barn != movement.new_pen.barn:
+            # Create a CowInBarnMovement instance
+            CowInBarnMovement.objects.create(
+                cow=movement.cow,
+                previous_barn=movement.previous_pen.barn,
+                new_barn=movement.new_pen.barn
+            )
+
+    # Create a CowInBarnMovement instance when moving into a pen without a previous pen
+    if movement.new_pen.barn:
+        CowInBarnMovement.objects.create(
+            cow=movement.cow,
+            previous_barn=None,
+            new_barn=movement.new_pen.barn
+        )
@@ -1,20 +1,23 @@
 from rest_framework import viewsets
 from rest_framework.exceptions import MethodNotAllowed
 
+from efarm.mixins import ConditionalGetMixin, SinceListMixin
+
 from .serializers import *
 
 
-class MilkInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class MilkInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = MilkInventory.objects.all()
     serializer_class = MilkInventorySerializer
+    last_modified_field = "last_update"
 
 
-class MilkInventoryUpdateHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class MilkInventoryUpdateHistoryViewSet(ConditionalGetMixin, SinceListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = MilkInventoryUpdateHistory.objects.all()
     serializer_class = MilkInventoryUpdateHistorySerializer
 
 
-class CowInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CowInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for the CowInventory model.
 
@@ -25,12 +28,13 @@ class CowInventoryViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = CowInventory.objects.all()
     serializer_class = CowInventorySerializer
+    last_modified_field = "last_update"
 
     def list(self, request, *args, **kwargs):
         raise MethodNotAllowed('GET')
 
 
-class CowInventoryUpdateHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CowInventoryUpdateHistoryViewSet(ConditionalGetMixin, SinceListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for the CowInventoryUpdateHistory model.
 
@@ -44,7 +48,7 @@ class CowInventoryUpdateHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = CowInventoryUpdateHistorySerializer
 
 
-class CowPenInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CowPenInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for the CowPenInventory model.
 
@@ -56,9 +60,10 @@ class CowPenInventoryViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = CowPenInventory.objects.all()
     serializer_class = CowPenInventorySerializer
+    last_modified_field = "last_update"
 
 
-class CowPenHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CowPenHistoryViewSet(ConditionalGetMixin, SinceListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for the CowPenHistory model.
 
@@ -72,7 +77,7 @@ class CowPenHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = CowPenHistorySerializer
 
 
-class BarnInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class BarnInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for the BarnInventory model.
 
@@ -84,9 +89,10 @@ class BarnInventoryViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = BarnInventory.objects.all()
     serializer_class = BarnInventorySerializer
+    last_modified_field = "last_update"
 
 
-class BarnInventoryHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class BarnInventoryHistoryViewSet(ConditionalGetMixin, SinceListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for the BarnInventoryHistory model.
 
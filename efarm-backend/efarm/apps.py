@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class EfarmConfig(AppConfig):
+    name = 'efarm'
+
+    def ready(self):
+        import efarm.database
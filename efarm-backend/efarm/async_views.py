@@ -0,0 +1,68 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    An APIView whose handlers are coroutines, for read-only endpoints.
+
+    Under ASGI the view runs on the event loop. The authentication, permission and throttling checks may query the
+    database and run through `sync_to_async`, on the one thread that all thread sensitive calls of the process
+    share, like the queries of the handler outside `gather_queries`. Under WSGI Django runs the view in an event
+    loop of its own, so it works in both deployment modes.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def _run_query(function):
+    close_old_connections()
+    try:
+        return function()
+    finally:
+        close_old_connections()
+
+
+def _in_transaction():
+    return connection.in_atomic_block
+
+
+async def gather_queries(*functions):
+    """
+    Runs the independent query functions `functions` concurrently and returns their results, in the same order.
+
+    Each function runs in a thread and on a database connection of its own, which is kept for reuse as
+    `CONN_MAX_AGE` allows. Other connections can't see the changes of an ongoing transaction, so inside one the
+    functions run one after the other on the connection of the transaction instead.
+    """
+    if await sync_to_async(_in_transaction)():
+        return [await sync_to_async(function)() for function in functions]
+    return await asyncio.gather(
+        *(sync_to_async(_run_query, thread_sensitive=False)(function) for function in functions)
+    )
@@ -0,0 +1,155 @@
+import functools
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from efarm.clock import todays_date
+from efarm.conf import get_app_setting
+
+DEFAULTS = {
+    # The alias of the Django cache holding the responses and the generation counters. With several worker
+    # processes it must be shared by all of them (file, database or memcached backend): with a local memory cache
+    # a change only invalidates the responses cached by the process that made it
+    "CACHE": "default",
+    # How long a response stays cached, in seconds, if the data it was computed from doesn't change earlier
+    "TIMEOUT": 300,
+}
+
+
+def get_setting(name):
+    return get_app_setting("RESPONSE_CACHE", name, DEFAULTS)
+
+
+def get_cache():
+    return caches[get_setting("CACHE")]
+
+
+def get_digest(parts):
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def get_generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def get_generations(models):
+    """
+    Returns the generation counters of `models`, in the same order.
+
+    A counter that is missing, because it was never bumped or was evicted, starts from the clock, so it never
+    repeats a generation that responses were cached under before.
+    """
+    cache = get_cache()
+    keys = [get_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generation = time.time_ns()
+            cache.add(key, generation, None)
+            generations[key] = cache.get(key, generation)
+    return [generations[key] for key in keys]
+
+
+def _bump_generations(models):
+    cache = get_cache()
+    for model in models:
+        key = get_generation_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def bump_generations(*models):
+    """
+    Invalidates the cached responses computed from the data of `models`.
+
+    The counters are bumped right away, and again once the current transaction commits, so that a response
+    computed by another request before the commit, from the data as it was, isn't served afterwards.
+    """
+    _bump_generations(models)
+    transaction.on_commit(functools.partial(_bump_generations, models), robust=True)
+
+
+def get_cached_response(view, request, models):
+    """
+    Returns the cache key and headers of the response of `view` to `request`, and the response itself if the
+    client already has it or it is cached, or `None`.
+    """
+    key_parts = [
+        f"{type(view).__module__}.{type(view).__qualname__}",
+        request.accepted_renderer.format,
+        request.get_full_path(),
+        todays_date().isoformat(),
+        *map(str, get_generations(models)),
+    ]
+    digest = get_digest(key_parts)
+    etag = quote_etag(digest)
+    cache_key = f"response:{digest}"
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        etags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+        if etag in etags or "*" in etags:
+            return cache_key, headers, Response(status=status.HTTP_304_NOT_MODIFIED)
+
+    data = get_cache().get(cache_key)
+    if data is None:
+        return cache_key, headers, None
+    return cache_key, headers, Response(data)
+
+
+def store_response(cache_key, headers, response):
+    if response.status_code != status.HTTP_200_OK:
+        return response
+    get_cache().set(cache_key, response.data, get_setting("TIMEOUT"))
+    return add_headers(response, headers)
+
+
+def add_headers(response, headers):
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def cache_response(*models):
+    """
+    Caches the data returned by the GET handler of an APIView until the data of one of `models` changes.
+
+    Responses are keyed by the view, the full path, the accepted renderer, today's date and the generations of
+    `models`, and are sent with an ETag derived from that key: a client that sends it back in If-None-Match gets
+    an empty 304 response, without the data being read from the cache or computed. The handler runs after the
+    authentication and permission checks, so one cached response is shared by every user allowed to see it.
+    Coroutine handlers, see `efarm.async_views.AsyncAPIView`, are supported too.
+    """
+
+    def decorator(handler):
+        if iscoroutinefunction(handler):
+
+            @functools.wraps(handler)
+            async def async_wrapper(view, request, *args, **kwargs):
+                cache_key, headers, response = await sync_to_async(get_cached_response)(view, request, models)
+                if response is not None:
+                    return add_headers(response, headers)
+                response = await handler(view, request, *args, **kwargs)
+                return await sync_to_async(store_response)(cache_key, headers, response)
+
+            return async_wrapper
+
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            cache_key, headers, response = get_cached_response(view, request, models)
+            if response is not None:
+                return add_headers(response, headers)
+            return store_response(cache_key, headers, handler(view, request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
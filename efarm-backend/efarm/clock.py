@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+_as_of_date = ContextVar("as_of_date", default=None)
+
+
+def todays_date():
+    """
+    Returns the date that "today" means for the current request.
+
+    Inside a request this is the as-of date resolved once by `AsOfDateMiddleware`; elsewhere (management
+    commands, shells, tests) it is the current local date, so long-running processes never go stale.
+
+    Returns:
+    - `date`: The as-of date.
+    """
+    as_of_date = _as_of_date.get()
+    if as_of_date is None:
+        return timezone.localdate()
+    return as_of_date
+
+
+@contextmanager
+def as_of(date):
+    """
+    Makes `todays_date()` return `date` for the duration of the block.
+
+    Args:
+    - `date`: The as-of date.
+    """
+    token = _as_of_date.set(date)
+    try:
+        yield date
+    finally:
+        _as_of_date.reset(token)
+
+
+class AsOfDateMiddleware:
+    """
+    Resolves the as-of date once per request and exposes it as `request.as_of_date`.
+
+    Read-only requests may pass `?as_of=YYYY-MM-DD` to report on the farm as of a past date. Requests that write
+    data always use the current date so that validation can not be bypassed.
+    """
+
+    as_of_query_param = "as_of"
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        as_of_date = self.get_as_of_date(request)
+        if as_of_date is None:
+            return self.invalid_date_response()
+        request.as_of_date = as_of_date
+        with as_of(as_of_date):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        as_of_date = self.get_as_of_date(request)
+        if as_of_date is None:
+            return self.invalid_date_response()
+        request.as_of_date = as_of_date
+        with as_of(as_of_date):
+            return await self.get_response(request)
+
+    def get_as_of_date(self, request):
+        """
+        Returns the as-of date of `request`, or `None` if the requested date is invalid.
+        """
+        requested_date = request.GET.get(self.as_of_query_param)
+        if not requested_date or request.method not in self.safe_methods:
+            return timezone.localdate()
+        try:
+            return parse_date(requested_date)
+        except ValueError:
+            return None
+
+    def invalid_date_response(self):
+        return JsonResponse(
+            {"detail": f"Invalid {self.as_of_query_param} date, use the YYYY-MM-DD format."},
+            status=400,
+        )
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def get_app_setting(namespace, name, defaults):
+    """
+    Returns the option `name` of the settings dict `namespace`, e.g. `JOBS["BATCH_SIZE"]`.
+
+    Projects only set the options they change: an option missing from the dict, or a dict missing from the
+    settings, falls back to `defaults`, which the module reading the options documents.
+    """
+    return getattr(settings, namespace, {}).get(name, defaults[name])
@@ -0,0 +1,42 @@
+from django.db.backends.signals import connection_created
+
+from efarm.conf import get_app_setting
+from efarm.instrumentation import receiver
+
+DEFAULTS = {
+    # With a write-ahead log, readers and the writer no longer block each other
+    "JOURNAL_MODE": "WAL",
+    # In WAL mode the log is only synced at checkpoints: a power loss may drop the last commits, but never corrupts
+    # the database
+    "SYNCHRONOUS": "NORMAL",
+    # How long a connection waits for the write lock before failing with "database is locked", in milliseconds
+    "BUSY_TIMEOUT_MS": 5000,
+    # How much of the database file is read through memory mapping instead of read() calls, in bytes
+    "MMAP_SIZE": 256 * 1024 * 1024,
+}
+
+
+def get_setting(name):
+    return get_app_setting("SQLITE_PRAGMAS", name, DEFAULTS)
+
+
+def get_pragmas():
+    return {
+        "journal_mode": get_setting("JOURNAL_MODE"),
+        "synchronous": get_setting("SYNCHRONOUS"),
+        "busy_timeout": int(get_setting("BUSY_TIMEOUT_MS")),
+        "mmap_size": int(get_setting("MMAP_SIZE")),
+    }
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Applies `SQLITE_PRAGMAS` to every new SQLite connection. In-memory databases, such as the test database, keep
+    their own journal mode.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
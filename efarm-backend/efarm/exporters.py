@@ -0,0 +1,246 @@
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+
+
+class Echo:
+    """
+    A file-like object whose `write()` returns the value it is given, so that `csv.writer` can format one row
+    at a time for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """
+    Formats a header and rows as CSV, one line at a time.
+
+    Args:
+    - `header`: The column names.
+    - `rows`: An iterable of row tuples.
+
+    Returns:
+    - A generator of CSV lines.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _parquet_type(field):
+    import pyarrow as pa
+
+    internal_type = field.get_internal_type()
+    if isinstance(field, models.ForeignKey):
+        return _parquet_type(field.target_field)
+    if internal_type == "DateTimeField":
+        return pa.timestamp("us", tz="UTC")
+    if internal_type == "DateField":
+        return pa.date32()
+    if internal_type == "TimeField":
+        return pa.time64("us")
+    if internal_type == "DecimalField":
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if internal_type == "BooleanField":
+        return pa.bool_()
+    if internal_type.endswith("IntegerField") or internal_type.endswith("AutoField"):
+        return pa.int64()
+    return pa.string()
+
+
+class RecordExporter:
+    """
+    Base class for exporting a record history as CSV or Parquet with constant memory.
+
+    Records are read as tuples with `values_list()` and a server-side `iterator()`, so no model instances or
+    serializers are involved and only `chunk_size` rows are held in memory at a time. The same filter set as
+    the list endpoint narrows the export down.
+
+    Attributes:
+    - `model`: The model to export.
+    - `filterset_class`: The filter set applied to the query parameters or `--filter` options.
+    - `columns`: `(header, lookup)` pairs, where a lookup may follow foreign keys, e.g. `cow__tag_number`.
+    - `ordering`: The ordering of the exported rows.
+    - `chunk_size`: The number of rows fetched per database round trip and written per Parquet row group.
+    - `file_name`: The base name of the exported file.
+    """
+
+    model = None
+    filterset_class = None
+    columns = []
+    ordering = ("id",)
+    chunk_size = 2000
+    file_name = "records"
+
+    def __init__(self, filters=None, chunk_size=None):
+        self.filters = filters or {}
+        self.chunk_size = chunk_size or self.chunk_size
+
+    @property
+    def header(self):
+        return [header for header, lookup in self.columns]
+
+    def get_queryset(self, queryset=None):
+        """
+        Returns the filtered rows to export as a `values_list()` queryset.
+
+        Raises:
+        - `ValueError`: If the filters are invalid.
+        """
+        if queryset is None:
+            queryset = self.model.objects.all()
+        if self.filterset_class is not None:
+            filterset = self.filterset_class(self.filters, queryset=queryset)
+            if not filterset.is_valid():
+                raise ValueError(
+                    "; ".join(
+                        f"{name}: {message}"
+                        for name, messages in filterset.errors.items()
+                        for message in messages
+                    )
+                )
+            queryset = filterset.qs
+        return queryset.order_by(*self.ordering).values_list(
+            *(lookup for header, lookup in self.columns)
+        )
+
+    def iter_rows(self, queryset=None):
+        return self.get_queryset(queryset).iterator(chunk_size=self.chunk_size)
+
+    def iter_csv(self, queryset=None):
+        """
+        Returns a generator of CSV lines for the export, header first.
+        """
+        return iter_csv(self.header, self.iter_rows(queryset))
+
+    def write_csv(self, file, queryset=None):
+        """
+        Writes the export as CSV to a text file and returns the number of rows written.
+        """
+        writer = csv.writer(file)
+        writer.writerow(self.header)
+        count = 0
+        for row in self.iter_rows(queryset):
+            writer.writerow(row)
+            count += 1
+        return count
+
+    def get_parquet_schema(self):
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                pa.field(header, _parquet_type(self.get_field(lookup)))
+                for header, lookup in self.columns
+            ]
+        )
+
+    def get_field(self, lookup):
+        model = self.model
+        *relations, name = lookup.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def write_parquet(self, file, queryset=None):
+        """
+        Writes the export as Parquet, one row group per `chunk_size` rows, and returns the number of rows written.
+
+        Requires `pyarrow`.
+
+        Raises:
+        - `ValueError`: If `pyarrow` is not installed.
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Exporting Parquet files requires the pyarrow package.")
+
+        schema = self.get_parquet_schema()
+        count = 0
+        with pq.ParquetWriter(file, schema) as writer:
+            batch = []
+            for row in self.iter_rows(queryset):
+                batch.append(row)
+                if len(batch) == self.chunk_size:
+                    count += self._write_row_group(writer, schema, batch)
+                    batch = []
+            if batch:
+                count += self._write_row_group(writer, schema, batch)
+        return count
+
+    @staticmethod
+    def _write_row_group(writer, schema, rows):
+        import pyarrow as pa
+
+        columns = list(zip(*rows))
+        writer.write_table(
+            pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            )
+        )
+        return len(rows)
+
+
+class RecordExportCommand(BaseCommand):
+    """
+    Base management command that exports a record history with `exporter_class` as CSV or Parquet.
+
+    Filters are passed as repeated `--filter name=value` options using the names of the list endpoint's filters.
+    """
+
+    exporter_class = None
+    record_name = "records"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Where to write the export.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "parquet"],
+            help="The format of the export, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="A filter of the list endpoint, e.g. --filter month_of_milking=3. Can be repeated.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=self.exporter_class.chunk_size,
+            help="The number of rows fetched at a time, and the size of the Parquet row groups.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ("csv", "parquet"):
+            raise CommandError(f"Unsupported export format: '{file_format}'.")
+
+        filters = {}
+        for option in options["filter"]:
+            name, separator, value = option.partition("=")
+            if not separator:
+                raise CommandError(f"Filters must look like NAME=VALUE, got '{option}'.")
+            filters[name] = value
+
+        exporter = self.exporter_class(filters=filters, chunk_size=options["chunk_size"])
+        try:
+            if file_format == "csv":
+                with path.open("w", newline="") as file:
+                    count = exporter.write_csv(file)
+            else:
+                count = exporter.write_parquet(str(path))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} {self.record_name} to {path}."))
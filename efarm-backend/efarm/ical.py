@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+
+@dataclass
+class CalendarEvent:
+    """
+    An all-day event of an iCalendar feed.
+
+    Attributes:
+    - `uid` (str): The globally unique and stable identifier of the event.
+    - `date` (date): The day of the event.
+    - `summary` (str): The title of the event.
+    - `description` (str): An optional longer description.
+    - `categories` (str): An optional category, e.g. the kind of task.
+    """
+
+    uid: str
+    date: date
+    summary: str
+    description: str = ""
+    categories: str = ""
+
+
+def escape_text(value):
+    """
+    Escapes a TEXT property value (RFC 5545, section 3.3.11).
+    """
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line, limit=75):
+    """
+    Terminates a content line with CRLF, folding it into lines of at most `limit` octets (RFC 5545, section 3.1).
+
+    Continuation lines start with a space, and multi-byte characters are never split.
+    """
+    encoded = line.encode()
+    parts = []
+    start = 0
+    while len(encoded) - start > limit:
+        # Continuation lines lose an octet to the leading space
+        end = start + (limit if not parts else limit - 1)
+        while encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start = end
+    parts.append(encoded[start:].decode())
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def iter_ical(events, name, product_id="-//eFarm//eFarm//EN"):
+    """
+    Formats all-day events as an iCalendar feed, one content line at a time.
+
+    Args:
+    - `events`: An iterable of `CalendarEvent`.
+    - `name`: The name calendar clients show for the feed.
+    - `product_id`: The identifier of the product that created the feed.
+
+    Returns:
+    - A generator of CRLF terminated content lines.
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{product_id}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    for line in header:
+        yield fold_line(line)
+
+    for event in events:
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{event.uid}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{event.date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{event.date + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{escape_text(event.summary)}",
+        ]
+        if event.description:
+            lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+        if event.categories:
+            lines.append(f"CATEGORIES:{escape_text(event.categories)}")
+        lines.append("END:VEVENT")
+        for line in lines:
+            yield fold_line(line)
+
+    yield fold_line("END:VCALENDAR")
@@ -0,0 +1,269 @@
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+NON_FIELD_ERRORS = "non_field_errors"
+
+
+def read_rows(file, file_format="csv"):
+    """
+    Streams the rows of a register file as dicts keyed by the column headers.
+
+    Args:
+    - `file`: A binary or text file object.
+    - `file_format`: Either "csv" or "xlsx". Reading XLSX files requires `openpyxl`.
+
+    Returns:
+    - A generator of `(row_number, row)` pairs, where `row_number` counts the header as row 1.
+    """
+    if file_format == "xlsx":
+        return _read_xlsx_rows(file)
+    if file_format != "csv":
+        raise ValueError(f"Unsupported register format: '{file_format}'.")
+    return _read_csv_rows(file)
+
+
+def _read_csv_rows(file):
+    text_file = file
+    if isinstance(file.read(0), bytes):
+        text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        for row_number, row in enumerate(csv.DictReader(text_file), start=2):
+            yield row_number, {
+                column.strip(): (value or "").strip()
+                for column, value in row.items()
+                if column is not None
+            }
+    finally:
+        # Leave the underlying file open so that it can be read again
+        if text_file is not file:
+            text_file.detach()
+
+
+def _read_xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Importing XLSX registers requires the openpyxl package.")
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    rows = workbook.active.iter_rows(values_only=True)
+    header = [str(column).strip() for column in next(rows, ()) if column is not None]
+    for row_number, values in enumerate(rows, start=2):
+        yield row_number, {column: _format_xlsx_value(value) for column, value in zip(header, values)}
+
+
+def _format_xlsx_value(value):
+    if value is None:
+        return ""
+    # Date cells are read as datetimes at midnight
+    if isinstance(value, datetime) and value.time() == time():
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def chunked(rows, size):
+    """
+    Splits an iterable of rows into lists of at most `size` rows without reading ahead.
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def parse_boolean(value):
+    """
+    Parses the yes/no spellings used in registers, returning other values unchanged for field validation to reject.
+    """
+    normalized = value.strip().lower()
+    if normalized in ("true", "yes", "y", "t", "1"):
+        return True
+    if normalized in ("false", "no", "n", "f", "0"):
+        return False
+    return value
+
+
+def get_error_dict(error):
+    """
+    Returns the messages of a `ValidationError` as a dict of field names to lists of messages.
+    """
+    if hasattr(error, "error_dict"):
+        return {
+            NON_FIELD_ERRORS if name == "__all__" else name: messages
+            for name, messages in error.message_dict.items()
+        }
+    return {NON_FIELD_ERRORS: error.messages}
+
+
+def write_rejected_rows(rejected, file):
+    """
+    Writes the rejected rows of an import as CSV, with the row number and errors in front of the original columns.
+
+    Args:
+    - `rejected`: The `{"row", "data", "errors"}` dicts of an `ImportResult`.
+    - `file`: A text file object.
+    """
+    columns = []
+    for rejection in rejected:
+        columns.extend(column for column in rejection["data"] if column not in columns)
+
+    writer = csv.writer(file)
+    writer.writerow(["row", "errors", *columns])
+    for rejection in rejected:
+        errors = "; ".join(
+            f"{name}: {message}"
+            for name, messages in rejection["errors"].items()
+            for message in messages
+        )
+        writer.writerow(
+            [rejection["row"], errors, *(rejection["data"].get(column, "") for column in columns)]
+        )
+
+
+@dataclass
+class ImportResult:
+    """
+    The outcome of a register import.
+
+    Attributes:
+    - `created` (int): The number of records created.
+    - `rejected` (list): A `{"row", "data", "errors"}` dict per rejected row.
+    """
+
+    created: int = 0
+    rejected: list = field(default_factory=list)
+
+
+class RegisterImporter:
+    """
+    Base class for importers that load a farm register into the database in chunks.
+
+    A file is imported inside a single transaction. Every chunk of rows is validated in memory by `import_chunk()`
+    and written with bulk inserts, rows that fail validation are collected in the result instead of aborting the
+    import, and `finish()` runs once at the end for work that should not be repeated per row such as recomputing
+    inventories.
+
+    Subclasses implement:
+    - `prepare()`: Loads the lookup maps used while importing.
+    - `scan(row)`: Optionally inspects every row before the import, for references to rows later in the file.
+    - `import_chunk(chunk)`: Validates and inserts a list of `(row_number, row)` pairs.
+    - `finish()`: Runs after the last chunk.
+
+    Attributes:
+    - `chunk_size`: The number of rows validated and inserted at a time.
+    - `needs_scan`: Whether the file is read twice so that `scan()` sees every row before the import starts.
+    """
+
+    chunk_size = 500
+    needs_scan = False
+
+    def __init__(self, chunk_size=None, dry_run=False):
+        self.chunk_size = chunk_size or self.chunk_size
+        self.dry_run = dry_run
+        self.result = ImportResult()
+
+    def run(self, file, file_format="csv"):
+        """
+        Imports a register file.
+
+        Args:
+        - `file`: A seekable file object.
+        - `file_format`: Either "csv" or "xlsx".
+
+        Returns:
+        - `ImportResult`: The number of created records and the rejected rows.
+        """
+        with transaction.atomic():
+            self.prepare()
+            if self.needs_scan:
+                for row_number, row in read_rows(file, file_format):
+                    self.scan(row)
+                file.seek(0)
+
+            for chunk in chunked(read_rows(file, file_format), self.chunk_size):
+                self.import_chunk(chunk)
+            self.finish()
+
+            if self.dry_run:
+                transaction.set_rollback(True)
+        return self.result
+
+    def reject(self, row_number, row, error):
+        errors = get_error_dict(error) if isinstance(error, ValidationError) else error
+        self.result.rejected.append({"row": row_number, "data": row, "errors": errors})
+
+    def prepare(self):
+        pass
+
+    def scan(self, row):
+        pass
+
+    def import_chunk(self, chunk):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+
+class RegisterImportCommand(BaseCommand):
+    """
+    Base management command that imports a register file with `importer_class` and writes the rejected rows to a
+    CSV report next to the file.
+    """
+
+    importer_class = None
+    record_name = "records"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The CSV or XLSX register to import.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "xlsx"],
+            help="The format of the register, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--rejected-report",
+            help="Where to write the rejected rows, defaults to <path>.rejected.csv.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=self.importer_class.chunk_size,
+            help="The number of rows validated and inserted at a time.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the register and report the rejected rows without saving anything.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        importer = self.importer_class(chunk_size=options["chunk_size"], dry_run=options["dry_run"])
+
+        try:
+            with path.open("rb") as file:
+                result = importer.run(file, file_format)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {result.created} {self.record_name} from {path}."))
+
+        if result.rejected:
+            report_path = Path(options["rejected_report"] or f"{path}.rejected.csv")
+            with report_path.open("w", newline="") as report:
+                write_rejected_rows(result.rejected, report)
+            self.stdout.write(
+                self.style.WARNING(f"Rejected {len(result.rejected)} rows, see {report_path}.")
+            )
@@ -0,0 +1,425 @@
+import functools
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib import import_module
+from threading import Lock
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver as connect_receiver
+from django.http import Http404, HttpResponse
+from django.utils.module_loading import module_has_submodule
+
+from efarm.conf import get_app_setting
+
+logger = logging.getLogger("efarm.instrumentation")
+
+_request_timings = ContextVar("request_timings", default=None)
+
+DEFAULTS = {
+    # Whether requests are instrumented at all; when off the middleware removes itself from the chain
+    "ENABLED": True,
+    # Requests that take longer are logged to the `efarm.instrumentation` logger
+    "SLOW_REQUEST_MS": 1000,
+    # The number of spans reported in the Server-Timing header, the slowest first
+    "SERVER_TIMING_SPANS": 10,
+}
+
+# The upper bounds of the request duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def get_setting(name):
+    return get_app_setting("INSTRUMENTATION", name, DEFAULTS)
+
+
+class RequestTimings:
+    """
+    The query count, database time and span durations of one request.
+
+    Spans are timed inclusively: a validator that runs inside a signal receiver counts towards both.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.spans = defaultdict(lambda: [0, 0.0])
+
+    def add_span(self, name, seconds):
+        span = self.spans[name]
+        span[0] += 1
+        span[1] += seconds
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+    def slowest_spans(self, count=None):
+        return sorted(self.spans.items(), key=lambda item: item[1][1], reverse=True)[:count]
+
+
+@contextmanager
+def span(name):
+    """
+    Times the block as the span `name` of the current request, if it is instrumented.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_span(name, time.perf_counter() - started)
+
+
+def instrumented(name):
+    """
+    Decorates a function so that each call is timed as the span `name` of the current request.
+
+    Outside instrumented requests the wrapper only looks up a context variable before calling the function.
+    """
+
+    def decorator(function):
+        if getattr(function, "instrumented_span", None):
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings.add_span(name, time.perf_counter() - started)
+
+        wrapper.instrumented_span = name
+        return wrapper
+
+    return decorator
+
+
+def receiver(signal, **kwargs):
+    """
+    Works like `django.dispatch.receiver`, and times each call of the receiver as a `receiver.<name>` span.
+
+    The decorated function is the instrumented one, so stacking the decorator connects the same wrapper to every
+    signal and disconnecting the module attribute still works.
+    """
+
+    def decorator(function):
+        function = instrumented(f"receiver.{function.__name__}")(function)
+        return connect_receiver(signal, **kwargs)(function)
+
+    return decorator
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    timings = _request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute_wrapper(execute, sql, params, many, context)
+
+
+def instrument_connection(sender=None, connection=None, **kwargs):
+    """
+    Counts the queries of `connection` towards the request it runs for.
+
+    The wrapper finds the request through a context variable, so queries that run in another thread for the
+    request, as under ASGI, are counted as well.
+    """
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def instrument_validators(module):
+    """
+    Times every static method of the `*Validator` classes of `module` as a `<class>.<method>` span.
+    """
+    for class_name, validator_class in vars(module).items():
+        if not (isinstance(validator_class, type) and class_name.endswith("Validator")):
+            continue
+        if validator_class.__module__ != module.__name__:
+            continue
+        for name, attribute in list(vars(validator_class).items()):
+            if isinstance(attribute, staticmethod):
+                function = instrumented(f"{class_name}.{name}")(attribute.__func__)
+                setattr(validator_class, name, staticmethod(function))
+
+
+def instrument_serializers():
+    """
+    Times the validation and representation of DRF serializers as the `serializer.validate` and
+    `serializer.data` spans. Only the outermost serializer of a request is timed, so nested serializers are not
+    counted twice.
+    """
+    from rest_framework import serializers
+
+    def outermost(name, function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None or getattr(timings, "in_serializer", False):
+                return function(self, *args, **kwargs)
+            timings.in_serializer = True
+            started = time.perf_counter()
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                timings.in_serializer = False
+                timings.add_span(name, time.perf_counter() - started)
+
+        return wrapper
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        serializer_class.is_valid = outermost("serializer.validate", serializer_class.is_valid)
+        serializer_class.data = property(outermost("serializer.data", serializer_class.data.fget))
+
+
+_installed = False
+_install_lock = Lock()
+
+
+def install():
+    """
+    Instruments the database connections, the validators of the installed apps and the DRF serializers, once per
+    process.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        connection_created.connect(instrument_connection, dispatch_uid="efarm.instrumentation")
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(connection=connection)
+        for app_config in apps.get_app_configs():
+            if module_has_submodule(app_config.module, "validators"):
+                instrument_validators(import_module(f"{app_config.name}.validators"))
+        instrument_serializers()
+        _installed = True
+
+
+class Metrics:
+    """
+    Per-process request metrics, formatted in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = defaultdict(int)
+        self.slow_requests = defaultdict(int)
+        self.duration_buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self.duration_sums = defaultdict(float)
+        self.duration_counts = defaultdict(int)
+        self.queries = defaultdict(int)
+        self.db_seconds = defaultdict(float)
+        self.span_calls = defaultdict(int)
+        self.span_seconds = defaultdict(float)
+
+    def observe(self, view, method, status, seconds, timings, slow):
+        with self.lock:
+            self.requests[(view, method, str(status))] += 1
+            if slow:
+                self.slow_requests[view] += 1
+            buckets = self.duration_buckets[view]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    buckets[index] += 1
+            self.duration_sums[view] += seconds
+            self.duration_counts[view] += 1
+            self.queries[view] += timings.queries
+            self.db_seconds[view] += timings.db_seconds
+            for name, (calls, span_seconds) in timings.spans.items():
+                self.span_calls[name] += calls
+                self.span_seconds[name] += span_seconds
+
+    def render(self):
+        lines = []
+
+        def family(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(format_sample(*sample) for sample in samples)
+
+        with self.lock:
+            family(
+                "efarm_http_requests_total",
+                "counter",
+                "Requests by view, method and status.",
+                [
+                    ("efarm_http_requests_total", {"view": view, "method": method, "status": status}, count)
+                    for (view, method, status), count in sorted(self.requests.items())
+                ],
+            )
+            family(
+                "efarm_http_slow_requests_total",
+                "counter",
+                "Requests slower than the slow request threshold, by view.",
+                [
+                    ("efarm_http_slow_requests_total", {"view": view}, count)
+                    for view, count in sorted(self.slow_requests.items())
+                ],
+            )
+            histogram = "efarm_http_request_duration_seconds"
+            samples = []
+            for view, buckets in sorted(self.duration_buckets.items()):
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    samples.append((f"{histogram}_bucket", {"view": view, "le": str(bound)}, count))
+                samples.append((f"{histogram}_bucket", {"view": view, "le": "+Inf"}, self.duration_counts[view]))
+                samples.append((f"{histogram}_sum", {"view": view}, self.duration_sums[view]))
+                samples.append((f"{histogram}_count", {"view": view}, self.duration_counts[view]))
+            family(histogram, "histogram", "Request durations by view.", samples)
+            family(
+                "efarm_db_queries_total",
+                "counter",
+                "Database queries run by requests, by view.",
+                [("efarm_db_queries_total", {"view": view}, count) for view, count in sorted(self.queries.items())],
+            )
+            family(
+                "efarm_db_duration_seconds_total",
+                "counter",
+                "Time requests spent in the database, by view.",
+                [
+                    ("efarm_db_duration_seconds_total", {"view": view}, seconds)
+                    for view, seconds in sorted(self.db_seconds.items())
+                ],
+            )
+            family(
+                "efarm_span_calls_total",
+                "counter",
+                "Calls of the instrumented signal receivers, validators and serializers.",
+                [("efarm_span_calls_total", {"span": name}, count) for name, count in sorted(self.span_calls.items())],
+            )
+            family(
+                "efarm_span_duration_seconds_total",
+                "counter",
+                "Time spent in the instrumented signal receivers, validators and serializers.",
+                [
+                    ("efarm_span_duration_seconds_total", {"span": name}, seconds)
+                    for name, seconds in sorted(self.span_seconds.items())
+                ],
+            )
+        return "\n".join(lines) + "\n"
+
+
+def format_sample(name, labels, value):
+    label_text = ",".join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+    return f"{name}{{{label_text}}} {value}"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+metrics = Metrics()
+
+
+class InstrumentationMiddleware:
+    """
+    Records the query count, database time and the time spent in signal receivers, validators and serializers
+    of each request.
+
+    The figures are sent back in a Server-Timing header, added to the process metrics served by
+    `metrics_view`, and requests slower than `INSTRUMENTATION["SLOW_REQUEST_MS"]` are logged as JSON to the
+    `efarm.instrumentation` logger. With `INSTRUMENTATION["ENABLED"]` off the middleware is left out of the
+    chain and the instrumented functions only check a context variable. Works under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_setting("ENABLED"):
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+        self.slow_request_seconds = get_setting("SLOW_REQUEST_MS") / 1000
+        self.server_timing_spans = get_setting("SERVER_TIMING_SPANS")
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        return self.process_timings(request, response, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        return self.process_timings(request, response, timings, time.perf_counter() - started)
+
+    def process_timings(self, request, response, timings, seconds):
+        response["Server-Timing"] = self.server_timing(timings, seconds)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        view = resolver_match.view_name if resolver_match else "unmatched"
+        slow = seconds > self.slow_request_seconds
+        metrics.observe(view, request.method, response.status_code, seconds, timings, slow)
+        if slow:
+            self.log_slow_request(request, response, view, seconds, timings)
+        return response
+
+    def server_timing(self, timings, seconds):
+        entries = [
+            f"total;dur={seconds * 1000:.1f}",
+            f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.queries} queries"',
+        ]
+        for name, (calls, span_seconds) in timings.slowest_spans(self.server_timing_spans):
+            entries.append(f'{name};dur={span_seconds * 1000:.1f};desc="{calls} calls"')
+        return ", ".join(entries)
+
+    def log_slow_request(self, request, response, view, seconds, timings):
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "duration_ms": round(seconds * 1000, 1),
+            "queries": timings.queries,
+            "db_ms": round(timings.db_seconds * 1000, 1),
+            "spans": {
+                name: {"calls": calls, "duration_ms": round(span_seconds * 1000, 1)}
+                for name, (calls, span_seconds) in timings.slowest_spans()
+            },
+        }
+        logger.warning("Slow request %s", json.dumps(record), extra={"request_timings": record})
+
+
+def metrics_view(request):
+    """
+    Serves the process metrics in the Prometheus text format to the addresses in `INTERNAL_IPS`.
+    """
+    if request.META.get("REMOTE_ADDR") not in settings.INTERNAL_IPS:
+        raise Http404
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,230 @@
+from pathlib import Path
+
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from efarm.caching import get_digest
+from efarm.clock import as_of, todays_date
+from efarm.importers import parse_boolean
+
+
+class StreamingListMixin:
+    """
+    Adds an opt-in streaming mode to list endpoints.
+
+    Passing `?stream=ndjson` returns one JSON object per line and `?stream=json` returns a JSON array. Rows are
+    read from a server-side iterator in chunks of `stream_chunk_size` and serialized one at a time, so memory
+    use stays flat regardless of how many records match the filters.
+
+    Methods:
+    - `get_stream_format(request)`: Returns the requested stream format, or None when streaming is not requested.
+    - `stream_queryset(queryset, stream_format)`: Returns a streaming response for the queryset.
+    """
+
+    stream_query_param = "stream"
+    stream_formats = {
+        "ndjson": "application/x-ndjson",
+        "json": "application/json",
+    }
+    stream_chunk_size = 2000
+
+    def get_stream_format(self, request):
+        stream_format = request.query_params.get(self.stream_query_param)
+        if stream_format in self.stream_formats:
+            return stream_format
+        return None
+
+    def stream_queryset(self, queryset, stream_format):
+        serializer = self.get_serializer()
+        encoder = JSONEncoder()
+        rows = (
+            encoder.encode(serializer.to_representation(instance))
+            for instance in queryset.iterator(chunk_size=self.stream_chunk_size)
+        )
+
+        if stream_format == "ndjson":
+            content = (f"{row}\n" for row in rows)
+        else:
+            content = self._stream_json_array(rows)
+
+        return StreamingHttpResponse(
+            self._stream_as_of(content, todays_date()),
+            content_type=self.stream_formats[stream_format],
+        )
+
+    @staticmethod
+    def _stream_as_of(content, as_of_date):
+        # The rows are serialized after the view has returned, so keep the request's as-of date while streaming
+        with as_of(as_of_date):
+            yield from content
+
+    @staticmethod
+    def _stream_json_array(rows):
+        yield "["
+        for index, row in enumerate(rows):
+            yield f",{row}" if index else row
+        yield "]"
+
+
+class RegisterImportMixin:
+    """
+    Adds an `import/` action that imports an uploaded CSV or XLSX register with `register_importer_class`.
+
+    The register is uploaded as the `file` field of a multipart request. `format` overrides the format guessed
+    from the file name and `dry_run=true` validates the register without saving anything. The response holds the
+    number of created records and the rejected rows with their errors.
+    """
+
+    register_importer_class = None
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser, FormParser],
+    )
+    def import_register(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"detail": "Upload the register as the 'file' field."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        file_format = request.data.get("format") or Path(upload.name).suffix.lstrip(".").lower()
+        dry_run = parse_boolean(request.data.get("dry_run", "false")) is True
+        importer = self.register_importer_class(dry_run=dry_run)
+        try:
+            result = importer.run(upload.file, file_format)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if dry_run:
+            response_status = status.HTTP_200_OK
+        elif result.created:
+            response_status = status.HTTP_201_CREATED
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {"created": result.created, "rejected": result.rejected}, status=response_status
+        )
+
+
+class RecordExportMixin:
+    """
+    Adds an `export/` action that streams the filtered records as CSV with `record_exporter_class`.
+
+    The export accepts the same query parameters as the list endpoint. Rows are read with `values_list()` in
+    chunks and formatted one line at a time, so memory use stays flat however many records are exported.
+    """
+
+    record_exporter_class = None
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        exporter = self.record_exporter_class(filters=request.query_params)
+        queryset = self.get_queryset()
+        try:
+            # Validate the filters before the response starts streaming
+            exporter.get_queryset(queryset)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(exporter.iter_csv(queryset), content_type="text/csv")
+        response["Content-Disposition"] = (
+            f'attachment; filename="{exporter.file_name}-{todays_date().isoformat()}.csv"'
+        )
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Answers list and retrieve requests whose If-None-Match or If-Modified-Since validators still hold with an empty
+    304 response, without serializing the rows.
+
+    The validators of a list are derived from one aggregate over the filtered rows: their count, highest primary
+    key and, with a `last_modified_field`, latest modification time. Those of a single row come from the row
+    itself. Rows changed in place must update `last_modified_field`; tables that rows are only added to and
+    deleted from are covered by the primary keys and the count.
+    """
+
+    last_modified_field = None
+
+    def list(self, request, *args, **kwargs):
+        aggregates = {"count": Count("pk"), "last_pk": Max("pk")}
+        if self.last_modified_field:
+            aggregates["last_modified"] = Max(self.last_modified_field)
+        values = self.filter_queryset(self.get_queryset()).order_by().aggregate(**aggregates)
+
+        response = self.get_conditional_response(request, values.values(), values.get("last_modified"))
+        if response is None:
+            response = self.add_validators(super().list(request, *args, **kwargs))
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field) if self.last_modified_field else None
+
+        response = self.get_conditional_response(request, [instance.pk, last_modified], last_modified)
+        if response is None:
+            response = self.add_validators(Response(self.get_serializer(instance).data))
+        return response
+
+    def get_conditional_response(self, request, values, last_modified):
+        """
+        Computes the validators of the response from `values`, and returns the 304 response when the request's
+        validators match them, or `None` when the response has to be sent.
+        """
+        self.etag = quote_etag(
+            get_digest(
+                [
+                    f"{type(self).__module__}.{type(self).__qualname__}",
+                    request.accepted_renderer.format,
+                    request.get_full_path(),
+                    *(str(value) for value in values),
+                ]
+            )
+        )
+        self.last_modified = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        return self.add_validators(response) if response is not None else None
+
+    def add_validators(self, response):
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = self.etag
+            if self.last_modified is not None:
+                response["Last-Modified"] = http_date(self.last_modified)
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class SinceListMixin:
+    """
+    Lets clients of an append-only table fetch only the rows added since their last request.
+
+    `?since=<id>` lists the rows whose primary key is greater than `id`, oldest first, so a client passes the
+    highest ID it has seen and gets the rest.
+    """
+
+    since_query_param = "since"
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        since = self.request.query_params.get(self.since_query_param)
+        if since is None or self.action != "list":
+            return queryset
+
+        try:
+            since = int(since)
+        except ValueError:
+            raise ValidationError({self.since_query_param: ["A valid integer is required."]})
+        return queryset.filter(pk__gt=since).order_by("pk")
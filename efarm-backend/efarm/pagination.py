@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination
+
+
+class RecordCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for the time-ordered record viewsets.
+
+    Pagination is opt-in so that existing clients keep receiving plain lists: it is only applied when the
+    request carries a `page_size` or `cursor` query parameter. The ordering is taken from the viewset's
+    `ordering` attribute (or the `ordering` query parameter), so each page is read with an indexed range
+    scan instead of an OFFSET.
+
+    Query parameters:
+    - `page_size`: The number of records per page (defaults to `page_size`, capped at `max_page_size`).
+    - `cursor`: The opaque cursor returned in the `next` and `previous` links.
+    """
+
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+        return super().get_page_size(request)
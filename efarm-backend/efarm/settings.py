@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +51,8 @@ INSTALLED_APPS = [
     "poultry",
     "poultry_inventory",
     "users",
+    "jobs",
+    "efarm",
 ]
 
 AUTH_USER_MODEL = "users.CustomUser"
@@ -57,6 +60,7 @@ AUTH_USER_MODEL = "users.CustomUser"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "efarm.instrumentation.InstrumentationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,8 +68,20 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "efarm.clock.AsOfDateMiddleware",
 ]
 
+# The options of the project's own settings dicts default to the DEFAULTS of the modules that read them; set only
+# the options to change, e.g. INSTRUMENTATION = {"SLOW_REQUEST_MS": 500}:
+# - INSTRUMENTATION: request instrumentation, see efarm.instrumentation
+# - JOBS: background jobs, see jobs.backends
+# - SQLITE_PRAGMAS: SQLite connection pragmas, see efarm.database
+# - TOKEN_CACHE: token authentication cache, see users.authentication
+# - RESPONSE_CACHE: dashboard response cache, see efarm.caching
+
+# Addresses allowed to scrape /internal/metrics
+INTERNAL_IPS = ["127.0.0.1"]
+
 ROOT_URLCONF = "efarm.urls"
 
 TEMPLATES = [
@@ -86,27 +102,64 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "efarm.wsgi.application"
 
+ASGI_APPLICATION = "efarm.asgi.application"
+
 USERNAME_FIELD = "username"
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# EFARM_DATABASE_ENGINE selects "sqlite" (the default) or "postgresql", which needs `pip install "psycopg[binary]"`.
+# SQLite serializes all writes on one lock; use PostgreSQL when several processes write at the same time.
+DATABASE_ENGINE = os.environ.get("EFARM_DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("EFARM_DATABASE_NAME", "efarm"),
+            "USER": os.environ.get("EFARM_DATABASE_USER", "efarm"),
+            "PASSWORD": os.environ.get("EFARM_DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("EFARM_DATABASE_HOST", "localhost"),
+            "PORT": os.environ.get("EFARM_DATABASE_PORT", "5432"),
+            # Persistent connections, checked before they are reused; 0 opens a connection per request
+            "CONN_MAX_AGE": int(os.environ.get("EFARM_DATABASE_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
+            # Behind a transaction pooler such as PgBouncer, a server connection is shared between transactions of
+            # different clients, so cursors can't be kept open across them
+            "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("EFARM_DATABASE_POOLER") == "pgbouncer",
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            # django.db.backends.sqlite3, with transactions that wait for the write lock, see efarm.sqlite3.base
+            "ENGINE": "efarm.sqlite3",
+            "NAME": os.environ.get("EFARM_DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+            # Reusing connections also saves applying SQLITE_PRAGMAS on every request
+            "CONN_MAX_AGE": int(os.environ.get("EFARM_DATABASE_CONN_MAX_AGE", "600")),
+        }
     }
-}
 
 
 # REST FRAMEWORK
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication"
+        "users.authentication.CachedTokenAuthentication"
     ],
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
 }
 
+# A cache shared by the worker processes of one host, so that a change invalidates the responses cached by all of
+# them. With servers on several hosts use a backend they all reach, such as
+# "django.core.cache.backends.db.DatabaseCache" or "django.core.cache.backends.redis.RedisCache"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("EFARM_CACHE_LOCATION", BASE_DIR / "cache"),
+    }
+}
+
 DJOSER = {
     "SERIALIZERS": {
         "user_create": "users.serializers.CustomUserCreateSerializer",
@@ -0,0 +1,15 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The SQLite backend, with transactions that take the write lock when they begin.
+
+    A deferred transaction only asks for the write lock at its first write. If another connection holds it by then,
+    SQLite fails at once with "database is locked" rather than waiting for `busy_timeout`, because the wait could
+    deadlock. Beginning with `BEGIN IMMEDIATE` makes concurrent writers queue on the busy timeout instead, which
+    is what Django 5.1's `transaction_mode` option does.
+    """
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
@@ -18,6 +18,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from efarm.instrumentation import metrics_view
+
 schema_view = get_schema_view(
    openapi.Info(
       title="E-Farm API",
@@ -44,5 +46,6 @@ urlpatterns = [
     path('poultry/', include('poultry.urls', namespace='poultry')),
     path('poultry_inventory/', include('poultry_inventory.urls', namespace='poultry_inventory')),
     path('users/', include('users.urls', namespace='users')),
+    path('internal/metrics', metrics_view, name='metrics'),
 
 ]
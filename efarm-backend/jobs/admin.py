@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobModelAdmin(admin.ModelAdmin):
+    list_display = ('task', 'idempotency_key', 'status', 'attempts', 'run_after', 'finished_at')
+    list_filter = ('status', 'task')
+
+
+admin.site.register(Job, JobModelAdmin)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from efarm.conf import get_app_setting
+from jobs.models import Job
+from jobs.registry import tasks
+
+DEFAULTS = {
+    # The class that queues the jobs enqueued by the apps
+    "BACKEND": "jobs.backends.DatabaseBackend",
+    # The number of jobs a worker claims at once
+    "BATCH_SIZE": 100,
+    # The number of attempts after which a job is marked as failed
+    "MAX_ATTEMPTS": 5,
+    # The delay before the first retry, doubled after every further failure
+    "RETRY_DELAY_SECONDS": 30,
+    # Running jobs that are older belong to a worker that stopped and are claimed again
+    "STALE_AFTER_SECONDS": 600,
+}
+
+
+def get_setting(name):
+    return get_app_setting("JOBS", name, DEFAULTS)
+
+
+class DatabaseBackend:
+    """
+    Queues jobs in the `Job` table, in the transaction of the change they derive data from, for the `run_jobs`
+    worker to pick up once it is committed.
+    """
+
+    def enqueue(self, task, payload, key=None):
+        return Job.objects.enqueue(task, payload, key)
+
+
+class ImmediateBackend:
+    """
+    Runs the handler of each job in-process as soon as the current transaction commits, for development setups
+    without a worker. Jobs are neither batched, deduplicated nor retried.
+    """
+
+    def enqueue(self, task, payload, key=None):
+        handler = tasks[task]
+        transaction.on_commit(lambda: handler([payload]))
+        return True
+
+
+def enqueue(task, payload, key=None):
+    """
+    Queues a job with the configured backend.
+
+    Args:
+    - `task`: The registered name of the task.
+    - `payload`: The JSON serializable argument of the task handler.
+    - `key`: An optional idempotency key; a job whose key was queued before is not queued again.
+
+    Returns:
+    - `bool`: Whether the job was queued.
+    """
+    return import_string(get_setting("BACKEND"))().enqueue(task, payload, key)
+
+
+def retry_delay():
+    return timedelta(seconds=get_setting("RETRY_DELAY_SECONDS"))
+
+
+def stale_after():
+    return timedelta(seconds=get_setting("STALE_AFTER_SECONDS"))
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class JobStatusChoices(models.TextChoices):
+    """
+    Choices for the status of a background job.
+
+    - `Pending`: Waiting for a worker, possibly until a retry is due.
+    - `Running`: Claimed by a worker.
+    - `Done`: Ran successfully.
+    - `Failed`: Gave up after the last attempt.
+    """
+
+    PENDING = "Pending"
+    RUNNING = "Running"
+    DONE = "Done"
+    FAILED = "Failed"
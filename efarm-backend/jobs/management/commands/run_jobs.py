@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.worker import run_batch
+
+
+class Command(BaseCommand):
+    help = "Runs the queued background jobs, polling the queue until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="The number of jobs to claim at once.")
+        parser.add_argument(
+            "--sleep", type=float, default=1.0, help="Seconds to wait before polling an empty queue again."
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Run the jobs that are due and exit once the queue is empty."
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            help="Delete the done and failed jobs that finished more than this many days ago, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge_days"] is not None:
+            deleted = Job.objects.purge(timezone.now() - timedelta(days=options["purge_days"]))
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} finished jobs."))
+            return
+
+        processed = 0
+        try:
+            while True:
+                claimed = run_batch(options["batch_size"])
+                processed += claimed
+                if not claimed:
+                    if options["once"]:
+                        break
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} jobs."))
@@ -0,0 +1,105 @@
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.choices import JobStatusChoices
+
+
+class JobManager(models.Manager):
+    """
+    Custom manager for the Job model, the queue table of the background jobs.
+
+    Methods:
+    - `enqueue(task, payload, key)`: Queues a job unless a job with the same idempotency key exists.
+    - `claim(batch_size, stale_after, max_attempts)`: Marks the next due jobs as running and returns them.
+    - `complete(jobs)`: Marks jobs as done.
+    - `retry_or_fail(job, error, max_attempts, retry_delay)`: Schedules a failed job for a retry, or gives up.
+    - `purge(before)`: Deletes the jobs that finished before a date.
+    """
+
+    def enqueue(self, task, payload, key=None):
+        """
+        Queues a job, unless a job with the same idempotency key was queued before.
+
+        Args:
+        - `task`: The registered name of the task.
+        - `payload`: The JSON serializable argument of the task handler.
+        - `key`: An optional idempotency key, e.g. the record the job derives data from.
+
+        Returns:
+        - `bool`: Whether the job was queued.
+        """
+        try:
+            with transaction.atomic():
+                self.create(task=task, payload=payload, idempotency_key=key)
+        except IntegrityError:
+            return False
+        return True
+
+    def claim(self, batch_size, stale_after, max_attempts):
+        """
+        Marks up to `batch_size` due jobs as running, in the order they were queued, and returns them.
+
+        Jobs that have been running for longer than `stale_after` belong to a worker that stopped and are claimed
+        again, unless they already ran `max_attempts` times: those are marked as failed, so that a job that kills
+        its worker isn't run forever. Where the database supports it, rows locked by another worker are skipped.
+
+        Returns:
+        - `list`: The claimed jobs, with their updated attempt counts.
+        """
+        now = timezone.now()
+        stale = Q(status=JobStatusChoices.RUNNING, started_at__lt=now - stale_after)
+        due = Q(status=JobStatusChoices.PENDING, run_after__lte=now) | (stale & Q(attempts__lt=max_attempts))
+        with transaction.atomic():
+            self.filter(stale, attempts__gte=max_attempts).update(
+                status=JobStatusChoices.FAILED,
+                finished_at=now,
+                last_error=f"The job was still running after {stale_after} on its last attempt.",
+            )
+            queryset = self.filter(due).order_by("id")
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            job_ids = list(queryset.values_list("id", flat=True)[:batch_size])
+            self.filter(id__in=job_ids).update(
+                status=JobStatusChoices.RUNNING, started_at=now, attempts=F("attempts") + 1
+            )
+        return list(self.filter(id__in=job_ids).order_by("id"))
+
+    def complete(self, jobs):
+        self.filter(id__in=[job.id for job in jobs]).update(
+            status=JobStatusChoices.DONE, finished_at=timezone.now(), last_error=""
+        )
+
+    def retry_or_fail(self, job, error, max_attempts, retry_delay):
+        """
+        Schedules a failed job for another attempt after an exponential backoff of `retry_delay`, or marks it as
+        failed once it has run `max_attempts` times.
+
+        Returns:
+        - `str`: The new status of the job.
+        """
+        now = timezone.now()
+        if job.attempts >= max_attempts:
+            status, run_after, finished_at = JobStatusChoices.FAILED, job.run_after, now
+        else:
+            status, run_after, finished_at = (
+                JobStatusChoices.PENDING,
+                now + retry_delay * 2 ** (job.attempts - 1),
+                None,
+            )
+        self.filter(id=job.id).update(
+            status=status, run_after=run_after, finished_at=finished_at, last_error=error
+        )
+        return status
+
+    def purge(self, before):
+        """
+        Deletes the done and failed jobs that finished before `before`, which also frees their idempotency keys.
+
+        Returns:
+        - `int`: The number of deleted jobs.
+        """
+        deleted, _ = self.filter(
+            status__in=[JobStatusChoices.DONE, JobStatusChoices.FAILED], finished_at__lt=before
+        ).delete()
+        return deleted
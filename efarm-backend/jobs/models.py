@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+from jobs.choices import JobStatusChoices
+from jobs.managers import JobManager
+
+
+class Job(models.Model):
+    """
+    A background job in the database-backed queue.
+
+    Fields:
+    - `task`: The registered name of the task that handles the job.
+    - `payload`: The JSON argument of the task handler.
+    - `idempotency_key`: An optional unique key; a job with a key that was already queued is not queued again.
+    - `status`: The status of the job, see `JobStatusChoices`.
+    - `attempts`: The number of times a worker claimed the job.
+    - `run_after`: The job is not claimed before this time, which is how retries are delayed.
+    - `last_error`: The traceback of the last failed attempt.
+    - `created_at`, `started_at` and `finished_at`: When the job was queued, last claimed and done or failed.
+    """
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "run_after"], name="job_due_idx")]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(
+        max_length=7, choices=JobStatusChoices.choices, default=JobStatusChoices.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = JobManager()
+
+    def __str__(self):
+        return f"{self.task} job {self.id} ({self.status})"
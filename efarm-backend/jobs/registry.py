@@ -0,0 +1,18 @@
+tasks = {}
+
+
+def task(name):
+    """
+    Registers a function as the handler of the task `name`.
+
+    Handlers take a list with the payloads of a batch of jobs, in the order they were enqueued, so that a batch
+    of derived-data updates can be applied with one query per table instead of one per job. A handler runs in a
+    transaction; if it raises, the jobs of the batch are retried one by one.
+    """
+
+    def decorator(function):
+        tasks[name] = function
+        function.task_name = name
+        return function
+
+    return decorator
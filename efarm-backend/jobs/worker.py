@@ -0,0 +1,55 @@
+import logging
+import traceback
+from itertools import groupby
+
+from django.db import transaction
+
+from jobs.backends import get_setting, retry_delay, stale_after
+from jobs.choices import JobStatusChoices
+from jobs.models import Job
+from jobs.registry import tasks
+
+logger = logging.getLogger("jobs")
+
+
+def run_batch(batch_size=None):
+    """
+    Claims a batch of due jobs and runs them, one handler call per task.
+
+    When a handler raises, its jobs are run again one at a time, so that a single bad job neither blocks nor
+    fails the others; the failing jobs are retried with a backoff until they run out of attempts.
+
+    Returns:
+    - `int`: The number of claimed jobs, `0` when the queue is empty.
+    """
+    jobs = Job.objects.claim(batch_size or get_setting("BATCH_SIZE"), stale_after(), get_setting("MAX_ATTEMPTS"))
+    for task, task_jobs in groupby(jobs, key=lambda job: job.task):
+        task_jobs = list(task_jobs)
+        try:
+            run_jobs(task, task_jobs)
+        except Exception:
+            if len(task_jobs) == 1:
+                fail(task_jobs[0])
+                continue
+            for job in task_jobs:
+                try:
+                    run_jobs(task, [job])
+                except Exception:
+                    fail(job)
+    return len(jobs)
+
+
+def run_jobs(task, jobs):
+    if task not in tasks:
+        raise LookupError(f"No handler is registered for the task '{task}'.")
+    with transaction.atomic():
+        tasks[task]([job.payload for job in jobs])
+        Job.objects.complete(jobs)
+
+
+def fail(job):
+    status = Job.objects.retry_or_fail(
+        job, traceback.format_exc(), get_setting("MAX_ATTEMPTS"), retry_delay()
+    )
+    log = logger.error if status == JobStatusChoices.FAILED else logger.warning
+    log("%s, attempt %s of %s failed", job, job.attempts, get_setting("MAX_ATTEMPTS"), exc_info=True)
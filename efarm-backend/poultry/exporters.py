@@ -0,0 +1,39 @@
+from efarm.exporters import RecordExporter
+from poultry.filters import EggCollectionFilterSet, FlockInspectionRecordFilterSet
+from poultry.models import EggCollection, FlockInspectionRecord
+
+
+class EggCollectionExporter(RecordExporter):
+    """
+    Exports the egg collection records.
+    """
+
+    model = EggCollection
+    filterset_class = EggCollectionFilterSet
+    columns = [
+        ("id", "id"),
+        ("date_of_collection", "date_of_collection"),
+        ("time_of_collection", "time_of_collection"),
+        ("flock", "flock_id"),
+        ("collected_eggs", "collected_eggs"),
+        ("broken_eggs", "broken_eggs"),
+    ]
+    ordering = ("date_of_collection", "time_of_collection", "id")
+    file_name = "egg-collections"
+
+
+class FlockInspectionRecordExporter(RecordExporter):
+    """
+    Exports the flock inspection records.
+    """
+
+    model = FlockInspectionRecord
+    filterset_class = FlockInspectionRecordFilterSet
+    columns = [
+        ("id", "id"),
+        ("date_of_inspection", "date_of_inspection"),
+        ("flock", "flock_id"),
+        ("number_of_dead_birds", "number_of_dead_birds"),
+    ]
+    ordering = ("date_of_inspection", "id")
+    file_name = "flock-inspections"
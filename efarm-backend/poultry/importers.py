@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+
+from efarm.clock import todays_date
+from efarm.importers import RegisterImporter
+from poultry.models import Flock, FlockBreed, FlockSource, HousingStructure
+from poultry.validators import FlockValidator
+from poultry_inventory.models import FlockInventory, FlockInventoryHistory
+
+
+class FlockImporter(RegisterImporter):
+    """
+    Imports a flock register, creating a flock and its inventory per row.
+
+    Sources, breeds and housing structures are resolved through in-memory maps and the flock validators run
+    without per-row queries. Flocks, their inventories and the first inventory history entries are inserted with
+    `bulk_create`, one chunk at a time.
+
+    Columns:
+    - `source` and `breed`: The names of the flock source and breed, created if they don't exist yet.
+    - `date_of_hatching`, `chicken_type`, `initial_number_of_birds` and `current_rearing_method`: Required.
+    - `current_housing_structure`: The ID of the housing structure the flock is kept in.
+    """
+
+    flock_fields = [
+        "date_of_hatching",
+        "chicken_type",
+        "initial_number_of_birds",
+        "current_rearing_method",
+    ]
+
+    def prepare(self):
+        self.sources = {source.name: source for source in FlockSource.objects.all()}
+        self.breeds = {breed.name: breed for breed in FlockBreed.objects.all()}
+        self.housing_structures = {
+            str(structure.id): structure for structure in HousingStructure.objects.all()
+        }
+
+    def import_chunk(self, chunk):
+        flocks = []
+        for row_number, row in chunk:
+            try:
+                flocks.append(self.build_flock(row))
+            except ValidationError as e:
+                self.reject(row_number, row, e)
+
+        if not flocks:
+            return
+
+        flocks = Flock.objects.bulk_create(flocks)
+        inventories = FlockInventory.objects.bulk_create(
+            [FlockInventory(flock=flock, number_of_alive_birds=flock.initial_number_of_birds) for flock in flocks]
+        )
+        FlockInventoryHistory.objects.bulk_create(
+            [
+                FlockInventoryHistory(
+                    flock_inventory=inventory,
+                    date=todays_date(),
+                    number_of_birds=inventory.number_of_alive_birds,
+                    mortality_rate=Decimal("0.00"),
+                )
+                for inventory in inventories
+            ]
+        )
+        self.result.created += len(flocks)
+
+    def build_flock(self, row):
+        """
+        Builds and validates an unsaved flock from a register row.
+
+        Raises:
+        - `ValidationError`: If the row is invalid.
+        """
+        flock = Flock(
+            source=self.get_related(FlockSource, self.sources, "source", row.get("source", "")),
+            breed=self.get_related(FlockBreed, self.breeds, "breed", row.get("breed", "")),
+            current_housing_structure=self.get_housing_structure(row.get("current_housing_structure", "")),
+            **{name: row[name] for name in self.flock_fields if row.get(name)},
+        )
+        flock.clean_fields(exclude=["source", "breed", "current_housing_structure"])
+
+        try:
+            FlockValidator.validate_flock_date_of_hatching(flock.date_of_hatching)
+            FlockValidator.validate_flock_housing(
+                flock.chicken_type, flock.current_housing_structure, flock.age_in_weeks
+            )
+        except ValidationError as e:
+            raise ValidationError({"non_field_errors": e.messages})
+        return flock
+
+    @staticmethod
+    def get_related(model, instances, column, name):
+        if name not in instances:
+            try:
+                instances[name] = model.objects.create(name=name)
+            except ValidationError as e:
+                raise ValidationError({column: e.messages})
+        return instances[name]
+
+    def get_housing_structure(self, structure_id):
+        if structure_id not in self.housing_structures:
+            raise ValidationError(
+                {"current_housing_structure": [f"No housing structure with the ID '{structure_id}' was found."]}
+            )
+        return self.housing_structures[structure_id]
@@ -0,0 +1,9 @@
+from poultry.exporters import EggCollectionExporter
+from efarm.exporters import RecordExportCommand
+
+
+class Command(RecordExportCommand):
+    help = "Exports the egg collection records as CSV or Parquet, optionally filtered like the egg collection list endpoint."
+
+    exporter_class = EggCollectionExporter
+    record_name = "egg collection records"
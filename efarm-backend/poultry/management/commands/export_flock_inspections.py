@@ -0,0 +1,9 @@
+from poultry.exporters import FlockInspectionRecordExporter
+from efarm.exporters import RecordExportCommand
+
+
+class Command(RecordExportCommand):
+    help = "Exports the flock inspection records as CSV or Parquet, optionally filtered like the flock inspection list endpoint."
+
+    exporter_class = FlockInspectionRecordExporter
+    record_name = "flock inspection records"
@@ -0,0 +1,9 @@
+from efarm.importers import RegisterImportCommand
+from poultry.importers import FlockImporter
+
+
+class Command(RegisterImportCommand):
+    help = "Imports a flock register, creating the flocks and their inventories in bulk."
+
+    importer_class = FlockImporter
+    record_name = "flocks"
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poultry', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eggcollection',
+            index=models.Index(fields=['flock', 'date_of_collection'], name='egg_collection_flock_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flockinspectionrecord',
+            index=models.Index(fields=['flock', 'date_of_inspection'], name='inspection_flock_date_idx'),
+        ),
+    ]
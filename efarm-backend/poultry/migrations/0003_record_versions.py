@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-17 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poultry', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eggcollection',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='flockinspectionrecord',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
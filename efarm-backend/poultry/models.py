@@ -1,9 +1,7 @@
-from datetime import date
-
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.utils import timezone
+from django.db import transaction
 
-from poultry.utils import todays_date
+from efarm.clock import todays_date
 from poultry.validators import *
 
 
@@ -167,7 +165,7 @@ class Flock(models.Model):
         Calculates and returns the age of the flock in weeks.
 
         """
-        age_in_days = (todays_date - self.date_of_hatching).days
+        age_in_days = (todays_date() - self.date_of_hatching).days
         age_in_weeks = age_in_days // 7
         return age_in_weeks
 
@@ -177,7 +175,7 @@ class Flock(models.Model):
         Calculates and returns the age of the flock in months.
 
         """
-        age_in_days = (todays_date - self.date_of_hatching).days
+        age_in_days = (todays_date() - self.date_of_hatching).days
         age_in_months = age_in_days // 30
         return age_in_months
 
@@ -187,7 +185,7 @@ class Flock(models.Model):
         Calculates and returns the age of the flock in weeks since establishment.
 
         """
-        age_in_days = (todays_date - self.date_established).days
+        age_in_days = (todays_date() - self.date_established).days
         age_in_weeks_in_farm = age_in_days // 7
         return age_in_weeks_in_farm
 
@@ -197,7 +195,7 @@ class Flock(models.Model):
         Calculates and returns the age of the flock in months since establishment.
 
         """
-        age_in_days = (todays_date - self.date_established).days
+        age_in_days = (todays_date() - self.date_established).days
         age_in_months_in_farm = age_in_days // 30
         return age_in_months_in_farm
 
@@ -250,9 +248,18 @@ class FlockMovement(models.Model):
 
 
 class FlockInspectionRecord(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["flock", "date_of_inspection"], name="inspection_flock_date_idx"
+            ),
+        ]
+
     flock = models.ForeignKey(Flock, on_delete=models.CASCADE)
     date_of_inspection = models.DateTimeField(auto_now_add=True)
     number_of_dead_birds = models.PositiveIntegerField(default=0)
+    # Counts the saves of the record, see poultry_inventory.signals
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.flock} Inspection Report on: {self.date_of_inspection}"
@@ -260,7 +267,9 @@ class FlockInspectionRecord(models.Model):
     def save(self, *args, **kwargs):
         FlockInspectionRecordValidator.validate_flock_availability(self.flock)
         FlockInspectionRecordValidator.validate_number_of_dead_birds(self)
-        super().save(*args, **kwargs)
+        # The pre_save receiver of poultry_inventory.signals locks the stored record until the change is queued
+        with transaction.atomic():
+            super().save(*args, **kwargs)
         FlockInspectionRecordValidator.validate_daily_number_of_inspection_records(self.date_of_inspection)
         FlockInspectionRecordValidator.validate_inspection_record_time_separation(self.flock, self)
 
@@ -300,11 +309,20 @@ class FlockBreedInformation(models.Model):
 
 
 class EggCollection(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["flock", "date_of_collection"], name="egg_collection_flock_date_idx"
+            ),
+        ]
+
     flock = models.ForeignKey(Flock, on_delete=models.CASCADE)
     date_of_collection = models.DateField(auto_now_add=True)
     time_of_collection = models.TimeField(auto_now_add=True)
     collected_eggs = models.PositiveIntegerField(default=0)
     broken_eggs = models.PositiveIntegerField(default=0)
+    # Counts the saves of the collection, see poultry_inventory.signals
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     @property
     def picking_time(self):
@@ -330,5 +348,7 @@ class EggCollection(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        # The pre_save receiver of poultry_inventory.signals locks the stored collection until the change is queued
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
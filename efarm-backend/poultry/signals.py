@@ -1,5 +1,5 @@
 from django.db.models.signals import post_save, pre_save
-from django.dispatch import receiver
+from efarm.instrumentation import receiver
 from .models import *
 
 
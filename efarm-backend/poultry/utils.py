@@ -1,3 +0,0 @@
-from django.utils import timezone
-
-todays_date = timezone.now().date()
@@ -5,8 +5,8 @@ from django.core.exceptions import ValidationError
 from django.db.models import Sum
 from django.utils import timezone
 
+from efarm.clock import todays_date
 from poultry.choices import *
-from poultry.utils import todays_date
 
 
 class FlockSourceValidator:
@@ -126,7 +126,7 @@ class FlockValidator:
 
     @staticmethod
     def validate_flock_date_of_hatching(date_of_hatching):
-        if date_of_hatching > todays_date:
+        if date_of_hatching > todays_date():
             raise ValidationError("Invalid date of hatching, cannot be in future!")
 
 
@@ -353,7 +353,7 @@ class EggCollectionValidator:
     @staticmethod
     def validate_egg_collection_records_per_day(flock):
         from poultry.models import EggCollection
-        count = EggCollection.objects.filter(flock=flock, date_of_collection=todays_date).count()
+        count = EggCollection.objects.filter(flock=flock, date_of_collection=todays_date()).count()
         if count >= 3:
             tomorrow = timezone.now().astimezone(timezone.get_current_timezone()).date() + timezone.timedelta(days=1)
             raise ValidationError(f"Data entry for this flock is limited to thrice per day. "
@@ -4,9 +4,14 @@ from rest_framework.filters import OrderingFilter
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 
+from efarm.mixins import RecordExportMixin, RegisterImportMixin, StreamingListMixin
+from efarm.pagination import RecordCursorPagination
+from poultry.exporters import EggCollectionExporter, FlockInspectionRecordExporter
 from poultry.filters import *
+from poultry.importers import FlockImporter
 from poultry.permissions import *
 from poultry.serializers import *
+from users.permissions import HasActionRole
 
 
 class FlockSourceViewSet(viewsets.ModelViewSet):
@@ -16,18 +21,12 @@ class FlockSourceViewSet(viewsets.ModelViewSet):
     filterset_class = FlockSourceFilterSet
     ordering_fields = ["name"]
 
-    def get_permissions(self):
-        if self.action in ["create"]:
-            # Only farm owner and farm manager should be allowed to create flock sources
-            permission_classes = [CanAddFlockSource]
-        elif self.action in ["destroy"]:
-            # Only farm owner and farm manager should be allowed to delete flock sources
-            permission_classes = [CanDeleteFlockSource]
-        else:
-            # For viewing flock sources, allow farm owner, farm manager, assistant farm manager, team leader,
-            # and farm worker
-            permission_classes = [CanViewFlockSource]
-        return [permission() for permission in permission_classes]
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddFlockSource,
+        "destroy": CanDeleteFlockSource,
+        "default": CanViewFlockSource,
+    }
 
     def update(self, request, *args, **kwargs):
         raise MethodNotAllowed("PUT")
@@ -63,19 +62,12 @@ class FlockBreedViewSet(viewsets.ModelViewSet):
     filterset_class = FlockBreedFilterSet
     ordering_fields = ["name"]
 
-    def get_permissions(self):
-        if self.action in ["create"]:
-            # Only farm owner and farm manager should be allowed to create flock breeds
-
-            permission_classes = [CanAddFlockBreed]
-        elif self.action in ["destroy"]:
-            # Only farm owner and farm manager should be allowed to delete flock breeds
-            permission_classes = [CanDeleteFlockBreed]
-        else:
-            # For viewing flock breeds, allow farm owner, farm manager, assistant farm manager, team leader,
-            # and farm worker
-            permission_classes = [CanViewFlockBreeds]
-        return [permission() for permission in permission_classes]
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddFlockBreed,
+        "destroy": CanDeleteFlockBreed,
+        "default": CanViewFlockBreeds,
+    }
 
     def update(self, request, *args, **kwargs):
         raise MethodNotAllowed("PUT")
@@ -136,23 +128,23 @@ class HousingStructureViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FlockViewSet(viewsets.ModelViewSet):
-    queryset = Flock.objects.all()
+class FlockViewSet(RegisterImportMixin, viewsets.ModelViewSet):
+    queryset = Flock.objects.select_related("source", "breed")
     serializer_class = FlockSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = FlockFilterSet
     ordering_fields = ["-date_established", "source"]
-
-    def get_permissions(self):
-        if self.action in ["create"]:
-            permission_classes = [CanAddFlock]
-        elif self.action in ["update", "partial_update"]:
-            permission_classes = [CanUpdateFlock]
-        elif self.action in ["destroy"]:
-            permission_classes = [CanDeleteFlock]
-        else:
-            permission_classes = [CanViewFlock]
-        return [permission() for permission in permission_classes]
+    register_importer_class = FlockImporter
+
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddFlock,
+        "import_register": CanAddFlock,
+        "update": CanUpdateFlock,
+        "partial_update": CanUpdateFlock,
+        "destroy": CanDeleteFlock,
+        "default": CanViewFlock,
+    }
 
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -187,17 +179,23 @@ class FlockViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FlockHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class FlockHistoryViewSet(StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = FlockHistory.objects.all()
     serializer_class = FlockHistorySerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = FlockHistoryFilterSet
     ordering_fields = ["-date_changed", "flock", "rearing_method"]
+    ordering = ("-date_changed", "-id")
+    pagination_class = RecordCursorPagination
     permission_classes = [CanActOnFlockHistory]
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 # If query parameters are provided, but there are no matching flock history records.
@@ -212,22 +210,33 @@ class FlockHistoryViewSet(viewsets.ReadOnlyModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FlockMovementViewSet(viewsets.ModelViewSet):
+class FlockMovementViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = FlockMovement.objects.all()
     serializer_class = FlockMovementSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = FlockMovementFilterSet
     ordering_fields = ["-movement_date", "flock"]
+    ordering = ("-movement_date", "-id")
+    pagination_class = RecordCursorPagination
     permission_classes = [CanActOnFlockMovement]
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 # If query parameters are provided, but there are no matching flock movement records.
@@ -244,24 +253,31 @@ class FlockMovementViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FlockInspectionRecordViewSet(viewsets.ModelViewSet):
+class FlockInspectionRecordViewSet(RecordExportMixin, StreamingListMixin, viewsets.ModelViewSet):
     queryset = FlockInspectionRecord.objects.all()
     serializer_class = FlockInspectionRecordSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = FlockInspectionRecordFilterSet
     ordering_fields = ["-date_of_inspection", "flock"]
+    ordering = ("-date_of_inspection", "-id")
+    pagination_class = RecordCursorPagination
+    record_exporter_class = FlockInspectionRecordExporter
 
-    def get_permissions(self):
-        if self.action in ["destroy"]:
-            permission_classes = [CanDeleteFlockInspection]
-        else:
-            permission_classes = [CanAddViewUpdateFlockInspection]
-        return [permission() for permission in permission_classes]
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "destroy": CanDeleteFlockInspection,
+        "default": CanAddViewUpdateFlockInspection,
+    }
 
     def update(self, request, *args, **kwargs):
         # Disallowed updated for flock inspection records for sake of brevity—Temporary
@@ -280,6 +296,10 @@ class FlockInspectionRecordViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 # If query parameters are provided, but there are no matching flock inspection records.
@@ -296,6 +316,11 @@ class FlockInspectionRecordViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -307,21 +332,22 @@ class FlockBreedInformationViewSet(viewsets.ModelViewSet):
     permission_classes = [CanActOnFlockBreedInformation]
 
 
-class EggCollectionViewSet(viewsets.ModelViewSet):
+class EggCollectionViewSet(RecordExportMixin, StreamingListMixin, viewsets.ModelViewSet):
     queryset = EggCollection.objects.all()
     serializer_class = EggCollectionSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = EggCollectionFilterSet
     ordering_fields = ["-date_of_collection", "-time_of_collection", "flock"]
+    ordering = ("-date_of_collection", "-time_of_collection", "-id")
+    pagination_class = RecordCursorPagination
+    record_exporter_class = EggCollectionExporter
 
-    def get_permissions(self):
-        if self.action in ["create"]:
-            permission_classes = [CanAddEggCollection]
-        elif self.action in ["destroy"]:
-            permission_classes = [CanDeleteEggCollection]
-        else:
-            permission_classes = [CanViewEggCollection]
-        return [permission() for permission in permission_classes]
+    permission_classes = [HasActionRole]
+    action_permissions = {
+        "create": CanAddEggCollection,
+        "destroy": CanDeleteEggCollection,
+        "default": CanViewEggCollection,
+    }
 
     def update(self, request, *args, **kwargs):
         # Disallowed update for egg collection records— Temporary.
@@ -333,6 +359,10 @@ class EggCollectionViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_queryset(queryset, stream_format)
+
         if not queryset.exists():
             if request.query_params:
                 # If query parameters are provided, but there are no matching records
@@ -347,6 +377,11 @@ class EggCollectionViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_200_OK,
                 )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
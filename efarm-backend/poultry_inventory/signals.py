@@ -1,8 +1,14 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+import logging
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from efarm.instrumentation import receiver
+from jobs.backends import enqueue
 
 from .models import *
 
+logger = logging.getLogger("poultry_inventory")
+
 
 @receiver(post_save, sender=Flock)
 def create_flock_inventory(sender, instance, created, **kwargs):
@@ -25,47 +31,103 @@ def create_flock_inventory(sender, instance, created, **kwargs):
         )
 
 
+@receiver(pre_save, sender=FlockInspectionRecord)
+def remember_previous_dead_birds(sender, instance, **kwargs):
+    # Keep the stored flock and dead birds of an edited inspection record so that only the change reaches the
+    # flock inventories, and number the version of the record that the change is queued for. The row stays locked
+    # until FlockInspectionRecord.save commits, so overlapping edits read each other's values and versions
+    instance._previous_dead_birds = None
+    if instance.pk:
+        previous = FlockInspectionRecord.objects.select_for_update().filter(pk=instance.pk).values_list(
+            "flock_id", "number_of_dead_birds", "version"
+        ).first()
+        if previous:
+            instance._previous_dead_birds = previous[:2]
+            instance.version = previous[2] + 1
+
+
 @receiver(post_save, sender=FlockInspectionRecord)
-def update_flock_inventory_and_flock(sender, instance, **kwargs):
+def update_flock_inventory_and_flock(sender, instance, created, **kwargs):
     """
-    Signal receiver that updates the FlockInventory instance when a FlockInspectionRecord is created or updated.
-    Additionally, it checks if the number of living birds in the flock inventory reaches zero and updates the is_present
-    field of the corresponding Flock instance accordingly.
+    Signal receiver that queues the update of the FlockInventory instances when a FlockInspectionRecord is
+    created or edited. The `poultry_inventory.apply_flock_inspections` task moves the change in dead birds
+    between the alive and dead counts, and marks a Flock as not present once its inventory has no living birds
+    left.
 
     Parameters:
     - `sender`: The model class that sends the signal.
     - `instance`: The actual instance of FlockInspectionRecord being saved.
+    - `created`: A boolean value indicating if the instance was created or updated.
     - `kwargs`: Additional keyword arguments passed to the receiver.
 
     """
-    # Retrieve the corresponding FlockInventory instance
-    flock_inventory: FlockInventory = FlockInventory.objects.filter(flock=instance.flock).first()
+    dead_birds = defaultdict(int)
+    dead_birds[instance.flock_id] += instance.number_of_dead_birds
+    previous = getattr(instance, "_previous_dead_birds", None)
+    if previous:
+        dead_birds[previous[0]] -= previous[1]
+    enqueue_dead_birds(instance, dead_birds, instance.version)
+
+
+@receiver(post_delete, sender=FlockInspectionRecord)
+def remove_deleted_inspection_from_flock_inventory(sender, instance, **kwargs):
+    enqueue_dead_birds(instance, {instance.flock_id: -instance.number_of_dead_birds}, "deleted")
+
+
+def enqueue_dead_birds(record, dead_birds, version):
+    dead_birds = [[flock_id, count] for flock_id, count in dead_birds.items() if count]
+    if dead_birds:
+        queued = enqueue(
+            "poultry_inventory.apply_flock_inspections",
+            {"flock_inspection_record": record.pk, "dead_birds": dead_birds},
+            key=f"flock-inspection-record:{record.pk}:{version}",
+        )
+        log_rejected_edit(queued, "Flock inspection record", record.pk, version, dead_birds)
+
 
-    # Update the number of living birds and number of dead birds in the FlockInventory
-    flock_inventory.number_of_alive_birds -= instance.number_of_dead_birds
-    flock_inventory.number_of_dead_birds += instance.number_of_dead_birds
-    flock_inventory.save()
+@receiver(pre_save, sender=EggCollection)
+def remember_previous_egg_count(sender, instance, **kwargs):
+    # Keep the stored intact eggs of an edited egg collection so that only the change reaches the egg inventory,
+    # and number the version of the collection that the change is queued for. The row stays locked until
+    # EggCollection.save commits, so overlapping edits read each other's values and versions
+    instance._previous_egg_count = None
+    if instance.pk:
+        previous = EggCollection.objects.select_for_update().filter(pk=instance.pk).values_list(
+            "collected_eggs", "broken_eggs", "version"
+        ).first()
+        if previous:
+            instance._previous_egg_count = previous[0] - previous[1]
+            instance.version = previous[2] + 1
 
-    # Refresh the FlockInventory from the database to get the latest values
-    flock_inventory.refresh_from_db()
 
-    # Check if the number of living birds in the inventory is zero
-    if flock_inventory.number_of_alive_birds == 0:
-        # Retrieve the corresponding Flock instance
-        flock: Flock = flock_inventory.flock
+@receiver(post_save, sender=EggCollection)
+def update_egg_inventory(instance, created, **kwargs):
+    egg_count = instance.collected_eggs - instance.broken_eggs
+    enqueue_egg_count(instance, egg_count - (getattr(instance, "_previous_egg_count", None) or 0), instance.version)
 
-        # Set the is_present field of the Flock instance to False
-        flock.is_present = False
-        flock.save()
 
+@receiver(post_delete, sender=EggCollection)
+def remove_deleted_egg_collection_from_inventory(sender, instance, **kwargs):
+    enqueue_egg_count(instance, -(instance.collected_eggs - instance.broken_eggs), "deleted")
 
-@receiver(post_save, sender=EggCollection)
-def update_egg_inventory(instance, **kwargs):
-    egg_inventory = EggInventory.objects.first()
-    if not egg_inventory:
-        egg_inventory = EggInventory.objects.create()
-    egg_inventory.total_egg_count += (instance.collected_eggs - instance.broken_eggs)
-    egg_inventory.save()
+
+def enqueue_egg_count(collection, egg_count, version):
+    if egg_count:
+        queued = enqueue(
+            "poultry_inventory.add_egg_collections",
+            {"egg_collection": collection.pk, "egg_count": egg_count},
+            key=f"egg-collection:{collection.pk}:{version}",
+        )
+        log_rejected_edit(queued, "Egg collection", collection.pk, version, egg_count)
+
+
+def log_rejected_edit(queued, record_name, pk, version, change):
+    # A deleted record may be deleted again, but every save has a version of its own: a save whose change was
+    # already queued leaves the inventories off by that change
+    if not queued and version != "deleted":
+        logger.error(
+            "%s %s version %s was already queued, so its change %s was dropped", record_name, pk, version, change
+        )
 
 
 @receiver(post_save, sender=EggInventory)
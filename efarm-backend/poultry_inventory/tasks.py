@@ -0,0 +1,41 @@
+from collections import defaultdict
+
+from jobs.registry import task
+from .models import *
+
+
+@task("poultry_inventory.add_egg_collections")
+def add_egg_collections(payloads):
+    """
+    Applies the changes in intact eggs of a batch of added, edited and deleted egg collections to the egg
+    inventory, with a single save and so a single history entry.
+    """
+    egg_inventory = EggInventory.objects.first()
+    if not egg_inventory:
+        egg_inventory = EggInventory.objects.create()
+    egg_inventory.total_egg_count += sum(payload["egg_count"] for payload in payloads)
+    egg_inventory.save()
+
+
+@task("poultry_inventory.apply_flock_inspections")
+def apply_flock_inspections(payloads):
+    """
+    Moves the changes in dead birds of a batch of added, edited and deleted inspection records between the alive
+    and dead counts of their flock inventories, saving each inventory once. Flocks that have no living birds left
+    are marked as not present, and flocks that have living birds again after a correction as present.
+    """
+    dead_birds = defaultdict(int)
+    for payload in payloads:
+        for flock_id, count in payload["dead_birds"]:
+            dead_birds[flock_id] += count
+
+    for flock_inventory in FlockInventory.objects.select_related("flock").filter(flock_id__in=dead_birds):
+        flock_inventory.number_of_alive_birds -= dead_birds[flock_inventory.flock_id]
+        flock_inventory.number_of_dead_birds += dead_birds[flock_inventory.flock_id]
+        flock_inventory.save()
+
+        flock: Flock = flock_inventory.flock
+        is_present = flock_inventory.number_of_alive_birds > 0
+        if flock.is_present != is_present:
+            flock.is_present = is_present
+            flock.save()
@@ -1,9 +1,11 @@
 from rest_framework import viewsets
 
+from efarm.mixins import ConditionalGetMixin, SinceListMixin
+
 from .serializers import *
 
 
-class FlockInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class FlockInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for retrieving FlockInventory instances.
 
@@ -12,11 +14,12 @@ class FlockInventoryViewSet(viewsets.ReadOnlyModelViewSet):
     - `retrieve`: Retrieves a specific flock inventory by its ID.
 
     """
-    queryset = FlockInventory.objects.all()
+    queryset = FlockInventory.objects.select_related("flock")
     serializer_class = FlockInventorySerializer
+    last_modified_field = "last_update"
 
 
-class FlockInventoryHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class FlockInventoryHistoryViewSet(ConditionalGetMixin, SinceListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for retrieving FlockInventoryHistory instances.
 
@@ -0,0 +1,62 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(settings, tmp_path):
+    # Every test gets a cache of its own: cached dashboard responses would otherwise outlive the rolled back data
+    # they were computed from, and the cache of one run would be read by the next
+    settings.CACHES = {
+        **settings.CACHES,
+        "default": {**settings.CACHES["default"], "LOCATION": str(tmp_path / "cache")},
+    }
+
+
+@pytest.fixture
+def assert_uses_index():
+    """
+    Fixture returning a helper that asserts the database plans a queryset through the given index.
+
+    Sequential scans are disabled on PostgreSQL so that the planner does not skip the index on the tiny
+    test tables.
+    """
+    from django.db import connection
+
+    def _assert_uses_index(queryset, index_name):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET enable_seqscan = off")
+            plan = queryset.explain()
+            if connection.vendor == "postgresql":
+                cursor.execute("RESET enable_seqscan")
+        assert index_name in plan, plan
+
+    return _assert_uses_index
+
+
+@pytest.fixture
+def unique_index_name():
+    """
+    Fixture returning a helper that returns the name of the index behind the unique constraint of a model field.
+
+    Django's SQLite introspection leaves out the indexes SQLite creates for UNIQUE constraints, so they are read
+    from the index pragmas there.
+    """
+    from django.db import connection
+
+    def _unique_index_name(model, field_name):
+        table = model._meta.db_table
+        column = model._meta.get_field(field_name).column
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"PRAGMA index_list({connection.ops.quote_name(table)})")
+                for name in [row[1] for row in cursor.fetchall() if row[2]]:
+                    cursor.execute(f"PRAGMA index_info({connection.ops.quote_name(name)})")
+                    if [row[2] for row in cursor.fetchall()] == [column]:
+                        return name
+            else:
+                for name, constraint in connection.introspection.get_constraints(cursor, table).items():
+                    if constraint["unique"] and constraint["index"] and constraint["columns"] == [column]:
+                        return name
+        raise AssertionError(f"{table}.{column} has no unique index")
+
+    return _unique_index_name
@@ -191,7 +191,7 @@ def setup_cows():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=370),
+        "date_of_birth": todays_date() - timedelta(days=370),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -232,7 +232,7 @@ def setup_insemination_data():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=366),
+        "date_of_birth": todays_date() - timedelta(days=366),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -263,7 +263,7 @@ def setup_pregnancy_data():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=650),
+        "date_of_birth": todays_date() - timedelta(days=650),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -275,7 +275,7 @@ def setup_pregnancy_data():
     assert serializer.is_valid()
     cow = serializer.save()
 
-    pregnancy_data = {"cow": cow.id, "start_date": todays_date - timedelta(days=270)}
+    pregnancy_data = {"cow": cow.id, "start_date": todays_date() - timedelta(days=270)}
     return pregnancy_data
 
 
@@ -285,7 +285,7 @@ def setup_pregnancy_to_lactation_data():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=735),
+        "date_of_birth": todays_date() - timedelta(days=735),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -299,8 +299,8 @@ def setup_pregnancy_to_lactation_data():
 
     pregnancy_to_lactation_data = {
         "cow": cow.id,
-        "start_date": todays_date - timedelta(days=370),
-        "date_of_calving": todays_date - timedelta(days=100),
+        "start_date": todays_date() - timedelta(days=370),
+        "date_of_calving": todays_date() - timedelta(days=100),
         "pregnancy_outcome": PregnancyOutcomeChoices.LIVE,
         "pregnancy_status": PregnancyStatusChoices.CONFIRMED,
     }
@@ -313,7 +313,7 @@ def setup_weight_record_data():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=650),
+        "date_of_birth": todays_date() - timedelta(days=650),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -335,7 +335,7 @@ def setup_culling_record_data():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=650),
+        "date_of_birth": todays_date() - timedelta(days=650),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -360,7 +360,7 @@ def setup_quarantine_record_data():
     general_cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=650),
+        "date_of_birth": todays_date() - timedelta(days=650),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -444,7 +444,7 @@ def setup_cow_in_pen_movement_data():
     cow = {
         "name": "General Cow",
         "breed": {"name": CowBreedChoices.AYRSHIRE},
-        "date_of_birth": todays_date - timedelta(days=370),
+        "date_of_birth": todays_date() - timedelta(days=370),
         "gender": SexChoices.FEMALE,
         "availability_status": CowAvailabilityChoices.ALIVE,
         "current_pregnancy_status": CowPregnancyChoices.OPEN,
@@ -464,3 +464,73 @@ def setup_cow_in_pen_movement_data():
 
     return {"cow_in_pen_movement_data": cow_in_pen_movement_data,
             "cow_pen_2": cow_pen_2}
+
+
+@pytest.fixture
+@pytest.mark.django_db
+def setup_milk_data():
+    lactating_cows = []
+    for name in ["Lactating Cow", "Another Lactating Cow"]:
+        general_cow = {
+            "name": name,
+            "breed": {"name": CowBreedChoices.AYRSHIRE},
+            "date_of_birth": todays_date() - timedelta(days=735),
+            "gender": SexChoices.FEMALE,
+            "availability_status": CowAvailabilityChoices.ALIVE,
+            "current_pregnancy_status": CowPregnancyChoices.OPEN,
+            "category": CowCategoryChoices.HEIFER,
+            "current_production_status": CowProductionStatusChoices.OPEN,
+        }
+        serializer = CowSerializer(data=general_cow)
+        assert serializer.is_valid()
+        cow = serializer.save()
+        Lactation.objects.create(cow=cow, start_date=todays_date() - timedelta(days=100))
+        lactating_cows.append(cow)
+
+    heifer = {
+        "name": "Young Heifer",
+        "breed": {"name": CowBreedChoices.AYRSHIRE},
+        "date_of_birth": todays_date() - timedelta(days=370),
+        "gender": SexChoices.FEMALE,
+        "availability_status": CowAvailabilityChoices.ALIVE,
+        "current_pregnancy_status": CowPregnancyChoices.OPEN,
+        "category": CowCategoryChoices.HEIFER,
+        "current_production_status": CowProductionStatusChoices.OPEN,
+    }
+    serializer = CowSerializer(data=heifer)
+    assert serializer.is_valid()
+    heifer = serializer.save()
+
+    return {"lactating_cows": lactating_cows, "heifer": heifer}
+
+
+@pytest.fixture
+@pytest.mark.django_db
+def setup_pedigree_data():
+    """
+    Fixture creating a small pedigree where Eva is bred from the full siblings Duke and Cleo.
+    """
+    breed = CowBreed.objects.create(name=CowBreedChoices.FRIESIAN)
+
+    def create_cow(name, age, gender, sire=None, dam=None):
+        is_male = gender == SexChoices.MALE
+        return Cow.objects.create(
+            name=name,
+            breed=breed,
+            date_of_birth=todays_date() - timedelta(days=age),
+            gender=gender,
+            category=CowCategoryChoices.BULL if is_male else CowCategoryChoices.HEIFER,
+            current_production_status=CowProductionStatusChoices.MATURE_BULL
+            if is_male
+            else CowProductionStatusChoices.OPEN,
+            sire=sire,
+            dam=dam,
+        )
+
+    alpha = create_cow("Alpha", 2500, SexChoices.MALE)
+    bella = create_cow("Bella", 2500, SexChoices.FEMALE)
+    cleo = create_cow("Cleo", 1500, SexChoices.FEMALE, sire=alpha, dam=bella)
+    duke = create_cow("Duke", 1500, SexChoices.MALE, sire=alpha, dam=bella)
+    eva = create_cow("Eva", 400, SexChoices.FEMALE, sire=duke, dam=cleo)
+
+    return {"alpha": alpha, "bella": bella, "cleo": cleo, "duke": duke, "eva": eva}
@@ -1,5 +1,9 @@
+import sqlite3
+
 import pytest
+from django.db import connection, connections
 
+from dairy.filters import TagNumberFilter
 from dairy.serializers import *
 
 
@@ -22,3 +26,210 @@ class TestCowBreedModel:
         with pytest.raises(ValidationError) as context:
             cow_breed.save()
         assert f"Invalid cow breed: '{cow_breed.name}'." in context.value
+
+
+@pytest.mark.django_db
+class TestHotQueryPlans:
+    def test_milk_records_of_a_cow_by_time_use_index(self, assert_uses_index):
+        now = timezone.now()
+        assert_uses_index(
+            Milk.objects.filter(cow_id=1, milking_date__range=(now - timedelta(days=7), now)),
+            "milk_cow_milking_date_idx",
+        )
+
+    def test_latest_lactation_of_a_cow_uses_index(self, assert_uses_index):
+        assert_uses_index(
+            Lactation.objects.filter(cow_id=1).order_by("-start_date")[:1],
+            "lactation_cow_start_date_idx",
+        )
+
+    def test_open_lactation_of_a_cow_uses_partial_index(self, assert_uses_index):
+        assert_uses_index(
+            Lactation.objects.filter(cow_id=1, end_date__isnull=True),
+            "lactation_open_per_cow_idx",
+        )
+
+    def test_heat_records_of_a_cow_by_time_use_index(self, assert_uses_index):
+        assert_uses_index(
+            Heat.objects.filter(cow_id=1, observation_time__gte=timezone.now() - timedelta(days=21)),
+            "heat_cow_observation_idx",
+        )
+
+    def test_inseminations_of_a_cow_by_date_use_index(self, assert_uses_index):
+        assert_uses_index(
+            Insemination.objects.filter(
+                cow_id=1, date_of_insemination__gte=timezone.now() - timedelta(days=21)
+            ),
+            "insemination_cow_date_idx",
+        )
+
+    def test_alive_cows_by_gender_use_partial_index(self, assert_uses_index):
+        assert_uses_index(
+            Cow.objects.filter(availability_status="Alive", gender=SexChoices.FEMALE),
+            "cow_alive_gender_idx",
+        )
+
+    def test_cows_by_tag_number_prefix_use_unique_index(self, assert_uses_index, unique_index_name):
+        queryset = TagNumberFilter(field_name="tag_number").filter(Cow.objects.all(), "ay-2023")
+        assert_uses_index(queryset, unique_index_name(Cow, "tag_number"))
+
+
+@pytest.mark.django_db
+class TestSQLiteConnections:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        if connection.vendor != "sqlite":
+            pytest.skip("The pragmas and transaction mode only apply to SQLite.")
+        self.path = tmp_path / "farm.sqlite3"
+        # A file database, as the in-memory test database has no write-ahead log
+        database_wrapper = type(connections["default"])
+        self.connection = database_wrapper({**connection.settings_dict, "NAME": str(self.path)}, alias="farm")
+        yield
+        self.connection.close()
+
+    def test_new_connections_use_the_configured_pragmas(self):
+        with self.connection.cursor() as cursor:
+            pragmas = {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ["journal_mode", "synchronous", "busy_timeout", "mmap_size"]
+            }
+        assert pragmas == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "mmap_size": 268435456}
+
+    def test_transactions_take_the_write_lock_when_they_begin(self):
+        self.connection.ensure_connection()
+        self.connection._start_transaction_under_autocommit()
+
+        other_connection = sqlite3.connect(self.path, timeout=0)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="database is locked"):
+                other_connection.execute("CREATE TABLE farm (id INTEGER)")
+        finally:
+            other_connection.close()
+
+
+@pytest.mark.django_db
+class TestCowAncestry:
+    def test_closure_rows_count_every_path(self, setup_pedigree_data):
+        eva = setup_pedigree_data["eva"]
+        rows = set(
+            CowAncestry.objects.filter(descendant=eva).values_list("ancestor__name", "depth", "paths")
+        )
+        assert rows == {
+            ("Eva", 0, 1),
+            ("Duke", 1, 1),
+            ("Cleo", 1, 1),
+            ("Alpha", 2, 2),
+            ("Bella", 2, 2),
+        }
+
+    def test_inbreeding_coefficient_of_full_sibling_mating(self, setup_pedigree_data):
+        eva = setup_pedigree_data["eva"]
+        eva.refresh_from_db()
+        assert eva.inbreeding_coefficient == pytest.approx(0.25)
+        setup_pedigree_data["cleo"].refresh_from_db()
+        assert setup_pedigree_data["cleo"].inbreeding_coefficient == 0
+
+    def test_inbreeding_of_a_planned_mating(self, setup_pedigree_data):
+        # Duke mated with his inbred daughter Eva
+        inbreeding, contributions = CowAncestry.objects.get_inbreeding(
+            setup_pedigree_data["duke"].id, setup_pedigree_data["eva"].id
+        )
+        assert inbreeding == pytest.approx(0.375)
+        assert set(contributions) == {
+            setup_pedigree_data[name].id for name in ("alpha", "bella", "duke")
+        }
+
+    def test_changing_a_parent_rebuilds_the_ancestry(self, setup_pedigree_data):
+        eva = setup_pedigree_data["eva"]
+        eva.sire = None
+        eva.save()
+
+        eva.refresh_from_db()
+        assert eva.inbreeding_coefficient == 0
+        assert set(CowAncestry.objects.filter(descendant=eva).values_list("ancestor__name", "paths")) == {
+            ("Eva", 1),
+            ("Cleo", 1),
+            ("Alpha", 1),
+            ("Bella", 1),
+        }
+
+    def test_deleting_a_parent_rebuilds_the_offspring_ancestry(self, setup_pedigree_data):
+        setup_pedigree_data["duke"].delete()
+
+        eva = setup_pedigree_data["eva"]
+        eva.refresh_from_db()
+        assert eva.inbreeding_coefficient == 0
+        assert not CowAncestry.objects.filter(descendant=eva, paths__gt=1).exists()
+
+    def test_cow_cannot_descend_from_itself(self, setup_pedigree_data):
+        alpha = setup_pedigree_data["alpha"]
+        alpha.dam = setup_pedigree_data["eva"]
+        with pytest.raises(ValidationError) as context:
+            alpha.save()
+        assert "A cow cannot be the parent of itself or of its ancestors." in context.value
+
+
+@pytest.mark.django_db
+class TestBreedingEvents:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_milk_data):
+        self.cow, self.other_cow = setup_milk_data["lactating_cows"]
+        self.lactation = self.cow.lactations.get()
+
+    def get_events(self, cow):
+        return {
+            event_type: due_date
+            for event_type, due_date in BreedingEvent.objects.filter(cow=cow).values_list("event_type", "due_date")
+        }
+
+    def test_lactating_cow_is_scheduled_for_heat_check_and_dry_off(self):
+        assert self.get_events(self.cow) == {
+            BreedingEventTypeChoices.HEAT_CHECK: self.lactation.start_date + timedelta(days=60),
+            BreedingEventTypeChoices.DRY_OFF: self.lactation.start_date + timedelta(days=275),
+        }
+
+    def test_observed_heat_moves_the_heat_check(self):
+        observation_time = timezone.now() - timedelta(days=3)
+        Heat.objects.create(cow=self.cow, observation_time=observation_time)
+
+        heat_check = BreedingEvent.objects.get(cow=self.cow, event_type=BreedingEventTypeChoices.HEAT_CHECK)
+        assert heat_check.due_date == timezone.localdate(observation_time) + timedelta(days=21)
+        assert heat_check.heat is not None
+
+    def test_pregnancy_replaces_the_heat_check(self):
+        start_date = todays_date() - timedelta(days=30)
+        pregnancy = Pregnancy.objects.create(cow=self.cow, start_date=start_date)
+
+        assert self.get_events(self.cow) == {
+            BreedingEventTypeChoices.PREGNANCY_CHECK: start_date + timedelta(days=21),
+            BreedingEventTypeChoices.CALVING: start_date + timedelta(days=285),
+            BreedingEventTypeChoices.DRY_OFF: self.lactation.start_date + timedelta(days=275),
+        }
+
+        pregnancy.pregnancy_status = PregnancyStatusChoices.CONFIRMED
+        pregnancy.save()
+        assert BreedingEventTypeChoices.PREGNANCY_CHECK not in self.get_events(self.cow)
+
+        pregnancy.delete()
+        assert BreedingEventTypeChoices.HEAT_CHECK in self.get_events(self.cow)
+
+    def test_unchanged_events_keep_their_ids(self):
+        dry_off = BreedingEvent.objects.get(cow=self.cow, event_type=BreedingEventTypeChoices.DRY_OFF)
+        Heat.objects.create(cow=self.cow, observation_time=timezone.now() - timedelta(days=3))
+        assert BreedingEvent.objects.filter(id=dry_off.id).exists()
+
+    def test_cows_that_are_not_alive_have_no_events(self):
+        self.cow.availability_status = CowAvailabilityChoices.DEAD
+        self.cow.date_of_death = todays_date()
+        self.cow.current_pregnancy_status = CowPregnancyChoices.UNAVAILABLE
+        self.cow.save()
+
+        assert not BreedingEvent.objects.filter(cow=self.cow).exists()
+        assert BreedingEvent.objects.filter(cow=self.other_cow).exists()
+
+    def test_refresh_rebuilds_the_whole_herd(self):
+        expected = set(BreedingEvent.objects.values_list(*BreedingEvent.objects.key_fields))
+        BreedingEvent.objects.all().delete()
+
+        BreedingEvent.objects.refresh()
+        assert set(BreedingEvent.objects.values_list(*BreedingEvent.objects.key_fields)) == expected
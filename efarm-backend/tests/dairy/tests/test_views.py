@@ -1,7 +1,36 @@
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+import pyarrow.parquet as pq
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.test import APIClient
 
 from dairy.views import *
+from dairy_inventory.models import (
+    BarnInventory,
+    CowInventory,
+    CowInventoryUpdateHistory,
+    CowPenInventory,
+    MilkInventory,
+    MilkInventoryUpdateHistory,
+)
+from efarm.async_views import gather_queries
+from efarm.clock import as_of
+from jobs.choices import JobStatusChoices
+from jobs.models import Job
+from jobs.worker import run_batch
 
 
 @pytest.mark.django_db
@@ -421,6 +450,23 @@ class TestCowViewSet:
         response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
         assert response.status_code == status.HTTP_200_OK
 
+    def test_filter_cows_by_tag_number(self):
+        serializer = CowSerializer(data=self.general_cow)
+        assert serializer.is_valid()
+        cow = serializer.save()
+        assert Cow.objects.get(pk=cow.pk).tag_number == cow.tag_number
+        url = reverse('dairy:cows-list')
+        response = self.client.get(url + f"?tag_number={cow.tag_number.lower()}",
+                                   HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_200_OK
+        assert [cow_data['id'] for cow_data in response.data] == [cow.pk]
+        response = self.client.get(url + f"?tag_number={cow.tag_number[:7]}",
+                                   HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_200_OK
+        assert [cow_data['id'] for cow_data in response.data] == [cow.pk]
+        response = self.client.get(url + "?tag_number=XX-", HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_ordering_cows_by_date_of_birth(self):
         serializer = CowSerializer(data=self.general_cow)
         assert serializer.is_valid()
@@ -448,6 +494,317 @@ class TestCowViewSet:
         response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
         assert response.status_code == status.HTTP_200_OK
 
+    def test_list_cows_runs_constant_number_of_queries(self):
+        """
+        Test that listing cows runs the same number of queries regardless of the herd size.
+        """
+        serializer = CowSerializer(data=self.general_cow)
+        assert serializer.is_valid()
+        serializer.save()
+        url = reverse('dairy:cows-list')
+        with CaptureQueriesContext(connection) as single_cow_queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_200_OK
+
+        for _ in range(3):
+            serializer = CowSerializer(data=self.general_cow)
+            assert serializer.is_valid()
+            serializer.save()
+        with CaptureQueriesContext(connection) as herd_queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 4
+        assert len(herd_queries) == len(single_cow_queries)
+
+        for cow_data in response.data:
+            cow = Cow.objects.get(pk=cow_data['id'])
+            assert cow_data['tag_number'] == cow.tag_number
+            assert cow_data['age'] == cow.age
+            assert cow_data['age_in_farm'] == cow.age_in_farm
+            assert cow_data['parity'] == cow.parity
+
+    def test_list_cows_as_of_a_past_date(self):
+        """
+        Test that ages are reported as of the date requested with the as_of query parameter.
+        """
+        serializer = CowSerializer(data=self.general_cow)
+        assert serializer.is_valid()
+        cow = serializer.save()
+        as_of_date = todays_date() - timedelta(days=30)
+
+        response = self.client.get(reverse('dairy:cows-list'), {'as_of': as_of_date.isoformat()},
+                                   HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['age'] == cow.age - 30
+
+        with as_of(as_of_date):
+            assert cow.age == response.data[0]['age']
+
+    def test_list_cows_with_invalid_as_of_date(self):
+        """
+        Test that an invalid as_of date is rejected.
+        """
+        response = self.client.get(reverse('dairy:cows-list'), {'as_of': '2026-02-30'},
+                                   HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cow_inventory_follows_cow_changes(self):
+        """
+        Test that the cow inventory counters follow added, edited and deleted cows, with history rows only
+        when the herd size changes.
+        """
+        cows = []
+        for _ in range(2):
+            serializer = CowSerializer(data=self.general_cow)
+            assert serializer.is_valid()
+            cows.append(serializer.save())
+
+        cow_inventory = CowInventory.objects.get()
+        assert cow_inventory.total_number_of_cows == 2
+        assert cow_inventory.number_of_female_cows == 2
+        assert CowInventoryUpdateHistory.objects.count() == 2
+
+        cows[0].save()
+        assert CowInventoryUpdateHistory.objects.count() == 2
+
+        cows[0].availability_status = CowAvailabilityChoices.SOLD
+        cows[0].save()
+        cow_inventory.refresh_from_db()
+        assert cow_inventory.total_number_of_cows == 1
+        assert cow_inventory.number_of_female_cows == 1
+        assert cow_inventory.number_of_sold_cows == 1
+        assert CowInventoryUpdateHistory.objects.count() == 3
+
+        cows[1].delete()
+        cow_inventory.refresh_from_db()
+        assert cow_inventory.total_number_of_cows == 0
+        assert cow_inventory.number_of_female_cows == 0
+        assert cow_inventory.number_of_sold_cows == 1
+
+    def test_recompute_cow_inventory(self):
+        """
+        Test recomputing a drifted cow inventory with one grouped count.
+        """
+        serializer = CowSerializer(data=self.general_cow)
+        assert serializer.is_valid()
+        serializer.save()
+        CowInventory.objects.update(total_number_of_cows=5, number_of_female_cows=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert CowInventory.objects.recompute()
+        cow_inventory = CowInventory.objects.get()
+        assert cow_inventory.total_number_of_cows == 1
+        assert cow_inventory.number_of_female_cows == 1
+        assert not CowInventory.objects.recompute()
+        assert len([query for query in queries if 'dairy_cow' in query['sql']]) == 1
+
+
+@pytest.mark.django_db
+class TestHerdImport:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users):
+        self.client = setup_users['client']
+
+        self.farm_owner_token = setup_users['farm_owner_token']
+        self.farm_worker_token = setup_users['farm_worker_token']
+
+        today = todays_date()
+        header = (
+            "reference,name,breed,date_of_birth,gender,category,current_production_status,"
+            "current_pregnancy_status,is_bought,sire,dam,lactation_start_date\n"
+        )
+        self.register = header + "".join(
+            [
+                f"DA,Amara,Friesian,{today - timedelta(days=1095)},Female,Milking Cow,Open,Open,no,,,"
+                f"{today - timedelta(days=100)}\n",
+                f"SB,Bruno,Jersey,{today - timedelta(days=800)},Male,Bull,Mature Bull,,no,,,\n",
+                f"CC,Cleo,Friesian,{today - timedelta(days=30)},Female,Calf,Calf,,no,SB,DA,\n",
+                f"DD,Dotnine9,Friesian,{today - timedelta(days=30)},Female,Calf,Calf,,no,,,\n",
+                f"EE,Ember,Friesian,{today - timedelta(days=30)},Female,Calf,Calf,,no,,XX,\n",
+            ]
+        )
+
+    def upload(self, register, token, **data):
+        return self.client.post(
+            reverse('dairy:cows-import-register'),
+            {'file': SimpleUploadedFile('herd.csv', register.encode()), **data},
+            format='multipart',
+            HTTP_AUTHORIZATION=f'Token {token}',
+        )
+
+    def test_import_herd(self):
+        response = self.upload(self.register, self.farm_owner_token)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 3
+        assert [rejection['row'] for rejection in response.data['rejected']] == [5, 6]
+        assert 'non_field_errors' in response.data['rejected'][0]['errors']
+        assert 'dam' in response.data['rejected'][1]['errors']
+
+        calf = Cow.objects.get(name='Cleo')
+        assert calf.dam.name == 'Amara'
+        assert calf.sire.name == 'Bruno'
+        assert calf.tag_number == Cow.manager.get_tag_number(calf)
+        assert Lactation.objects.get().cow.name == 'Amara'
+
+        cow_inventory = CowInventory.objects.get()
+        assert cow_inventory.total_number_of_cows == 3
+        assert cow_inventory.number_of_male_cows == 1
+        assert cow_inventory.number_of_female_cows == 2
+
+    def test_import_herd_from_xlsx(self):
+        workbook = Workbook()
+        for line in self.register.splitlines():
+            workbook.active.append(
+                [date.fromisoformat(value) if value[:2] == "20" else value for value in line.split(",")]
+            )
+        file = BytesIO()
+        workbook.save(file)
+
+        response = self.client.post(
+            reverse('dairy:cows-import-register'),
+            {'file': SimpleUploadedFile('herd.xlsx', file.getvalue())},
+            format='multipart',
+            HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}',
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 3
+        assert [rejection['row'] for rejection in response.data['rejected']] == [5, 6]
+        assert Cow.objects.get(name='Cleo').dam.name == 'Amara'
+        assert Lactation.objects.get().start_date == todays_date() - timedelta(days=100)
+
+    def test_import_herd_queries_do_not_grow_with_rows(self, django_assert_max_num_queries):
+        today = todays_date()
+        register = "name,breed,date_of_birth,gender,category,current_production_status\n" + "".join(
+            f"Calf {chr(ord('a') + index % 26)}{chr(ord('a') + index // 26)},Friesian,"
+            f"{today - timedelta(days=10)},Female,Calf,Calf\n"
+            for index in range(100)
+        )
+        with django_assert_max_num_queries(25):
+            response = self.upload(register, self.farm_owner_token)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 100
+        assert CowInventory.objects.get().total_number_of_cows == 100
+
+    def test_import_herd_dry_run_saves_nothing(self):
+        response = self.upload(self.register, self.farm_owner_token, dry_run='true')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 3
+        assert not Cow.objects.exists()
+
+    def test_import_herd_without_file(self):
+        response = self.client.post(
+            reverse('dairy:cows-import-register'),
+            {},
+            format='multipart',
+            HTTP_AUTHORIZATION=f'Token {self.farm_owner_token}',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_import_herd_permission_denied(self):
+        response = self.upload(self.register, self.farm_worker_token)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Cow.objects.exists()
+
+    def test_import_herd_command_writes_rejected_rows(self, tmp_path):
+        register_path = tmp_path / 'herd.csv'
+        register_path.write_text(self.register)
+
+        out = StringIO()
+        call_command('import_herd', str(register_path), stdout=out)
+
+        assert 'Imported 3 cows' in out.getvalue()
+        assert Cow.objects.count() == 3
+        report = (tmp_path / 'herd.csv.rejected.csv').read_text().splitlines()
+        assert report[0].startswith('row,errors,reference,name')
+        assert len(report) == 3
+
+
+@pytest.mark.django_db
+class TestCowPedigree:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_pedigree_data):
+        self.client = setup_users["client"]
+
+        self.farm_manager_token = setup_users["farm_manager_token"]
+        self.regular_user_token = setup_users["regular_user_token"]
+
+        self.cows = setup_pedigree_data
+
+    def get(self, url, token=None, **params):
+        return self.client.get(
+            url, params, HTTP_AUTHORIZATION=f"Token {token or self.farm_manager_token}"
+        )
+
+    def test_pedigree_tree(self, django_assert_max_num_queries):
+        url = reverse("dairy:cows-pedigree", kwargs={"pk": self.cows["eva"].id})
+        with django_assert_max_num_queries(4):
+            response = self.get(url, generations=2)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["name"] == "Eva"
+        assert response.data["sire"]["name"] == "Duke"
+        assert response.data["dam"]["name"] == "Cleo"
+        assert response.data["sire"]["sire"]["name"] == "Alpha"
+        assert response.data["dam"]["dam"]["name"] == "Bella"
+        # Founders have unknown parents, and the tree stops after the requested generations
+        assert "sire" not in response.data["sire"]["sire"]
+
+        response = self.get(reverse("dairy:cows-pedigree", kwargs={"pk": self.cows["alpha"].id}))
+        assert response.data["sire"] is None
+        assert response.data["dam"] is None
+
+    def test_pedigree_with_invalid_generations(self):
+        url = reverse("dairy:cows-pedigree", kwargs={"pk": self.cows["eva"].id})
+        for generations in ("0", "11", "many"):
+            response = self.get(url, generations=generations)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_descendants(self):
+        response = self.get(reverse("dairy:cows-descendants", kwargs={"pk": self.cows["alpha"].id}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [(cow["name"], cow["generation"]) for cow in response.data] == [
+            ("Cleo", 1),
+            ("Duke", 1),
+            ("Eva", 2),
+        ]
+
+    def test_inbreeding_of_a_planned_mating(self):
+        response = self.get(
+            reverse("dairy:cows-inbreeding"), sire=self.cows["duke"].id, dam=self.cows["eva"].id
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["inbreeding_coefficient"] == pytest.approx(0.375)
+        assert {ancestor["cow"] for ancestor in response.data["common_ancestors"]} == {
+            self.cows["alpha"].id,
+            self.cows["bella"].id,
+            self.cows["duke"].id,
+        }
+
+        response = self.get(
+            reverse("dairy:cows-inbreeding"), sire=self.cows["alpha"].id, dam=self.cows["bella"].id
+        )
+        assert response.data["inbreeding_coefficient"] == 0
+        assert response.data["common_ancestors"] == []
+
+    def test_inbreeding_with_invalid_parents(self):
+        url = reverse("dairy:cows-inbreeding")
+        assert self.get(url, sire=self.cows["duke"].id).status_code == status.HTTP_400_BAD_REQUEST
+        response = self.get(url, sire=self.cows["cleo"].id, dam=self.cows["eva"].id)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = self.get(url, sire=self.cows["duke"].id, dam=999999)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_pedigree_as_regular_user_permission_denied(self):
+        url = reverse("dairy:cows-pedigree", kwargs={"pk": self.cows["eva"].id})
+        response = self.get(url, token=self.regular_user_token)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
 
 @pytest.mark.django_db
 class TestCowBreedViewSet:
@@ -1569,7 +1926,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=100)
+            "pregnancy_failed_date": todays_date() - timedelta(days=100)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json",
@@ -1588,7 +1945,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=100)
+            "pregnancy_failed_date": todays_date() - timedelta(days=100)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json",
@@ -1607,7 +1964,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=102)
+            "pregnancy_failed_date": todays_date() - timedelta(days=102)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json",
@@ -1626,7 +1983,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=100)
+            "pregnancy_failed_date": todays_date() - timedelta(days=100)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json",
@@ -1643,7 +2000,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=100)
+            "pregnancy_failed_date": todays_date() - timedelta(days=100)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json",
@@ -1660,7 +2017,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=100)
+            "pregnancy_failed_date": todays_date() - timedelta(days=100)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json",
@@ -1677,7 +2034,7 @@ class TestPregnancyViewSet:
         update_data = {
             "pregnancy_status": PregnancyStatusChoices.FAILED,
             "pregnancy_notes": "Updated pregnancy status as failed",
-            "pregnancy_failed_date": todays_date - timedelta(days=100)
+            "pregnancy_failed_date": todays_date() - timedelta(days=100)
         }
         response = self.client.patch(reverse("dairy:pregnancy-records-detail", kwargs={"pk": pregnancy.id}),
                                      data=update_data, format="json")
@@ -2168,6 +2525,702 @@ class TestInseminationViewSet:
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+@pytest.mark.django_db
+class TestMilkViewSet:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_milk_data):
+        self.client = setup_users["client"]
+
+        self.farm_manager_token = setup_users["farm_manager_token"]
+        self.farm_worker_token = setup_users["farm_worker_token"]
+        self.regular_user_token = setup_users["regular_user_token"]
+
+        self.lactating_cows = setup_milk_data["lactating_cows"]
+        self.heifer = setup_milk_data["heifer"]
+
+    def test_bulk_add_milk_records_as_farm_worker(
+        self, django_capture_on_commit_callbacks
+    ):
+        """
+        Test recording a milking session in bulk, keeping the valid entries and reporting the rejected ones.
+        """
+        first_cow, second_cow = self.lactating_cows
+        entries = [
+            {"cow": first_cow.id, "amount_in_kgs": "12.50"},
+            {"cow": second_cow.id, "amount_in_kgs": "10.25"},
+            {"cow": self.heifer.id, "amount_in_kgs": "8.00"},
+            {"cow": 999999, "amount_in_kgs": "8.00"},
+            {"cow": first_cow.id, "amount_in_kgs": "50.00"},
+            {"cow": second_cow.id},
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(
+                reverse("dairy:milk-records-bulk"),
+                data=entries,
+                format="json",
+                HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["created"]) == 2
+        assert [error["index"] for error in response.data["errors"]] == [2, 3, 4, 5]
+        assert "amount_in_kgs" in response.data["errors"][3]["errors"]
+
+        assert Milk.objects.count() == 2
+        assert all(milk.lactation is not None for milk in Milk.objects.all())
+        assert MilkInventory.objects.get(id=1).total_amount_in_kgs == Decimal("22.75")
+        assert MilkInventoryUpdateHistory.objects.count() == 1
+
+    def test_milk_inventory_follows_created_updated_and_deleted_records(
+        self, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that only the change in amount reaches the milk inventory when a milk record is added, edited or
+        removed.
+        """
+        first_cow = self.lactating_cows[0]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(
+                reverse("dairy:milk-records-list"),
+                data={"cow": first_cow.id, "amount_in_kgs": "12.50"},
+                format="json",
+                HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert MilkInventory.objects.get(id=1).total_amount_in_kgs == Decimal("12.50")
+
+        milk_id = response.data["id"]
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.patch(
+                reverse("dairy:milk-records-detail", kwargs={"pk": milk_id}),
+                data={"amount_in_kgs": "10.00"},
+                format="json",
+                HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert MilkInventory.objects.get(id=1).total_amount_in_kgs == Decimal("10.00")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.delete(
+                reverse("dairy:milk-records-detail", kwargs={"pk": milk_id}),
+                HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+            )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert MilkInventory.objects.get(id=1).total_amount_in_kgs == Decimal("0.00")
+
+    def test_milk_inventory_is_updated_only_after_commit(self):
+        """
+        Test that the milk inventory is left untouched until the milk record is committed.
+        """
+        first_cow = self.lactating_cows[0]
+        Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        assert not MilkInventory.objects.exists()
+
+    def test_daily_milk_production_follows_milk_records(self):
+        """
+        Test that the daily milk production rollup follows added, bulk-added, edited and deleted milk records.
+        """
+        first_cow, second_cow = self.lactating_cows
+        first_milk = Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        Milk.manager.bulk_record(
+            [
+                (0, {"cow": first_cow.id, "amount_in_kgs": Decimal("8.00")}),
+                (1, {"cow": second_cow.id, "amount_in_kgs": Decimal("10.25")}),
+            ]
+        )
+
+        production = DailyMilkProduction.objects.get(cow=first_cow)
+        assert production.date == timezone.localdate()
+        assert production.total_amount_in_kgs == Decimal("20.50")
+        assert production.number_of_milkings == 2
+        assert production.first_milking_time == first_milk.milking_date
+
+        first_milk.amount_in_kgs = Decimal("10.00")
+        with CaptureQueriesContext(connection) as queries:
+            first_milk.save()
+        previous_record_reads = [
+            query for query in queries
+            if query["sql"].startswith('SELECT "dairy_milk"."amount_in_kgs", "dairy_milk"."cow_id"')
+        ]
+        assert len(previous_record_reads) == 1
+        production.refresh_from_db()
+        assert production.total_amount_in_kgs == Decimal("18.00")
+
+        first_milk.delete()
+        production.refresh_from_db()
+        assert production.total_amount_in_kgs == Decimal("8.00")
+        assert production.number_of_milkings == 1
+
+        Milk.objects.filter(cow=second_cow).get().delete()
+        assert not DailyMilkProduction.objects.filter(cow=second_cow).exists()
+
+    def test_milk_dashboards_read_daily_milk_production(self):
+        """
+        Test that the milk dashboards report the daily milk production with a single query each.
+        """
+        first_cow, second_cow = self.lactating_cows
+        Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        Milk.objects.create(cow=second_cow, amount_in_kgs=Decimal("10.25"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/dairy/admin/dashboard/daily-milk-production")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_milk_today"] == Decimal("22.75")
+        assert response.data["total_milk_yesterday"] == 0
+        assert len(queries) == 1
+
+        response = self.client.get("/dairy/admin/dashboard/weekly-milk-chart-data")
+        assert response.status_code == status.HTTP_200_OK
+        today = timezone.localdate().strftime("%A")
+        assert response.data == [
+            {
+                "day": today,
+                "milk_records": [{"day": today, "total_milk": Decimal("22.75")}],
+            }
+        ]
+
+        response = self.client.get("/dairy/admin/dashboard/milked-cows")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["cows_milked_today"] == 2
+
+    def test_reconcile_milk_inventory(self):
+        """
+        Test recomputing a drifted milk inventory from the milk records.
+        """
+        first_cow, second_cow = self.lactating_cows
+        Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        Milk.objects.create(cow=second_cow, amount_in_kgs=Decimal("10.25"))
+        MilkInventory.objects.create(id=1, total_amount_in_kgs=Decimal("3.00"))
+
+        call_command("reconcile_milk_inventory", stdout=StringIO())
+
+        assert MilkInventory.objects.get(id=1).total_amount_in_kgs == Decimal("22.75")
+
+    def test_bulk_add_milk_records_runs_constant_number_of_queries(self):
+        """
+        Test that the number of queries does not grow with the size of the milking session.
+        """
+        # The first session creates the milk inventory and the daily milk production of the cows
+        self.client.post(
+            reverse("dairy:milk-records-bulk"),
+            data=[{"cow": cow.id, "amount_in_kgs": "10.00"} for cow in self.lactating_cows],
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}",
+        )
+
+        with CaptureQueriesContext(connection) as small_session:
+            response = self.client.post(
+                reverse("dairy:milk-records-bulk"),
+                data=[{"cow": cow.id, "amount_in_kgs": "10.00"} for cow in self.lactating_cows],
+                format="json",
+                HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        with CaptureQueriesContext(connection) as large_session:
+            response = self.client.post(
+                reverse("dairy:milk-records-bulk"),
+                data=[
+                    {"cow": cow.id, "amount_in_kgs": "10.00"}
+                    for cow in self.lactating_cows * 5
+                ],
+                format="json",
+                HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["created"]) == 10
+
+        assert len(large_session.captured_queries) == len(
+            small_session.captured_queries
+        )
+
+    def test_bulk_add_milk_records_with_no_valid_entries(self):
+        """
+        Test that a milking session without any valid entry is rejected.
+        """
+        response = self.client.post(
+            reverse("dairy:milk-records-bulk"),
+            data=[{"cow": self.heifer.id, "amount_in_kgs": "8.00"}],
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["created"] == []
+        assert not Milk.objects.exists()
+
+    def test_bulk_add_milk_records_requires_a_list(self):
+        """
+        Test that the bulk endpoint rejects a payload that is not a list.
+        """
+        first_cow = self.lactating_cows[0]
+        response = self.client.post(
+            reverse("dairy:milk-records-bulk"),
+            data={"cow": first_cow.id, "amount_in_kgs": "8.00"},
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_add_milk_records_as_regular_user_permission_denied(self):
+        """
+        Test recording a milking session in bulk as a regular user (permission denied).
+        """
+        first_cow = self.lactating_cows[0]
+        response = self.client.post(
+            reverse("dairy:milk-records-bulk"),
+            data=[{"cow": first_cow.id, "amount_in_kgs": "8.00"}],
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.regular_user_token}",
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Milk.objects.exists()
+
+    def test_export_milk_records_as_csv(self, django_assert_max_num_queries):
+        """
+        Test streaming the milk records as CSV, filtered like the list endpoint.
+        """
+        first_cow, second_cow = self.lactating_cows
+        Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        Milk.objects.create(cow=second_cow, amount_in_kgs=Decimal("10.25"))
+
+        response = self.client.get(
+            reverse("dairy:milk-records-export"),
+            {"cow": first_cow.tag_number},
+            HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        assert response["Content-Disposition"].startswith('attachment; filename="milk-')
+
+        with django_assert_max_num_queries(1):
+            lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0] == "id,milking_date,cow,lactation,amount_in_kgs"
+        assert len(lines) == 2
+        assert lines[1].split(",")[2:] == [
+            first_cow.tag_number,
+            str(first_cow.lactations.get().id),
+            "12.50",
+        ]
+
+    def test_export_milk_records_with_invalid_filter(self):
+        """
+        Test exporting milk records with an invalid filter value.
+        """
+        response = self.client.get(
+            reverse("dairy:milk-records-export"),
+            {"month_of_milking": "march"},
+            HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "month_of_milking" in response.data["detail"]
+
+    def test_export_milk_records_as_regular_user_permission_denied(self):
+        """
+        Test exporting milk records as a regular user (permission denied).
+        """
+        response = self.client.get(
+            reverse("dairy:milk-records-export"),
+            HTTP_AUTHORIZATION=f"Token {self.regular_user_token}",
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_export_milk_command(self, tmp_path):
+        """
+        Test exporting the milk records of a month to a CSV file with the management command.
+        """
+        first_cow, second_cow = self.lactating_cows
+        Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        Milk.objects.create(cow=second_cow, amount_in_kgs=Decimal("10.25"))
+        export_path = tmp_path / "milk.csv"
+
+        out = StringIO()
+        call_command(
+            "export_milk",
+            str(export_path),
+            "--filter",
+            f"month_of_milking={todays_date().month}",
+            "--chunk-size",
+            "1",
+            stdout=out,
+        )
+
+        assert f"Exported 2 milk records to {export_path}" in out.getvalue()
+        lines = export_path.read_text().splitlines()
+        assert len(lines) == 3
+        assert {line.split(",")[-1] for line in lines[1:]} == {"12.50", "10.25"}
+
+    def test_export_milk_command_as_parquet(self, tmp_path):
+        """
+        Test exporting the milk records to a Parquet file and reading them back.
+        """
+        first_cow, second_cow = self.lactating_cows
+        Milk.objects.create(cow=first_cow, amount_in_kgs=Decimal("12.50"))
+        Milk.objects.create(cow=second_cow, amount_in_kgs=Decimal("10.25"))
+        export_path = tmp_path / "milk.parquet"
+
+        out = StringIO()
+        call_command("export_milk", str(export_path), "--chunk-size", "1", stdout=out)
+
+        assert f"Exported 2 milk records to {export_path}" in out.getvalue()
+        parquet_file = pq.ParquetFile(export_path)
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.read().to_pylist() == [
+            {
+                "id": milk.id,
+                "milking_date": milk.milking_date,
+                "cow": milk.cow.tag_number,
+                "lactation": milk.lactation_id,
+                "amount_in_kgs": milk.amount_in_kgs,
+            }
+            for milk in Milk.objects.order_by("milking_date", "id")
+        ]
+
+
+@pytest.mark.django_db
+class TestLactationCurves:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_milk_data):
+        self.client = setup_users["client"]
+
+        self.farm_manager_token = setup_users["farm_manager_token"]
+        self.regular_user_token = setup_users["regular_user_token"]
+
+        first_cow, second_cow = setup_milk_data["lactating_cows"]
+        self.first_lactation = first_cow.lactations.get()
+        self.second_lactation = second_cow.lactations.get()
+
+        # The first lactation follows Wood's curve exactly, the second only has a few records
+        self.record_daily_yields(
+            self.first_lactation,
+            {day: 20 * day**0.2 * 2.718281828 ** (-0.004 * day) for day in range(1, 100)},
+        )
+        self.record_daily_yields(self.second_lactation, {10: 15, 20: 18, 30: 16})
+
+    @staticmethod
+    def record_daily_yields(lactation, daily_yields):
+        noon = timezone.localtime().replace(hour=12, minute=0, second=0, microsecond=0)
+        milk_records = Milk.objects.bulk_create(
+            Milk(cow=lactation.cow, lactation=lactation, amount_in_kgs=Decimal(f"{amount:.2f}"))
+            for amount in daily_yields.values()
+        )
+        for milk, day in zip(milk_records, daily_yields):
+            milking_date = noon - timedelta(days=(todays_date() - lactation.start_date).days - day)
+            Milk.objects.filter(id=milk.id).update(milking_date=milking_date)
+
+    def test_lactation_curve_fits_woods_curve(self, django_assert_max_num_queries):
+        url = reverse("dairy:lactation-records-curve", kwargs={"pk": self.first_lactation.id})
+        with django_assert_max_num_queries(6):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["method"] == "wood"
+        assert response.data["days_recorded"] == 99
+        # The curve peaks at b / c = 50 days, the recorded yields are rounded so the next day may tie
+        assert response.data["days_to_peak"] in (50, 51)
+        assert response.data["wood_parameters"]["a"] == pytest.approx(20, rel=0.01)
+        assert response.data["wood_parameters"]["b"] == pytest.approx(0.2, rel=0.01)
+        assert response.data["wood_parameters"]["c"] == pytest.approx(0.004, rel=0.01)
+
+        expected_305_day_yield = sum(20 * day**0.2 * 2.718281828 ** (-0.004 * day) for day in range(1, 306))
+        assert response.data["yield_305_days"] == pytest.approx(expected_305_day_yield, rel=0.01)
+        assert 0 < response.data["persistency"] < 100
+        assert len(response.data["recorded"]) == 99
+        assert len(response.data["fitted"]) == 305
+
+    def test_lactation_curve_interpolates_sparse_records(self):
+        url = reverse("dairy:lactation-records-curve", kwargs={"pk": self.second_lactation.id})
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["method"] == "interpolation"
+        assert response.data["wood_parameters"] is None
+        assert response.data["peak_yield"] == 18
+        assert response.data["days_to_peak"] == 20
+        assert response.data["recorded"] == [[10, 15], [20, 18], [30, 16]]
+        assert len(response.data["fitted"]) == 30
+        assert response.data["persistency"] is None
+
+    def test_herd_lactation_curve_summary(self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(5):
+            response = self.client.get(
+                reverse("dairy:lactation-records-curve-summary"),
+                HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["lactations"] == 2
+        assert response.data["lactations_with_records"] == 2
+        assert {record["lactation"]: record["method"] for record in response.data["records"]} == {
+            self.first_lactation.id: "wood",
+            self.second_lactation.id: "interpolation",
+        }
+        assert response.data["average_peak_yield"] == pytest.approx(
+            (20 * 50**0.2 * 2.718281828 ** (-0.2) + 18) / 2, abs=0.01
+        )
+
+    def test_lactation_curve_as_regular_user_permission_denied(self):
+        url = reverse("dairy:lactation-records-curve", kwargs={"pk": self.first_lactation.id})
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Token {self.regular_user_token}")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestBreedingCalendar:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_milk_data):
+        self.client = setup_users["client"]
+
+        self.farm_worker_token = setup_users["farm_worker_token"]
+        self.regular_user_token = setup_users["regular_user_token"]
+
+        self.cow, self.other_cow = setup_milk_data["lactating_cows"]
+        # The pregnancy check is due in three days
+        self.start_date = todays_date() - timedelta(days=18)
+        Pregnancy.objects.create(cow=self.cow, start_date=self.start_date)
+
+    def get(self, url, token=None, **params):
+        return self.client.get(url, params, HTTP_AUTHORIZATION=f"Token {token or self.farm_worker_token}")
+
+    def test_work_list_defaults_to_the_coming_week(self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(4):
+            response = self.get(reverse("dairy:work-list-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [(event["cow_name"], event["event_type"], event["due_date"]) for event in response.data] == [
+            (self.cow.name, BreedingEventTypeChoices.PREGNANCY_CHECK, str(self.start_date + timedelta(days=21)))
+        ]
+
+    def test_work_list_for_a_date_range(self):
+        response = self.get(
+            reverse("dairy:work-list-list"),
+            start_date=todays_date() - timedelta(days=60),
+            end_date=todays_date() + timedelta(days=365),
+            event_type=f"{BreedingEventTypeChoices.HEAT_CHECK},{BreedingEventTypeChoices.CALVING}",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {(event["cow"], event["event_type"]) for event in response.data} == {
+            (self.other_cow.id, BreedingEventTypeChoices.HEAT_CHECK),
+            (self.cow.id, BreedingEventTypeChoices.CALVING),
+        }
+        due_dates = [event["due_date"] for event in response.data]
+        assert due_dates == sorted(due_dates)
+
+    def test_work_list_with_invalid_dates(self):
+        response = self.get(reverse("dairy:work-list-list"), start_date="not a date")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_ical_feed(self):
+        response = self.get(reverse("dairy:work-list-ical"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/calendar; charset=utf-8"
+        content = b"".join(response.streaming_content).decode()
+        assert content.startswith("BEGIN:VCALENDAR\r\n")
+        assert content.endswith("END:VCALENDAR\r\n")
+        assert content.count("BEGIN:VEVENT") == BreedingEvent.objects.filter(
+            due_date__range=(todays_date(), todays_date() + timedelta(days=365))
+        ).count()
+        due_date = self.start_date + timedelta(days=285)
+        assert f"DTSTART;VALUE=DATE:{due_date:%Y%m%d}" in content
+        assert f"SUMMARY:Calving: {self.cow.name} ({self.cow.tag_number})" in content
+
+    def test_work_list_as_regular_user_permission_denied(self):
+        response = self.get(reverse("dairy:work-list-list"), token=self.regular_user_token)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+
+@pytest.mark.django_db
+class TestDashboardCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_milk_data):
+        self.client = setup_users["client"]
+        self.lactating_cows = setup_milk_data["lactating_cows"]
+        self.heifer = setup_milk_data["heifer"]
+
+    def test_dashboard_is_served_from_cache_until_its_data_changes(self):
+        url = "/dairy/admin/dashboard/total-alive-cows"
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"total_alive_cows": 3}
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.data == {"total_alive_cows": 3}
+        assert len(queries) == 0
+
+        self.heifer.availability_status = CowAvailabilityChoices.DEAD
+        self.heifer.current_pregnancy_status = CowPregnancyChoices.UNAVAILABLE
+        self.heifer.date_of_death = todays_date()
+        self.heifer.save()
+        response = self.client.get(url)
+        assert response.data == {"total_alive_cows": 2}
+
+    def test_dashboard_is_invalidated_by_bulk_milk_records(self):
+        url = "/dairy/admin/dashboard/daily-milk-production"
+        assert self.client.get(url).data["total_milk_today"] == 0
+
+        Milk.manager.bulk_record([(0, {"cow": self.lactating_cows[0].id, "amount_in_kgs": Decimal("12.50")})])
+
+        assert self.client.get(url).data["total_milk_today"] == Decimal("12.50")
+
+    def test_dashboard_is_not_modified(self):
+        url = "/dairy/admin/dashboard/lactating-cows"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        assert response.data["lactating_cows_count"] == 2
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"] == etag
+        assert len(queries) == 0
+
+        Lactation.objects.filter(cow=self.lactating_cows[0]).get().delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["lactating_cows"] == [self.lactating_cows[1].name]
+
+
+@pytest.mark.django_db
+class TestAsyncDashboards:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_milk_data):
+        self.lactating_cows = setup_milk_data["lactating_cows"]
+
+    def test_dashboard_views_are_async(self):
+        for view in [
+            MilkTodayView,
+            TotalAliveCowsView,
+            TotalAliveFemaleCowsView,
+            TotalAliveMaleCowsView,
+            CowsMilkedTodayView,
+            MilkProductionWeeklyView,
+            PregnantCowsView,
+            LactatingCowsView,
+        ]:
+            assert view.view_is_async
+
+    def test_dashboard_over_asgi(self):
+        Milk.objects.create(cow=self.lactating_cows[0], amount_in_kgs=Decimal("12.50"))
+
+        response = async_to_sync(AsyncClient().get)("/dairy/admin/dashboard/milked-cows")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"cows_milked_today": 1, "cows_unmilked_today": 0}
+        entries = {entry.split(";")[0]: entry for entry in response["Server-Timing"].split(", ")}
+        assert entries["db"].endswith("2 queries\"")
+
+    def test_dashboard_rejects_unsafe_methods(self):
+        response = async_to_sync(AsyncClient().post)("/dairy/admin/dashboard/milked-cows")
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db(transaction=True)
+def test_gather_queries_runs_concurrently_outside_transactions(setup_milk_data):
+    # Each query waits for the other one to start, so they only finish if they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    used_connections = []
+
+    def count(model):
+        def query():
+            barrier.wait()
+            used_connections.append(connections["default"])
+            return model.objects.count()
+
+        return query
+
+    cows, lactations = async_to_sync(gather_queries)(count(Cow), count(Lactation))
+
+    assert (cows, lactations) == (3, 2)
+    assert len(set(map(id, used_connections))) == 2
+    assert connections["default"] not in used_connections
+
+
+@pytest.mark.django_db
+def test_gather_queries_runs_in_turn_inside_transactions(setup_milk_data):
+    used_connections = []
+
+    def count(model):
+        def query():
+            used_connections.append(connections["default"])
+            return model.objects.count()
+
+        return query
+
+    cows, lactations = async_to_sync(gather_queries)(count(Cow), count(Lactation))
+
+    assert (cows, lactations) == (3, 2)
+    assert used_connections == [connections["default"]] * 2
+
+
+@pytest.mark.django_db
+class TestRequestInstrumentation:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_cows):
+        self.client = setup_users["client"]
+        self.farm_owner_token = setup_users["farm_owner_token"]
+        self.cow_data = setup_cows
+
+    def add_cow(self, client):
+        return client.post(
+            reverse("dairy:cows-list"),
+            self.cow_data,
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+
+    def test_server_timing_header(self):
+        response = self.add_cow(self.client)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        entries = {entry.split(";")[0]: entry for entry in response["Server-Timing"].split(", ")}
+        assert entries["total"].startswith("total;dur=")
+        assert entries["db"].endswith(" queries\"")
+        assert any(name.startswith("receiver.") for name in entries)
+        assert any(name.startswith("CowValidator.") for name in entries)
+
+    def test_metrics(self):
+        self.add_cow(self.client)
+
+        response = self.client.get(reverse("metrics"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        content = response.content.decode()
+        assert 'efarm_http_requests_total{view="dairy:cows-list",method="POST",status="201"}' in content
+        assert '# TYPE efarm_http_request_duration_seconds histogram' in content
+        assert 'efarm_span_calls_total{span="receiver.update_cow_ancestry"}' in content
+
+    def test_metrics_outside_internal_ips(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.1")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_slow_request_log(self, settings, caplog):
+        settings.INSTRUMENTATION = {"SLOW_REQUEST_MS": 0}
+
+        with caplog.at_level("WARNING", logger="efarm.instrumentation"):
+            self.add_cow(APIClient())
+
+        [record] = caplog.records
+        assert record.request_timings["view"] == "dairy:cows-list"
+        assert record.request_timings["status"] == status.HTTP_201_CREATED
+        assert record.request_timings["queries"] > 0
+        assert json.loads(record.getMessage().split(" ", 2)[2]) == record.request_timings
+
+    def test_disabled(self, settings):
+        settings.INSTRUMENTATION = {"ENABLED": False}
+
+        response = self.add_cow(APIClient())
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert "Server-Timing" not in response
+
 @pytest.mark.django_db
 class TestWeightRecordViewSet:
     @pytest.fixture(autouse=True)
@@ -2483,6 +3536,91 @@ class TestWeightRecordViewSet:
         response = self.client.get(reverse("dairy:weight-records-list"), format="json")
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def _create_weight_records(self, count):
+        cow = Cow.objects.get(pk=self.weight_data["cow"])
+        WeightRecord.objects.create(cow=cow, weight_in_kgs=1150)
+        for name in ["Amber", "Bella", "Clover", "Daisy"][: count - 1]:
+            other_cow = Cow.objects.create(
+                name=name,
+                breed=cow.breed,
+                date_of_birth=cow.date_of_birth,
+                gender=cow.gender,
+                availability_status=cow.availability_status,
+                current_pregnancy_status=cow.current_pregnancy_status,
+                category=cow.category,
+                current_production_status=cow.current_production_status,
+            )
+            WeightRecord.objects.create(cow=other_cow, weight_in_kgs=1150)
+
+    def test_view_weight_records_with_cursor_pagination(self):
+        """
+        Test paging through weight records with a cursor.
+        """
+        self._create_weight_records(3)
+
+        response = self.client.get(
+            reverse("dairy:weight-records-list"),
+            {"page_size": 2},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
+        response = self.client.get(
+            response.data["next"],
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 1
+        assert response.data["next"] is None
+
+    def test_view_weight_records_without_page_size_returns_plain_list(self):
+        """
+        Test that weight records are returned as a plain list when no pagination is requested.
+        """
+        self._create_weight_records(3)
+
+        response = self.client.get(
+            reverse("dairy:weight-records-list"),
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == 3
+
+    def test_stream_weight_records_as_ndjson(self):
+        """
+        Test streaming weight records as newline-delimited JSON.
+        """
+        self._create_weight_records(3)
+
+        response = self.client.get(
+            reverse("dairy:weight-records-list"),
+            {"stream": "ndjson"},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 3
+        assert all(json.loads(line)["weight_in_kgs"] for line in lines)
+
+    def test_stream_weight_records_as_json_array(self):
+        """
+        Test streaming weight records as a JSON array.
+        """
+        self._create_weight_records(3)
+
+        response = self.client.get(
+            reverse("dairy:weight-records-list"),
+            {"stream": "json"},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        records = json.loads(b"".join(response.streaming_content))
+        assert len(records) == 3
+
     def test_delete_weight_record_as_farm_owner(self):
         """
         Test deleting weight record as a farm owner.
@@ -4233,6 +5371,33 @@ class TestCowPenMovementViewSet:
         assert response.status_code == status.HTTP_201_CREATED
         assert CowInPenMovement.objects.filter(new_pen=self.cow_in_pen_movement_data["new_pen"]).exists()
 
+    def test_add_cow_in_pen_movement_updates_inventories_in_the_background(self):
+        """
+        Test that adding a cow in pen movement only queues the inventory updates, which the worker applies.
+        """
+        from dairy.models import CowInBarnMovement
+        response = self.client.post(
+            reverse("dairy:cow-in-pen-movements-list"),
+            data=self.cow_in_pen_movement_data,
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+            format="json"
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Job.objects.filter(
+            task="dairy_inventory.apply_cow_in_pen_movements", status=JobStatusChoices.PENDING
+        ).count() == 1
+        new_pen = self.cow_in_pen_movement_data["new_pen"]
+        assert CowPenInventory.objects.get(pen=new_pen).number_of_cows == 0
+
+        assert run_batch() == 1
+
+        assert CowPenInventory.objects.get(pen=new_pen).number_of_cows == 1
+        assert BarnInventory.objects.get(barn=self.cow_pen_2.barn).number_of_cows == 1
+        assert CowInBarnMovement.objects.filter(
+            cow=self.cow_in_pen_movement_data["cow"], new_barn=self.cow_pen_2.barn
+        ).exists()
+        assert Job.objects.get().status == JobStatusChoices.DONE
+
     def test_add_cow_in_pen_movement_as_farm_manager(self):
         """
         Test add cow in pen movement by a farm manager.
@@ -4515,3 +5680,64 @@ class TestCowPenMovementViewSet:
         )
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert Barn.objects.filter(id=cow_pen.id).exists()
+
+
+@pytest.mark.django_db
+class TestInventoryConditionalGet:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users):
+        self.client = setup_users["client"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {setup_users['farm_owner_token']}")
+
+    def test_unchanged_inventory_is_not_modified(self):
+        MilkInventory.objects.apply_delta(Decimal("10.00"))
+        url = reverse("dairy_inventory:milk-dairy_inventory-list")
+
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert len(queries) == 1
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        MilkInventory.objects.apply_delta(Decimal("5.00"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]["total_amount_in_kgs"] == "15.00"
+        assert response["ETag"] != etag
+
+    def test_conditional_retrieve(self):
+        barn = Barn.objects.create(name="Barn A", capacity=10)
+        url = reverse("dairy_inventory:barn-inventory-cows-detail", args=[barn.barninventory.id])
+
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        missing_url = reverse("dairy_inventory:barn-inventory-cows-detail", args=[barn.barninventory.id + 1])
+        response = self.client.get(missing_url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_history_since(self):
+        for delta in ["1.00", "2.00", "3.00"]:
+            MilkInventory.objects.apply_delta(Decimal(delta))
+        first, second, third = MilkInventoryUpdateHistory.objects.order_by("id")
+        url = reverse("dairy_inventory:milkinventoryupdatehistory-list")
+
+        response = self.client.get(url, {"since": first.id})
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.data] == [second.id, third.id]
+
+        response = self.client.get(url, {"since": third.id})
+        assert response.data == []
+
+        response = self.client.get(url, {"since": "yesterday"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
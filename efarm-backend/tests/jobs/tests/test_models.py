@@ -0,0 +1,145 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs.backends import enqueue
+from jobs.choices import JobStatusChoices
+from jobs.models import Job
+from jobs.registry import task
+from jobs.worker import run_batch
+
+handled = []
+
+
+@task("tests.record_payloads")
+def record_payloads(payloads):
+    if any(payload.get("fail") for payload in payloads):
+        raise ValueError("Bad payload")
+    handled.append([payload["value"] for payload in payloads])
+
+
+@pytest.mark.django_db
+class TestJobQueue:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        handled.clear()
+        settings.JOBS = {"MAX_ATTEMPTS": 2, "RETRY_DELAY_SECONDS": 30}
+
+    def test_enqueue_is_idempotent(self):
+        assert Job.objects.enqueue("tests.record_payloads", {"value": 1}, key="record:1")
+        assert not Job.objects.enqueue("tests.record_payloads", {"value": 1}, key="record:1")
+        assert Job.objects.enqueue("tests.record_payloads", {"value": 2})
+        assert Job.objects.enqueue("tests.record_payloads", {"value": 2})
+
+        assert Job.objects.count() == 3
+
+    def test_jobs_run_in_batches(self):
+        for value in range(5):
+            Job.objects.enqueue("tests.record_payloads", {"value": value})
+
+        assert run_batch(batch_size=3) == 3
+        assert run_batch(batch_size=3) == 2
+        assert run_batch(batch_size=3) == 0
+
+        assert handled == [[0, 1, 2], [3, 4]]
+        assert set(Job.objects.values_list("status", flat=True)) == {JobStatusChoices.DONE}
+
+    def test_failing_job_does_not_block_its_batch(self):
+        Job.objects.enqueue("tests.record_payloads", {"value": 1})
+        Job.objects.enqueue("tests.record_payloads", {"value": 2, "fail": True})
+        Job.objects.enqueue("tests.record_payloads", {"value": 3})
+
+        assert run_batch() == 3
+
+        assert handled == [[1], [3]]
+        failed_job = Job.objects.get(status=JobStatusChoices.PENDING)
+        assert failed_job.payload["value"] == 2
+        assert failed_job.attempts == 1
+        assert "ValueError: Bad payload" in failed_job.last_error
+
+    def test_failing_job_is_retried_with_backoff_then_failed(self):
+        Job.objects.enqueue("tests.record_payloads", {"value": 1, "fail": True})
+
+        before = timezone.now()
+        run_batch()
+        job = Job.objects.get()
+        assert job.status == JobStatusChoices.PENDING
+        assert job.run_after >= before + timedelta(seconds=30)
+
+        # Not due before the backoff is over
+        assert run_batch() == 0
+
+        Job.objects.update(run_after=timezone.now())
+        run_batch()
+        job.refresh_from_db()
+        assert job.status == JobStatusChoices.FAILED
+        assert job.attempts == 2
+        assert job.finished_at is not None
+
+    def test_unknown_task_fails(self):
+        Job.objects.enqueue("tests.unknown", {})
+        Job.objects.update(attempts=1)
+
+        run_batch()
+
+        job = Job.objects.get()
+        assert job.status == JobStatusChoices.FAILED
+        assert "No handler is registered" in job.last_error
+
+    def test_stale_running_job_is_claimed_again(self):
+        Job.objects.enqueue("tests.record_payloads", {"value": 1})
+        Job.objects.update(
+            status=JobStatusChoices.RUNNING, attempts=1, started_at=timezone.now() - timedelta(hours=1)
+        )
+
+        assert run_batch() == 1
+        assert handled == [[1]]
+
+    def test_stale_running_job_fails_after_its_last_attempt(self):
+        Job.objects.enqueue("tests.record_payloads", {"value": 1})
+        Job.objects.update(
+            status=JobStatusChoices.RUNNING, attempts=2, started_at=timezone.now() - timedelta(hours=1)
+        )
+
+        assert run_batch() == 0
+        assert handled == []
+        job = Job.objects.get()
+        assert job.status == JobStatusChoices.FAILED
+        assert job.finished_at is not None
+        assert "still running" in job.last_error
+
+    def test_run_jobs_command(self):
+        Job.objects.enqueue("tests.record_payloads", {"value": 1})
+        Job.objects.enqueue("tests.record_payloads", {"value": 2})
+        out = StringIO()
+
+        call_command("run_jobs", "--once", "--batch-size", "1", stdout=out)
+
+        assert handled == [[1], [2]]
+        assert "Ran 2 jobs." in out.getvalue()
+
+    def test_purge_finished_jobs(self):
+        Job.objects.enqueue("tests.record_payloads", {"value": 1}, key="record:1")
+        run_batch()
+        Job.objects.update(finished_at=timezone.now() - timedelta(days=10))
+        out = StringIO()
+
+        call_command("run_jobs", "--purge-days", "7", stdout=out)
+
+        assert not Job.objects.exists()
+        assert "Deleted 1 finished jobs." in out.getvalue()
+        # The idempotency key can be used again
+        assert Job.objects.enqueue("tests.record_payloads", {"value": 1}, key="record:1")
+
+    def test_immediate_backend_runs_on_commit(self, settings, django_capture_on_commit_callbacks):
+        settings.JOBS = {"BACKEND": "jobs.backends.ImmediateBackend"}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert enqueue("tests.record_payloads", {"value": 1}, key="record:1")
+            assert handled == []
+
+        assert handled == [[1]]
+        assert not Job.objects.exists()
@@ -193,7 +193,7 @@ def setup_flock_data():
     flock_data = {
         "source": {"name": FlockSourceChoices.KEN_CHICK},
         "breed": {"name": FlockBreedTypeChoices.KENBRO},
-        "date_of_hatching": todays_date,
+        "date_of_hatching": todays_date(),
         "chicken_type": ChickenTypeChoices.LAYERS,
         "initial_number_of_birds": 300,
         "current_rearing_method": RearingMethodChoices.DEEP_LITTER,
@@ -217,7 +217,7 @@ def setup_flock_movement_data():
     flock_data = {
         "source": {"name": FlockSourceChoices.KEN_CHICK},
         "breed": {"name": FlockBreedTypeChoices.KENBRO},
-        "date_of_hatching": todays_date,
+        "date_of_hatching": todays_date(),
         "chicken_type": ChickenTypeChoices.LAYERS,
         "initial_number_of_birds": 300,
         "current_rearing_method": RearingMethodChoices.DEEP_LITTER,
@@ -262,7 +262,7 @@ def setup_flock_inspection_data():
     flock_data = {
         "source": {"name": FlockSourceChoices.KEN_CHICK},
         "breed": {"name": FlockBreedTypeChoices.KENBRO},
-        "date_of_hatching": todays_date - timedelta(weeks=3),
+        "date_of_hatching": todays_date() - timedelta(weeks=3),
         "chicken_type": ChickenTypeChoices.LAYERS,
         "initial_number_of_birds": 300,
         "current_rearing_method": RearingMethodChoices.DEEP_LITTER,
@@ -314,7 +314,7 @@ def setup_egg_collection_data():
     flock_data = {
         "source": {"name": FlockSourceChoices.KEN_CHICK},
         "breed": {"name": FlockBreedTypeChoices.KENBRO},
-        "date_of_hatching": todays_date - timedelta(weeks=14),
+        "date_of_hatching": todays_date() - timedelta(weeks=14),
         "chicken_type": ChickenTypeChoices.LAYERS,
         "initial_number_of_birds": 400,
         "current_rearing_method": RearingMethodChoices.DEEP_LITTER,
@@ -0,0 +1,18 @@
+import pytest
+
+from poultry.serializers import *
+
+
+@pytest.mark.django_db
+class TestHotQueryPlans:
+    def test_inspection_records_of_a_flock_by_date_use_index(self, assert_uses_index):
+        assert_uses_index(
+            FlockInspectionRecord.objects.filter(flock_id=1).order_by("date_of_inspection"),
+            "inspection_flock_date_idx",
+        )
+
+    def test_egg_collections_of_a_flock_on_a_day_use_index(self, assert_uses_index):
+        assert_uses_index(
+            EggCollection.objects.filter(flock_id=1, date_of_collection=todays_date()),
+            "egg_collection_flock_date_idx",
+        )
@@ -1,7 +1,16 @@
+import threading
+import time
+
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection
+from django.db.models.signals import pre_save
 from django.urls import reverse
 from rest_framework import status
 
+from jobs.choices import JobStatusChoices
+from jobs.models import Job
+from jobs.worker import run_batch
 from poultry.serializers import *
 from poultry_inventory.models import *
 
@@ -1583,6 +1592,64 @@ class TestFlockViewSet:
             assert len(response.data) == 1
 
 
+@pytest.mark.django_db
+class TestFlockImport:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users, setup_flock_data):
+        self.client = setup_users["client"]
+
+        self.farm_owner_token = setup_users["farm_owner_token"]
+        self.asst_farm_manager_token = setup_users["asst_farm_manager_token"]
+
+        flock_data = setup_flock_data["flock_data"]
+        header = (
+            "source,breed,date_of_hatching,chicken_type,initial_number_of_birds,"
+            "current_rearing_method,current_housing_structure\n"
+        )
+        row = (
+            f"{flock_data['source']['name']},{flock_data['breed']['name']},{flock_data['date_of_hatching']},"
+            f"{flock_data['chicken_type']},{{birds}},{flock_data['current_rearing_method']},{{housing}}\n"
+        )
+        housing_structure_id = flock_data["current_housing_structure"]
+        self.register = header + "".join(
+            [
+                row.format(birds=300, housing=housing_structure_id),
+                row.format(birds=150, housing=housing_structure_id),
+                row.format(birds=-5, housing=housing_structure_id),
+                row.format(birds=100, housing=housing_structure_id + 100),
+            ]
+        )
+
+    def upload(self, token):
+        return self.client.post(
+            reverse("poultry:flocks-import-register"),
+            {"file": SimpleUploadedFile("flocks.csv", self.register.encode())},
+            format="multipart",
+            HTTP_AUTHORIZATION=f"Token {token}",
+        )
+
+    def test_import_flocks(self):
+        response = self.upload(self.farm_owner_token)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 2
+        assert [rejection["row"] for rejection in response.data["rejected"]] == [4, 5]
+        assert "initial_number_of_birds" in response.data["rejected"][0]["errors"]
+        assert "current_housing_structure" in response.data["rejected"][1]["errors"]
+
+        assert Flock.objects.count() == 2
+        assert sorted(
+            FlockInventory.objects.values_list("number_of_alive_birds", flat=True)
+        ) == [150, 300]
+        assert FlockInventoryHistory.objects.count() == 2
+
+    def test_import_flocks_as_asst_farm_manager_permission_denied(self):
+        response = self.upload(self.asst_farm_manager_token)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Flock.objects.exists()
+
+
 @pytest.mark.django_db
 class TestFlockHistoryViewSet:
     @pytest.fixture(autouse=True)
@@ -2084,6 +2151,63 @@ class TestFlockInspectionViewSet:
         )
         assert response.status_code == status.HTTP_201_CREATED
 
+    def test_add_flock_inspection_updates_inventory_in_the_background(self):
+        """
+        Test that adding a flock inspection record only queues the flock inventory update, which the worker
+        applies.
+        """
+        response = self.client.post(
+            reverse("poultry:flock-inspection-records-list"),
+            data=self.flock_inspection_data,
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        flock_inventory = FlockInventory.objects.get(flock=self.flock_inspection_data["flock"])
+        history_count = flock_inventory.history.count()
+        assert flock_inventory.number_of_dead_birds == 0
+        assert Job.objects.get().idempotency_key == f"flock-inspection-record:{response.data['id']}:0"
+
+        assert run_batch() == 1
+
+        flock_inventory.refresh_from_db()
+        assert flock_inventory.number_of_alive_birds == 295
+        assert flock_inventory.number_of_dead_birds == 5
+        assert flock_inventory.history.count() == history_count + 1
+        assert Job.objects.get().status == JobStatusChoices.DONE
+
+    def test_edit_and_delete_flock_inspection_update_inventory(self):
+        """
+        Test that editing a flock inspection record outside the API, which rejects updates, queues only the change
+        in dead birds, and that deleting it brings its birds back to the alive count.
+        """
+        response = self.client.post(
+            reverse("poultry:flock-inspection-records-list"),
+            data=self.flock_inspection_data,
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+            format="json",
+        )
+        record_id = response.data["id"]
+
+        record = FlockInspectionRecord.objects.get(id=record_id)
+        record.number_of_dead_birds = 8
+        record.save()
+        assert run_batch() == 2
+        flock_inventory = FlockInventory.objects.get(flock=self.flock_inspection_data["flock"])
+        assert flock_inventory.number_of_alive_birds == 292
+        assert flock_inventory.number_of_dead_birds == 8
+
+        record.delete()
+        assert run_batch() == 1
+        flock_inventory.refresh_from_db()
+        assert flock_inventory.number_of_alive_birds == 300
+        assert flock_inventory.number_of_dead_birds == 0
+        assert sorted(Job.objects.values_list("idempotency_key", flat=True)) == [
+            f"flock-inspection-record:{record_id}:0",
+            f"flock-inspection-record:{record_id}:1",
+            f"flock-inspection-record:{record_id}:deleted",
+        ]
+
     def test_add_flock_movement_as_farm_manager(self):
         """
         Test add flock inspection data by a farm manager.
@@ -2793,6 +2917,120 @@ class TestEggCollectionViewSet:
             flock=self.egg_collection_data["flock"]
         ).exists()
 
+    def test_add_egg_collection_updates_egg_inventory_in_the_background(self):
+        """
+        Test that adding egg collection record only queues the egg inventory update, which the worker applies.
+        """
+        response = self.client.post(
+            reverse("poultry:egg-collection-list"),
+            data=self.egg_collection_data,
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not EggInventory.objects.exists()
+        assert Job.objects.get().task == "poultry_inventory.add_egg_collections"
+
+        assert run_batch() == 1
+
+        assert EggInventory.objects.get().total_egg_count == 76
+        assert EggInventoryHistory.objects.get().egg_count == 76
+
+    def test_edit_and_delete_egg_collection_update_egg_inventory(self):
+        """
+        Test that editing an egg collection record outside the API, which rejects updates, queues only the change
+        in intact eggs, and that deleting it removes its eggs from the egg inventory.
+        """
+        response = self.client.post(
+            reverse("poultry:egg-collection-list"),
+            data=self.egg_collection_data,
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        detail_url = reverse("poultry:egg-collection-detail", kwargs={"pk": response.data["id"]})
+
+        egg_collection = EggCollection.objects.get(id=response.data["id"])
+        egg_collection.collected_eggs = 90
+        egg_collection.broken_eggs = 2
+        egg_collection.save()
+        # Saving it unchanged queues nothing
+        egg_collection.save()
+        assert run_batch() == 2
+        assert EggInventory.objects.get().total_egg_count == 88
+
+        response = self.client.delete(detail_url, HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert run_batch() == 1
+        assert EggInventory.objects.get().total_egg_count == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_overlapping_edits_of_an_egg_collection_queue_both_changes(self):
+        """
+        Test that an edit which starts while another edit of the same egg collection is being saved waits for it,
+        so that each edit queues its own version and change.
+        """
+        egg_collection = EggCollection.objects.create(
+            flock_id=self.egg_collection_data["flock"], collected_eggs=80, broken_eggs=4
+        )
+        first_read = threading.Event()
+        second_read = threading.Event()
+
+        def pause_first_edit(sender, instance, **kwargs):
+            # Runs after the receiver that reads the stored collection. The first edit gives the second one time to
+            # read it too, which the second edit can only do once the first one committed
+            if threading.current_thread().name == "first":
+                first_read.set()
+                second_read.wait(1)
+            else:
+                second_read.set()
+
+        def edit(**changes):
+            collection = EggCollection.objects.get(pk=egg_collection.pk)
+            for name, value in changes.items():
+                setattr(collection, name, value)
+            if threading.current_thread().name == "second":
+                first_read.wait(5)
+            try:
+                # The in-memory test database fails at once rather than waiting for the write lock like a file does
+                for _ in range(100):
+                    try:
+                        collection.save()
+                        break
+                    except OperationalError:
+                        time.sleep(0.05)
+            finally:
+                connection.close()
+
+        pre_save.connect(pause_first_edit, sender=EggCollection)
+        try:
+            threads = [
+                threading.Thread(target=edit, name="first", kwargs={"collected_eggs": 90}),
+                threading.Thread(target=edit, name="second", kwargs={"broken_eggs": 10}),
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            pre_save.disconnect(pause_first_edit, sender=EggCollection)
+
+        keys = Job.objects.order_by("id").values_list("idempotency_key", flat=True)
+        assert list(keys) == [f"egg-collection:{egg_collection.pk}:{version}" for version in (0, 1, 2)]
+        assert run_batch() == 3
+        egg_collection.refresh_from_db()
+        assert egg_collection.version == 2
+        assert EggInventory.objects.get().total_egg_count == egg_collection.collected_eggs - egg_collection.broken_eggs
+
+    def test_edit_of_an_egg_collection_whose_version_was_queued_is_logged(self, caplog):
+        egg_collection = EggCollection.objects.create(
+            flock_id=self.egg_collection_data["flock"], collected_eggs=80, broken_eggs=4
+        )
+        Job.objects.enqueue("poultry_inventory.add_egg_collections", {}, f"egg-collection:{egg_collection.pk}:1")
+
+        egg_collection.broken_eggs = 10
+        egg_collection.save()
+
+        assert Job.objects.count() == 2
+        assert f"Egg collection {egg_collection.pk} version 1 was already queued" in caplog.text
+
     def test_add_egg_collection_as_farm_manager(self):
         """
         Test adding egg collection record by a farm manager
@@ -3074,3 +3312,40 @@ class TestEggCollectionViewSet:
         response = self.client.delete(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert EggCollection.objects.filter(id=egg_collection.id).exists()
+
+    def test_export_egg_collections_as_csv(self):
+        """
+        Test streaming the egg collection records as CSV.
+        """
+        self.client.post(
+            reverse("poultry:egg-collection-list"),
+            data=self.egg_collection_data,
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+
+        response = self.client.get(
+            reverse("poultry:egg-collection-export"),
+            {"month_of_collection": todays_date().month},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv"
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0] == "id,date_of_collection,time_of_collection,flock,collected_eggs,broken_eggs"
+        assert len(lines) == 2
+        assert lines[1].split(",")[-3:] == [
+            str(self.egg_collection_data["flock"]),
+            str(self.egg_collection_data["collected_eggs"]),
+            str(self.egg_collection_data["broken_eggs"]),
+        ]
+
+    def test_export_egg_collections_as_regular_user_permission_denied(self):
+        """
+        Test exporting egg collection records as a regular user (permission denied).
+        """
+        response = self.client.get(
+            reverse("poultry:egg-collection-export"),
+            HTTP_AUTHORIZATION=f"Token {self.regular_user_token}",
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -53,3 +53,86 @@ class TestUserCreation:
         assert superuser.is_staff
         assert superuser.is_superuser
         assert superuser.is_active
+
+
+@pytest.mark.django_db
+class TestUserRoleRank:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = User.objects.create_user(
+            username='rankeduser',
+            first_name='Ranked',
+            last_name='User',
+            phone_number='+254712345674',
+            sex=SexChoices.FEMALE,
+            password='testpassword'
+        )
+
+    def test_new_user_is_a_regular_user(self):
+        assert self.user.role_rank == RoleChoices.REGULAR_USER
+        assert self.user.get_role() == "Regular User"
+
+    def test_role_rank_follows_role_assignments(self):
+        self.user.assign_team_leader()
+        self.user.refresh_from_db()
+        assert self.user.role_rank == RoleChoices.TEAM_LEADER
+        assert self.user.get_role() == "Team Leader"
+
+        self.user.assign_farm_manager()
+        self.user.refresh_from_db()
+        assert self.user.role_rank == RoleChoices.FARM_MANAGER
+        assert self.user.has_minimum_role(RoleChoices.ASSISTANT_FARM_MANAGER)
+        assert not self.user.has_minimum_role(RoleChoices.FARM_OWNER)
+
+        self.user.dismiss_farm_manager()
+        self.user.refresh_from_db()
+        assert self.user.role_rank == RoleChoices.REGULAR_USER
+
+    def test_role_rank_is_saved_with_update_fields(self):
+        self.user.is_farm_owner = True
+        self.user.save(update_fields=['is_farm_owner'])
+        self.user.refresh_from_db()
+        assert self.user.role_rank == RoleChoices.FARM_OWNER
+
+
+@pytest.mark.django_db
+class TestUsernameGeneration:
+
+    def create_user(self, username, phone_number):
+        return User.objects.create_user(
+            username=username,
+            first_name='John',
+            last_name='Kamau',
+            phone_number=phone_number,
+            sex=SexChoices.MALE,
+            password='testpassword'
+        )
+
+    def test_generate_username_when_free(self):
+        assert User.generate_username('John', 'Kamau') == 'john-kamau'
+
+    def test_generate_username_continues_after_highest_suffix(
+        self, django_assert_num_queries
+    ):
+        self.create_user('john-kamau', '+254712345601')
+        self.create_user('john-kamau-4', '+254712345602')
+        self.create_user('john-kamau-otieno', '+254712345603')
+
+        with django_assert_num_queries(1):
+            assert User.generate_username('John', 'Kamau') == 'john-kamau-5'
+
+    def test_generate_usernames_in_one_pass(self, django_assert_num_queries):
+        self.create_user('john-kamau', '+254712345604')
+
+        names = [('John', 'Kamau'), ('Mary', 'Wanjiku'), ('John', 'Kamau'), ('Mary', 'Wanjiku')]
+        with django_assert_num_queries(1):
+            usernames = User.generate_usernames(names)
+
+        assert usernames == ['john-kamau-1', 'mary-wanjiku', 'john-kamau-2', 'mary-wanjiku-1']
+
+    def test_taken_usernames_use_unique_index(self, assert_uses_index, unique_index_name):
+        assert_uses_index(
+            User.objects.get_taken_usernames(['john-kamau', 'mary-wanjiku']),
+            unique_index_name(User, 'username'),
+        )
@@ -1,7 +1,12 @@
 import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 
+from users.authentication import CachedTokenAuthentication, token_cache
 from users.models import *
 
 
@@ -172,6 +177,62 @@ class TestRoleAssignments:
             == f"User {self.regular_user_username} has been assigned as a farm worker."
         )
 
+    def test_assign_farm_worker_in_bulk(self, django_assert_max_num_queries):
+        crew = [
+            CustomUser.objects.create_user(
+                username=f"seasonal-worker-{index}",
+                password="testpassword",
+                first_name="Seasonal",
+                last_name="Worker",
+                phone_number=f"+2547100000{index:02d}",
+                sex=SexChoices.FEMALE,
+            )
+            for index in range(30)
+        ]
+        user_ids = [user.id for user in crew] + ["99999", "abc"]
+
+        with django_assert_max_num_queries(6):
+            response = self.client.post(
+                reverse("users:assign-farm-worker"),
+                {"user_ids": user_ids},
+                HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["message"].startswith("Users seasonal-worker-0, seasonal-worker-1,")
+        assert response.data["error"] == "User with ID 99999 was not found."
+        assert response.data["invalid"] == "The ID abc is invalid."
+        assert CustomUser.objects.filter(
+            id__in=[user.id for user in crew],
+            is_farm_worker=True,
+            role_rank=RoleChoices.FARM_WORKER,
+        ).count() == 30
+
+    def test_assign_to_self_in_bulk_changes_nobody(self):
+        user_ids = [self.regular_user_id, self.farm_owner_user_id]
+        response = self.client.post(
+            reverse("users:assign-farm-manager"),
+            {"user_ids": user_ids},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not CustomUser.objects.get(id=self.regular_user_id).is_farm_manager
+
+    def test_dismiss_team_leader_keeps_farm_worker_role(self):
+        self.client.post(
+            reverse("users:assign-team-leader"),
+            {"user_ids": [self.regular_user_id]},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        response = self.client.post(
+            reverse("users:dismiss-team-leader"),
+            {"user_ids": [self.regular_user_id]},
+            HTTP_AUTHORIZATION=f"Token {self.farm_owner_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        user = CustomUser.objects.get(id=self.regular_user_id)
+        assert not user.is_team_leader
+        assert user.role_rank == RoleChoices.FARM_WORKER
+
     def test_assign_farm_manager_permission_denied(self):
         user_ids = [self.regular_user_id]
         response = self.client.post(
@@ -288,3 +349,85 @@ class TestRoleAssignments:
         )
         assert response.status_code == status.HTTP_200_OK
         assert response.data["error"] == "User with ID '99' was not found."
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    @pytest.fixture(autouse=True)
+    def setup(self, setup_users):
+        self.client = setup_users["client"]
+
+        self.farm_owner_token = setup_users["farm_owner_token"]
+        self.farm_manager_token = setup_users["farm_manager_token"]
+        self.farm_worker_token = setup_users["farm_worker_token"]
+        self.farm_worker_user_id = setup_users["farm_worker_user_id"]
+
+    def get_me(self, token):
+        return self.client.get("/auth/users/me/", HTTP_AUTHORIZATION=f"Token {token}")
+
+    def test_cached_token_skips_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_me(self.farm_worker_token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any("authtoken_token" in query["sql"] for query in queries)
+
+    def test_token_is_cached_in_the_shared_cache(self, settings):
+        settings.TOKEN_CACHE = {"CACHE": "default"}
+        self.get_me(self.farm_worker_token)
+        token_cache.clear()
+        assert self.get_me(self.farm_worker_token).status_code == status.HTTP_200_OK
+
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_me(self.farm_worker_token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any("authtoken_token" in query["sql"] for query in queries)
+        caches["default"].clear()
+
+    def test_cached_user_is_copied_with_a_state_of_its_own(self):
+        authentication = CachedTokenAuthentication()
+        first_user, _ = authentication.authenticate_credentials(self.farm_worker_token)
+        first_user._state.fields_cache["related"] = object()
+
+        second_user, _ = authentication.authenticate_credentials(self.farm_worker_token)
+        assert second_user.id == first_user.id
+        assert second_user is not first_user
+        assert second_user._state is not first_user._state
+        assert "related" not in second_user._state.fields_cache
+
+    def test_logout_invalidates_token(self):
+        response = self.client.post(
+            reverse("users:logout"), HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}"
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        assert self.get_me(self.farm_worker_token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deleted_token_is_rejected(self):
+        Token.objects.filter(key=self.farm_worker_token).delete()
+
+        assert self.get_me(self.farm_worker_token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deactivated_user_is_rejected(self):
+        user = CustomUser.objects.get(id=self.farm_worker_user_id)
+        user.is_active = False
+        user.save()
+
+        assert self.get_me(self.farm_worker_token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_dismissal_applies_to_the_next_request(self):
+        work_list_url = reverse("dairy:work-list-list")
+        response = self.client.get(work_list_url, HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}")
+        assert response.status_code == status.HTTP_200_OK
+
+        response = self.client.post(
+            reverse("users:dismiss-farm-worker"),
+            {"user_ids": [self.farm_worker_user_id]},
+            HTTP_AUTHORIZATION=f"Token {self.farm_manager_token}",
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = self.client.get(work_list_url, HTTP_AUTHORIZATION=f"Token {self.farm_worker_token}")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,137 @@
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+from efarm.conf import get_app_setting
+
+DEFAULTS = {
+    # How long a token stays cached in the shared cache, in seconds
+    "TTL": 300,
+    # How long a token stays cached in the process. Invalidations only drop the token from the process that made
+    # them and from the shared cache, so with several worker processes a deleted token, or a user whose roles
+    # changed, is still accepted as before by the other processes for up to this long, whether or not a shared
+    # cache is set. Lower it to narrow that window at the cost of more database queries.
+    "LOCAL_TTL": 30,
+    # The number of tokens cached in the process
+    "MAX_SIZE": 1024,
+    # The alias of a Django cache shared by all processes, or `None` to only cache in the process
+    "CACHE": None,
+}
+
+
+def get_setting(name):
+    return get_app_setting("TOKEN_CACHE", name, DEFAULTS)
+
+
+def copy_user(user):
+    """
+    Returns a shallow copy of `user` with a state of its own, so that related objects loaded or prefetched on the
+    copy are never shared with the cached user.
+    """
+    user_copy = copy.copy(user)
+    user_copy._state = copy.copy(user._state)
+    user_copy._state.fields_cache = {}
+    user_copy.__dict__.pop("_prefetched_objects_cache", None)
+    return user_copy
+
+
+def get_cache_key(token_key):
+    # Shared caches never see the token itself
+    return "token-auth:" + hashlib.sha256(token_key.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    A two-level cache of authenticated `(user, token)` pairs: a least recently used map in the process, in front
+    of an optional shared Django cache.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.entries = OrderedDict()
+
+    def get(self, token_key):
+        cache_key = get_cache_key(token_key)
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self.entries.move_to_end(cache_key)
+                    return entry[0]
+                del self.entries[cache_key]
+
+        shared_cache = self.get_shared_cache()
+        if shared_cache is not None:
+            credentials = shared_cache.get(cache_key)
+            if credentials is not None:
+                self.set_local(cache_key, credentials)
+                return credentials
+        return None
+
+    def set(self, token_key, credentials):
+        cache_key = get_cache_key(token_key)
+        self.set_local(cache_key, credentials)
+        shared_cache = self.get_shared_cache()
+        if shared_cache is not None:
+            shared_cache.set(cache_key, credentials, get_setting("TTL"))
+
+    def set_local(self, cache_key, credentials):
+        expires_at = time.monotonic() + min(get_setting("LOCAL_TTL"), get_setting("TTL"))
+        with self.lock:
+            self.entries[cache_key] = (credentials, expires_at)
+            self.entries.move_to_end(cache_key)
+            while len(self.entries) > get_setting("MAX_SIZE"):
+                self.entries.popitem(last=False)
+
+    def invalidate(self, token_keys):
+        cache_keys = [get_cache_key(token_key) for token_key in token_keys]
+        with self.lock:
+            for cache_key in cache_keys:
+                self.entries.pop(cache_key, None)
+        shared_cache = self.get_shared_cache()
+        if shared_cache is not None and cache_keys:
+            shared_cache.delete_many(cache_keys)
+
+    def invalidate_users(self, user_ids):
+        """
+        Drops the cached tokens of the given users, e.g. after their roles changed.
+        """
+        from rest_framework.authtoken.models import Token
+
+        self.invalidate(Token.objects.filter(user_id__in=user_ids).values_list("key", flat=True))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    @staticmethod
+    def get_shared_cache():
+        alias = get_setting("CACHE")
+        return caches[alias] if alias else None
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the user of each token, so that authenticating a request with a cached
+    token does not query the database.
+
+    Tokens are dropped from the cache when they are deleted, when their user logs out or is saved, and when the
+    roles of their user change, see `users.signals` and `CustomUserManager.change_roles`. The cached user is
+    copied for every request, so attributes set on `request.user` never leak into other requests.
+    """
+
+    def authenticate_credentials(self, key):
+        credentials = token_cache.get(key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            token_cache.set(key, credentials)
+        user, token = credentials
+        return copy_user(user), token
@@ -4,3 +4,16 @@ from django.db import models
 class SexChoices(models.TextChoices):
     MALE = 'Male'
     FEMALE = 'Female'
+
+
+class RoleChoices(models.IntegerChoices):
+    """
+    The farm roles ranked from the least to the most privileged, so that a role check is a single
+    comparison against the minimum role an action requires.
+    """
+    REGULAR_USER = 0, 'Regular User'
+    FARM_WORKER = 1, 'Farm Worker'
+    TEAM_LEADER = 2, 'Team Leader'
+    ASSISTANT_FARM_MANAGER = 3, 'Assistant Farm Manager'
+    FARM_MANAGER = 4, 'Farm Manager'
+    FARM_OWNER = 5, 'Farm Owner'
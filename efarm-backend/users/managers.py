@@ -0,0 +1,153 @@
+from django.contrib.auth.models import UserManager
+from django.db import transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from users.choices import RoleChoices
+
+
+class CustomUserManager(UserManager):
+    """
+    Custom manager for the CustomUser model.
+
+    Methods:
+    - `resolve_user_ids(user_ids)`: Resolves a list of submitted user IDs with a single query.
+    - `change_roles(users, **role_flags)`: Sets the role flags of many users with one update per resulting role.
+    - `generate_username(first_name, last_name)`: Generates a unique username from a user's names.
+    - `generate_usernames(names)`: Generates unique usernames for many new users in one pass.
+    """
+
+    def resolve_user_ids(self, user_ids):
+        """
+        Resolves a list of submitted user IDs with a single `in_bulk` query.
+
+        Args:
+        - `user_ids`: The user IDs as submitted, usually strings.
+
+        Returns:
+        - `tuple`: The `(user_id, user)` pairs found in submission order, the IDs that were not found and the
+                   IDs that are invalid.
+        """
+        candidate_ids = set()
+        for user_id in user_ids:
+            try:
+                candidate_ids.add(int(user_id))
+            except ValueError:
+                continue
+        users = self.in_bulk(candidate_ids)
+
+        found_users = []
+        not_found_ids = []
+        invalid_ids = []
+        for user_id in user_ids:
+            try:
+                user = users.get(int(user_id))
+            except ValueError:
+                user = None
+
+            if user is not None:
+                found_users.append((user_id, user))
+            elif str(user_id).isdigit():
+                not_found_ids.append(user_id)
+            else:
+                invalid_ids.append(user_id)
+
+        return found_users, not_found_ids, invalid_ids
+
+    def change_roles(self, users, **role_flags):
+        """
+        Sets the given role flags on many users.
+
+        The role rank each user ends up with is worked out in memory, so the change costs one `UPDATE` per
+        resulting role instead of a validated `save()` per user. The cached tokens of the users are invalidated
+        afterwards, so their new roles apply to their next request.
+
+        Args:
+        - `users`: The users to change.
+        - `role_flags`: The role flags to set, e.g. `is_farm_worker=True`.
+
+        Returns:
+        - `int`: The number of users updated.
+        """
+        from users.authentication import token_cache
+
+        user_ids_by_rank = {}
+        for user in users:
+            for flag, value in role_flags.items():
+                setattr(user, flag, value)
+            user.role_rank = user.get_role_rank()
+            user_ids_by_rank.setdefault(user.role_rank, set()).add(user.id)
+
+        updated = 0
+        with transaction.atomic():
+            for role_rank, user_ids in user_ids_by_rank.items():
+                updated += self.filter(id__in=user_ids).update(
+                    role_rank=RoleChoices(role_rank), **role_flags
+                )
+
+        # `update()` sends no signals, so the cached tokens of the users are dropped here
+        token_cache.invalidate_users([user.id for user in users])
+        return updated
+
+    def generate_username(self, first_name, last_name):
+        """
+        Generates a unique username from a user's first name and last name.
+
+        Args:
+        - `first_name`: The first name of the user.
+        - `last_name`: The last name of the user.
+
+        Returns:
+        - `str`: The slug of the names, suffixed with a counter if the slug is already taken.
+        """
+        return self.generate_usernames([(first_name, last_name)])[0]
+
+    def get_taken_usernames(self, base_usernames):
+        """
+        Returns the usernames that are one of `base_usernames` or one of them followed by a hyphen and a suffix.
+
+        The suffixed usernames of a base are looked up as a range of the unique username index: SQLite compiles
+        `startswith` to a case-insensitive LIKE, which no index serves.
+        """
+        lookup = Q()
+        for base_username in base_usernames:
+            lookup |= Q(username=base_username) | Q(
+                username__gt=f"{base_username}-", username__lt=f"{base_username}-\uffff"
+            )
+        return self.filter(lookup).values_list("username", flat=True)
+
+    def generate_usernames(self, names):
+        """
+        Generates unique usernames for many new users in one pass.
+
+        The usernames already taken for every base slug are read with a single query, and each new user gets the
+        base slug if it is free or the next counter after the highest one in use.
+
+        Args:
+        - `names`: The `(first_name, last_name)` pairs of the new users.
+
+        Returns:
+        - `list`: The usernames, in the same order as `names`.
+        """
+        base_usernames = [slugify(f"{first_name}-{last_name}") for first_name, last_name in names]
+        if not base_usernames:
+            return []
+
+        bases = set(base_usernames)
+        taken = set()
+        last_suffixes = {}
+        for username in self.get_taken_usernames(bases).iterator():
+            taken.add(username)
+            base_username, separator, suffix = username.rpartition("-")
+            if separator and suffix.isdigit() and base_username in bases:
+                last_suffixes[base_username] = max(last_suffixes.get(base_username, 0), int(suffix))
+
+        usernames = []
+        for base_username in base_usernames:
+            username = base_username
+            while username in taken:
+                last_suffixes[base_username] = last_suffixes.get(base_username, 0) + 1
+                username = f"{base_username}-{last_suffixes[base_username]}"
+            taken.add(username)
+            usernames.append(username)
+        return usernames
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+def backfill_role_ranks(apps, schema_editor):
+    CustomUser = apps.get_model("users", "CustomUser")
+
+    # Least privileged role first, so that each user ends up with the rank of their highest role
+    role_ranks = [
+        ("is_farm_worker", 1),
+        ("is_team_leader", 2),
+        ("is_assistant_farm_manager", 3),
+        ("is_farm_manager", 4),
+        ("is_farm_owner", 5),
+    ]
+    for flag, role_rank in role_ranks:
+        CustomUser.objects.filter(**{flag: True}).update(role_rank=role_rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='role_rank',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Regular User'), (1, 'Farm Worker'), (2, 'Team Leader'), (3, 'Assistant Farm Manager'), (4, 'Farm Manager'), (5, 'Farm Owner')], default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_role_ranks, migrations.RunPython.noop),
+    ]
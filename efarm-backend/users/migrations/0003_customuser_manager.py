@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2026-10-17 20:31
+
+import users.managers
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_customuser_role_rank'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='customuser',
+            managers=[
+                ('objects', users.managers.CustomUserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 01:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_username_prefix_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_username_prefix_idx',
+        ),
+    ]
@@ -1,8 +1,8 @@
 from django.contrib.auth.models import AbstractUser
-from django.utils.text import slugify
 from phonenumber_field.modelfields import PhoneNumberField
 
 from users.choices import *
+from users.managers import CustomUserManager
 from users.validators import *
 
 
@@ -27,6 +27,8 @@ class CustomUser(AbstractUser):
         - `is_assistant_farm_manager`: A boolean field representing whether the user is an assistant farm manager.
         - `is_team_leader`: A boolean field representing whether the user is a team leader.
         - `is_farm_worker`: A boolean field representing whether the user is a farm worker.
+        - `role_rank`: The rank of the most privileged role the user holds, as defined in `RoleChoices`.
+                       It is derived from the role flags on every save and is what permission checks compare.
 
         Methods:
         - `assign_farm_owner()`: Assigns the user as a farm owner and updates related fields accordingly.
@@ -41,12 +43,15 @@ class CustomUser(AbstractUser):
         - `dismiss_farm_worker()`: Dismisses the user from the farm worker role.
         - `get_full_name()`: Returns the full name of the user.
         - `get_role()`: Returns the role of the user based on their assigned roles.
+        - `get_role_rank()`: Computes the role rank of the user from the role flags.
+        - `has_minimum_role(minimum_role)`: Checks whether the user's role rank is at least `minimum_role`.
         - `get_farm_workers()`: Retrieves all farm workers
         - `get_team_leaders()`: Retrieves all team leaders
         - `get_assistant_farm_managers()`: Retrieves all assistant farm managers
         - `get_farm_managers()`: Retrieves all farm managers
         - `get_farm_owners()`: Retrieves all farm owners
         - `generate_username(first_name, last_name)`: Generates a unique username based on the user's first name and last name.
+        - `generate_usernames(names)`: Generates unique usernames for many `(first_name, last_name)` pairs in one pass.
 
         """
     username = models.CharField(max_length=45, unique=True)
@@ -59,6 +64,11 @@ class CustomUser(AbstractUser):
     is_assistant_farm_manager = models.BooleanField(default=False)
     is_team_leader = models.BooleanField(default=False)
     is_farm_worker = models.BooleanField(default=False)
+    role_rank = models.PositiveSmallIntegerField(
+        choices=RoleChoices.choices, default=RoleChoices.REGULAR_USER, editable=False
+    )
+
+    objects = CustomUserManager()
 
     REQUIRED_FIELDS = ['first_name', 'last_name', 'phone_number', 'sex']
 
@@ -97,7 +107,7 @@ class CustomUser(AbstractUser):
     def assign_farm_worker(self):
         self.is_farm_owner = False
         self.is_farm_manager = False
-        self.is_asst_farm_manager = False
+        self.is_assistant_farm_manager = False
         self.is_team_leader = False
         self.is_farm_worker = True
         self.save()
@@ -128,18 +138,26 @@ class CustomUser(AbstractUser):
 
     def get_role(self):
         """Return the role of the user."""
+        return RoleChoices(self.role_rank).label
+
+    def get_role_rank(self):
+        """Return the rank of the most privileged role held by the user."""
         if self.is_farm_owner:
-            return "Farm Owner"
+            return RoleChoices.FARM_OWNER
         elif self.is_farm_manager:
-            return "Farm Manager"
+            return RoleChoices.FARM_MANAGER
         elif self.is_assistant_farm_manager:
-            return "Assistant Farm Manager"
+            return RoleChoices.ASSISTANT_FARM_MANAGER
         elif self.is_team_leader:
-            return "Team Leader"
+            return RoleChoices.TEAM_LEADER
         elif self.is_farm_worker:
-            return "Farm Worker"
+            return RoleChoices.FARM_WORKER
         else:
-            return "Regular User"
+            return RoleChoices.REGULAR_USER
+
+    def has_minimum_role(self, minimum_role):
+        """Return whether the user holds `minimum_role` or a more privileged role."""
+        return self.role_rank >= minimum_role
 
     def get_farm_workers(self):
         return CustomUser.objects.filter(is_farm_worker=True)
@@ -165,15 +183,16 @@ class CustomUser(AbstractUser):
 
     def save(self, *args, **kwargs):
         self.clean()
+        self.role_rank = self.get_role_rank()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "role_rank" not in update_fields:
+            kwargs["update_fields"] = {*update_fields, "role_rank"}
         super().save(*args, **kwargs)
 
+    @staticmethod
     def generate_username(first_name, last_name):
-        base_username = slugify(f"{first_name}-{last_name}")
-        username = base_username
-        counter = 1
-
-        while CustomUser.objects.filter(username=username).exists():
-            username = f"{base_username}-{counter}"
-            counter += 1
+        return CustomUser.objects.generate_username(first_name, last_name)
 
-        return username
+    @staticmethod
+    def generate_usernames(names):
+        return CustomUser.objects.generate_usernames(names)
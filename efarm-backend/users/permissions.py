@@ -1,106 +1,131 @@
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
 from rest_framework.permissions import BasePermission
 
+from users.choices import RoleChoices
 
-class IsFarmOwner(BasePermission):
+
+class RolePermission(BasePermission):
     """
-    Custom permission class that allows only farm owners to perform an action.
+    Base permission class that allows users holding at least `minimum_role` to perform an action.
+
+    The user's role rank is stored on the user and loaded together with the token, so a check is a single
+    integer comparison and never touches the database.
+
+    Attributes:
+    - `minimum_role`: The least privileged role, from `RoleChoices`, allowed to perform the action.
+    - `message`: The response body used when the user's role is not privileged enough.
+    - `authentication_message`: The response body used when the user is not authenticated. When None,
+                                unauthenticated users are denied with `message` instead.
 
     Raises:
-    - `PermissionDenied`: If the user is not a farm owner.
+    - `AuthenticationFailed`: If the user is not authenticated and `authentication_message` is set.
+    - `PermissionDenied`: If the user's role is below `minimum_role`.
 
     Usage:
-        Add the permission class to the view or viewset that requires farm owners access:
-        permission_classes = [IsFarmOwner]
+        Subclass it with the minimum role and message of the action:
+        class CanAddCow(RolePermission):
+            minimum_role = RoleChoices.FARM_MANAGER
+            message = {"message": "Only farm owners and managers have permission to perform this action."}
     """
 
-    message = {"message": "Only farm owners have permission to perform this action."}
+    minimum_role = RoleChoices.REGULAR_USER
+    message = {"message": "You do not have permission to perform this action."}
+    authentication_message = {"message": "Authentication credentials were not provided."}
 
-    def has_permission(self, request, view):
-        # Check if the current user is a farm owner
-        if request.user.is_authenticated and request.user.is_farm_owner:
+    @classmethod
+    def check_role(cls, user):
+        if user.is_authenticated and user.has_minimum_role(cls.minimum_role):
             return True
-        raise PermissionDenied(self.message)
+        if not user.is_authenticated and cls.authentication_message:
+            raise AuthenticationFailed(cls.authentication_message)
+        raise PermissionDenied(cls.message)
+
+    def has_permission(self, request, view):
+        return self.check_role(request.user)
 
 
-class IsFarmManager(BasePermission):
+class HasActionRole(BasePermission):
     """
-    Custom permission class that allows only farm owners and managers to perform an action.
+    Permission class that checks the role permission declared for the current action of a viewset.
 
-    Raises:
-    - `PermissionDenied`: If the user is not a farm owner or a farm manager.
+    The viewset declares an `action_permissions` table mapping action names to `RolePermission` classes, with a
+    `"default"` entry for every other action.
 
     Usage:
-        Add the permission class to the view or viewset that requires farm owners and managers access:
-        permission_classes = [IsFarmManager]
+        permission_classes = [HasActionRole]
+        action_permissions = {
+            "create": CanAddCow,
+            "destroy": CanDeleteCow,
+            "default": CanViewCow,
+        }
     """
-    message = {"message": "Only farm owners and managers have permission to perform this action."}
 
     def has_permission(self, request, view):
-        # Check if the current user is a farm manager
-        if request.user.is_authenticated and (request.user.is_farm_manager or request.user.is_farm_owner):
-            return True
-        raise PermissionDenied(self.message)
+        action_permissions = view.action_permissions
+        permission = action_permissions.get(view.action, action_permissions["default"])
+        return permission.check_role(request.user)
 
 
-class IsAssistantFarmManager(BasePermission):
+class IsFarmOwner(RolePermission):
     """
-    Custom permission class that allows only farm owners, managers, and assistants to perform an action.
-
-    Raises:
-    - `PermissionDenied`: If the user is not a farm owner, a farm manager, or an assistant farm manager.
+    Custom permission class that allows only farm owners to perform an action.
 
     Usage:
-        Add the permission class to the view or viewset that requires farm owners, managers, and assistants access:
-        permission_classes = [IsAssistantFarmManager]
+        permission_classes = [IsFarmOwner]
     """
-    message = {"message": "Only farm owners, managers, and assistants have permission to perform this action."}
 
-    def has_permission(self, request, view):
-        # Check if the current user is an assistant farm manager
-        if request.user.is_authenticated and (request.user.is_assistant_farm_manager or request.user.is_farm_manager
-                                              or request.user.is_farm_owner):
-            return True
-        raise PermissionDenied(self.message)
+    minimum_role = RoleChoices.FARM_OWNER
+    message = {"message": "Only farm owners have permission to perform this action."}
+    authentication_message = None
 
 
-class IsFarmWorker(BasePermission):
+class IsFarmManager(RolePermission):
     """
-    Custom permission class that allows only farm staff and workers to perform an action.
-
-    Raises:
-    - `PermissionDenied`: If the user is not a farm owner, a farm worker, a farm manager, or an assistant farm manager.
+    Custom permission class that allows only farm owners and managers to perform an action.
 
     Usage:
-        Add the permission class to the view or viewset that requires farm workers access:
-        permission_classes = [IsFarmWorker]
+        permission_classes = [IsFarmManager]
     """
-    message = {"message": "Only farm staff and workers have permission to perform this action."}
 
-    def has_permission(self, request, view):
-        # Check if the current user is a farm worker
-        if request.user.is_authenticated and (request.user.is_farm_owner or request.user.is_farm_worker or
-                                              request.user.is_farm_manager or request.user.is_assistant_farm_manager):
-            return True
-        raise PermissionDenied(self.message)
+    minimum_role = RoleChoices.FARM_MANAGER
+    message = {"message": "Only farm owners and managers have permission to perform this action."}
+    authentication_message = None
+
 
+class IsAssistantFarmManager(RolePermission):
+    """
+    Custom permission class that allows only farm owners, managers, and assistants to perform an action.
 
-class IsTeamLeader(BasePermission):
+    Usage:
+        permission_classes = [IsAssistantFarmManager]
     """
-    Custom permission class that allows only team leaders to perform an action.
 
-    Raises:
-    - `PermissionDenied`: If the user is not a team leader, an assistant farm manager, a farm manager, or a farm owner.
+    minimum_role = RoleChoices.ASSISTANT_FARM_MANAGER
+    message = {"message": "Only farm owners, managers, and assistants have permission to perform this action."}
+    authentication_message = None
+
+
+class IsTeamLeader(RolePermission):
+    """
+    Custom permission class that allows only team leaders and farm management to perform an action.
 
     Usage:
-        Add the permission class to the view or viewset that requires team leaders access:
         permission_classes = [IsTeamLeader]
     """
+
+    minimum_role = RoleChoices.TEAM_LEADER
     message = {"message": "Only team leaders have permission to perform this action."}
+    authentication_message = None
 
-    def has_permission(self, request, view):
-        # Check if the current user is a team leader
-        if request.user.is_authenticated and (request.user.is_team_leader or request.user.is_assistant_farm_manager
-                                              or request.user.is_farm_manager or request.user.is_farm_owner):
-            return True
-        raise PermissionDenied(self.message)
+
+class IsFarmWorker(RolePermission):
+    """
+    Custom permission class that allows only farm staff and workers to perform an action.
+
+    Usage:
+        permission_classes = [IsFarmWorker]
+    """
+
+    minimum_role = RoleChoices.FARM_WORKER
+    message = {"message": "Only farm staff and workers have permission to perform this action."}
+    authentication_message = None
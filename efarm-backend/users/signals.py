@@ -0,0 +1,37 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from rest_framework.authtoken.models import Token
+
+from efarm.instrumentation import receiver
+from users.authentication import token_cache
+from users.models import CustomUser
+
+LOGIN_FIELDS = {"last_login", "role_rank"}
+
+
+@receiver(post_save, sender=Token)
+def cache_created_token(sender, instance, created, **kwargs):
+    # The token is created when its user logs in, so the first authenticated request already hits the cache
+    if created and instance.user.is_active:
+        token_cache.set(instance.key, (instance.user, instance))
+
+
+@receiver(post_delete, sender=Token)
+def uncache_deleted_token(sender, instance, **kwargs):
+    token_cache.invalidate([instance.key])
+
+
+@receiver(user_logged_out)
+def uncache_logged_out_token(sender, request, user, **kwargs):
+    # djoser deletes the tokens of the user on logout, drop the one of the request even if that changes
+    token = getattr(request, "auth", None)
+    if isinstance(token, Token):
+        token_cache.invalidate([token.key])
+
+
+@receiver(post_save, sender=CustomUser)
+def uncache_tokens_of_saved_user(sender, instance, created, update_fields, **kwargs):
+    # Roles, permissions or the active flag of the user may have changed; logging in only updates `last_login`,
+    # along with the `role_rank` that `CustomUser.save()` always recomputes
+    if not created and not (update_fields and update_fields <= LOGIN_FIELDS):
+        token_cache.invalidate_users([instance.pk])
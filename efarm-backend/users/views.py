@@ -32,135 +32,117 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         return CustomUserSerializer
 
 
-class AssignFarmOwnerView(APIView):
+class RoleChangeView(APIView):
     """
-    API View to assign the farm owner role to selected users.
+    Base API View that assigns or dismisses a role for a list of users in one pass.
 
-    Only authenticated users with farm owner permission can access this view.
+    All submitted IDs are resolved with a single query and the role flags are applied with one update per
+    resulting role, so the cost of a request does not grow with the number of users.
 
-    The view accepts a POST request with a list of user IDs in the request body
-    and assigns the farm owner role to the corresponding users.
-
-    If successful, it returns a response with a message indicating the users
-    who have been assigned the farm owner role. If any user ID is not found or
-    is invalid, appropriate error messages are returned in the response.
+    Subclasses declare:
+    - `role_flags`: The role flags set on every selected user.
+    - `role_name` and `role_name_plural`: The role as named in the response messages.
+    - `role_article`: The article used with `role_name`, "a" by default.
+    - `change_verb`: Either "assigned" or "dismissed".
+    - `self_change_message`: The error raised when the requesting user is among the selected users.
+    - `quote_single_ids`: Whether a single not found or invalid ID is quoted in the response messages.
 
     """
-    permission_classes = [IsFarmOwner]
+    role_flags = {}
+    role_name = None
+    role_name_plural = None
+    role_article = "a"
+    change_verb = "assigned"
+    self_change_message = "Cannot assign roles to yourself."
+    quote_single_ids = False
 
     def post(self, request):
         user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        assigned_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
 
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot assign roles to yourself.")
+        found_users, not_found_ids, invalid_ids = CustomUser.objects.resolve_user_ids(user_ids)
+        if any(user.id == request.user.id for user_id, user in found_users):
+            raise ValidationError(self.self_change_message)
 
-                user.assign_farm_owner()
-                assigned_users.append(user.username)
+        CustomUser.objects.change_roles([user for user_id, user in found_users], **self.role_flags)
+        changed_users = [user.username for user_id, user in found_users]
 
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
+        return Response(self.get_response_data(changed_users, not_found_ids, invalid_ids), status=status.HTTP_200_OK)
 
+    def get_response_data(self, changed_users, not_found_ids, invalid_ids):
         response_data = {}
 
-        if assigned_users:
-            if len(assigned_users) > 1:
-                response_data['message'] = f"Users {', '.join(assigned_users)} have been assigned as farm owners."
+        if changed_users:
+            if len(changed_users) > 1:
+                response_data['message'] = (f"Users {', '.join(changed_users)} have been {self.change_verb} as "
+                                            f"{self.role_name_plural}.")
             else:
-                response_data['message'] = f"User {assigned_users[0]} has been assigned as a farm owner."
+                response_data['message'] = (f"User {changed_users[0]} has been {self.change_verb} as "
+                                            f"{self.role_article} {self.role_name}.")
 
         if not_found_ids:
             if len(not_found_ids) > 1:
                 response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
             else:
-                response_data['error'] = f"User with ID {not_found_ids[0]} was not found."
+                response_data['error'] = f"User with ID {self.format_single_id(not_found_ids[0])} was not found."
 
         if invalid_ids:
             if len(invalid_ids) > 1:
                 response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
             else:
-                response_data['invalid'] = f"The ID {invalid_ids[0]} is invalid."
+                response_data['invalid'] = f"The ID {self.format_single_id(invalid_ids[0])} is invalid."
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return response_data
 
+    def format_single_id(self, user_id):
+        if self.quote_single_ids:
+            return f"'{user_id}'"
+        return user_id
 
-class AssignFarmManagerView(APIView):
+
+class AssignFarmOwnerView(RoleChangeView):
     """
-    API View to assign the farm manager role to selected users.
+    API View to assign the farm owner role to selected users.
 
     Only authenticated users with farm owner permission can access this view.
 
     The view accepts a POST request with a list of user IDs in the request body
-    and assigns the farm manager role to the corresponding users.
+    and assigns the farm owner role to the corresponding users.
 
     If successful, it returns a response with a message indicating the users
-    who have been assigned the farm manager role. If any user ID is not found
-    or is invalid, appropriate error messages are returned in the response.
+    who have been assigned the farm owner role. If any user ID is not found or
+    is invalid, appropriate error messages are returned in the response.
 
     """
     permission_classes = [IsFarmOwner]
+    role_flags = dict(is_farm_owner=True, is_farm_manager=False, is_assistant_farm_manager=False,
+                      is_team_leader=False, is_farm_worker=False)
+    role_name = "farm owner"
+    role_name_plural = "farm owners"
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        assigned_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot assign roles to yourself.")
-
-                user.assign_farm_manager()
-                assigned_users.append(user.username)
-
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
 
-        response_data = {}
+class AssignFarmManagerView(RoleChangeView):
+    """
+    API View to assign the farm manager role to selected users.
 
-        if assigned_users:
-            if len(assigned_users) > 1:
-                response_data['message'] = f"Users {', '.join(assigned_users)} have been assigned as farm managers."
-            else:
-                response_data['message'] = f"User {assigned_users[0]} has been assigned as a farm manager."
+    Only authenticated users with farm owner permission can access this view.
 
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID '{not_found_ids[0]}' was not found."
+    The view accepts a POST request with a list of user IDs in the request body
+    and assigns the farm manager role to the corresponding users.
 
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID '{invalid_ids[0]}' is invalid."
+    If successful, it returns a response with a message indicating the users
+    who have been assigned the farm manager role. If any user ID is not found
+    or is invalid, appropriate error messages are returned in the response.
 
-        return Response(response_data, status=status.HTTP_200_OK)
+    """
+    permission_classes = [IsFarmOwner]
+    role_flags = dict(is_farm_owner=False, is_farm_manager=True, is_assistant_farm_manager=False,
+                      is_team_leader=False, is_farm_worker=False)
+    role_name = "farm manager"
+    role_name_plural = "farm managers"
+    quote_single_ids = True
 
 
-class AssignAssistantFarmManagerView(APIView):
+class AssignAssistantFarmManagerView(RoleChangeView):
     """
     API View to assign the assistant farm manager role to selected users.
 
@@ -175,57 +157,14 @@ class AssignAssistantFarmManagerView(APIView):
 
     """
     permission_classes = [IsFarmOwner]
+    role_flags = dict(is_farm_owner=False, is_farm_manager=False, is_assistant_farm_manager=True,
+                      is_team_leader=False, is_farm_worker=False)
+    role_name = "assistant farm manager"
+    role_name_plural = "assistant farm managers"
+    role_article = "an"
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        assigned_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot assign roles to yourself.")
-
-                user.assign_assistant_farm_manager()
-                assigned_users.append(user.username)
 
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if assigned_users:
-            if len(assigned_users) > 1:
-                response_data[
-                    'message'] = f"Users {', '.join(assigned_users)} have been assigned as assistant farm managers."
-            else:
-                response_data['message'] = f"User {assigned_users[0]} has been assigned as an assistant farm manager."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID {not_found_ids[0]} was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID {invalid_ids[0]} is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
-
-
-class AssignTeamLeaderView(APIView):
+class AssignTeamLeaderView(RoleChangeView):
     """
     API View to assign the team leader role to selected users.
 
@@ -240,56 +179,14 @@ class AssignTeamLeaderView(APIView):
 
     """
     permission_classes = [IsAssistantFarmManager]
+    role_flags = dict(is_farm_owner=False, is_farm_manager=False, is_assistant_farm_manager=False,
+                      is_team_leader=True, is_farm_worker=True)
+    role_name = "team leader"
+    role_name_plural = "team leaders"
+    quote_single_ids = True
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        assigned_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot assign roles to yourself.")
-
-                user.assign_team_leader()
-                assigned_users.append(user.username)
-
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if assigned_users:
-            if len(assigned_users) > 1:
-                response_data['message'] = f"Users {', '.join(assigned_users)} have been assigned as team leaders."
-            else:
-                response_data['message'] = f"User {assigned_users[0]} has been assigned as a team leader."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID '{not_found_ids[0]}' was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID '{invalid_ids[0]}' is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
 
-
-class AssignFarmWorkerView(APIView):
+class AssignFarmWorkerView(RoleChangeView):
     """
     API View to assign the farm worker role to selected users.
 
@@ -304,56 +201,13 @@ class AssignFarmWorkerView(APIView):
 
     """
     permission_classes = [IsFarmManager]
+    role_flags = dict(is_farm_owner=False, is_farm_manager=False, is_assistant_farm_manager=False,
+                      is_team_leader=False, is_farm_worker=True)
+    role_name = "farm worker"
+    role_name_plural = "farm workers"
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        assigned_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot assign roles to yourself.")
-
-                user.assign_farm_worker()
-                assigned_users.append(user.username)
 
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if assigned_users:
-            if len(assigned_users) > 1:
-                response_data['message'] = f"Users {', '.join(assigned_users)} have been assigned as farm workers."
-            else:
-                response_data['message'] = f"User {assigned_users[0]} has been assigned as a farm worker."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID {not_found_ids[0]} was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID {invalid_ids[0]} is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
-
-
-class DismissFarmManagerView(APIView):
+class DismissFarmManagerView(RoleChangeView):
     """
     API View to dismiss the farm manager role from selected users.
 
@@ -368,56 +222,15 @@ class DismissFarmManagerView(APIView):
 
     """
     permission_classes = [IsFarmOwner]
+    role_flags = dict(is_farm_manager=False)
+    change_verb = "dismissed"
+    self_change_message = "Cannot dismiss yourself."
+    role_name = "farm manager"
+    role_name_plural = "farm managers"
+    quote_single_ids = True
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        dismissed_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot dismiss yourself.")
-
-                user.dismiss_farm_manager()
-                dismissed_users.append(user.username)
-
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if dismissed_users:
-            if len(dismissed_users) > 1:
-                response_data['message'] = f"Users {', '.join(dismissed_users)} have been dismissed as farm managers."
-            else:
-                response_data['message'] = f"User {dismissed_users[0]} has been dismissed as a farm manager."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID '{not_found_ids[0]}' was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID '{invalid_ids[0]}' is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
 
-
-class DismissAssistantFarmManagerView(APIView):
+class DismissAssistantFarmManagerView(RoleChangeView):
     """
     API View to dismiss the assistant farm manager role from selected users.
 
@@ -432,57 +245,15 @@ class DismissAssistantFarmManagerView(APIView):
 
     """
     permission_classes = [IsFarmOwner]
+    role_flags = dict(is_assistant_farm_manager=False)
+    change_verb = "dismissed"
+    self_change_message = "Cannot dismiss yourself."
+    role_name = "assistant farm manager"
+    role_name_plural = "assistant farm managers"
+    role_article = "an"
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        dismissed_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot dismiss yourself.")
-
-                user.dismiss_assistant_farm_manager()
-                dismissed_users.append(user.username)
-
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if dismissed_users:
-            if len(dismissed_users) > 1:
-                response_data[
-                    'message'] = f"Users {', '.join(dismissed_users)} have been dismissed as assistant farm managers."
-            else:
-                response_data['message'] = f"User {dismissed_users[0]} has been dismissed as an assistant farm manager."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID {not_found_ids[0]} was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID {invalid_ids[0]} is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
 
-
-class DismissTeamLeaderView(APIView):
+class DismissTeamLeaderView(RoleChangeView):
     """
     API View to dismiss the team leader role from selected users.
 
@@ -497,61 +268,15 @@ class DismissTeamLeaderView(APIView):
 
     """
     permission_classes = [IsAssistantFarmManager]
+    role_flags = dict(is_team_leader=False)
+    change_verb = "dismissed"
+    self_change_message = "Cannot dismiss yourself."
+    role_name = "team leader"
+    role_name_plural = "team leaders"
+    quote_single_ids = True
 
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        dismissed_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                try:
-                    user_id_int = int(user_id)
-                except ValueError:
-                    invalid_ids.append(user_id)
-                    continue
-
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot dismiss yourself.")
-
-                user.dismiss_team_leader()
-                dismissed_users.append(user.username)
-
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if dismissed_users:
-            if len(dismissed_users) > 1:
-                response_data['message'] = f"Users {', '.join(dismissed_users)} have been dismissed as team leaders."
-            else:
-                response_data['message'] = f"User {dismissed_users[0]} has been dismissed as a team leader."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID '{not_found_ids[0]}' was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID '{invalid_ids[0]}' is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
 
-
-class DismissFarmWorkerView(APIView):
+class DismissFarmWorkerView(RoleChangeView):
     """
     API View to dismiss the farm worker role from selected users.
 
@@ -566,53 +291,11 @@ class DismissFarmWorkerView(APIView):
 
     """
     permission_classes = [IsFarmManager]
-
-    def post(self, request):
-        user_ids = request.data.getlist('user_ids', [])
-        current_user_id = request.user.id
-
-        dismissed_users = []
-        not_found_ids = []
-        invalid_ids = []
-
-        for user_id in user_ids:
-            try:
-                user_id_int = int(user_id)
-                user = CustomUser.objects.get(id=user_id_int)
-
-                if user.id == current_user_id:
-                    raise ValidationError("Cannot dismiss yourself.")
-
-                user.dismiss_farm_worker()
-                dismissed_users.append(user.username)
-
-            except (ValueError, CustomUser.DoesNotExist):
-                if user_id.isdigit():
-                    not_found_ids.append(user_id)
-                else:
-                    invalid_ids.append(user_id)
-
-        response_data = {}
-
-        if dismissed_users:
-            if len(dismissed_users) > 1:
-                response_data['message'] = f"Users {', '.join(dismissed_users)} have been dismissed as farm workers."
-            else:
-                response_data['message'] = f"User {dismissed_users[0]} has been dismissed as a farm worker."
-
-        if not_found_ids:
-            if len(not_found_ids) > 1:
-                response_data['error'] = f"Users with the following IDs were not found: {', '.join(not_found_ids)}."
-            else:
-                response_data['error'] = f"User with ID {not_found_ids[0]} was not found."
-
-        if invalid_ids:
-            if len(invalid_ids) > 1:
-                response_data['invalid'] = f"The following IDs are invalid: {', '.join(invalid_ids)}."
-            else:
-                response_data['invalid'] = f"The ID {invalid_ids[0]} is invalid."
-
-        return Response(response_data, status=status.HTTP_200_OK)
+    role_flags = dict(is_farm_worker=False)
+    change_verb = "dismissed"
+    self_change_message = "Cannot dismiss yourself."
+    role_name = "farm worker"
+    role_name_plural = "farm workers"
 
 
 class GenerateUsernameSlugAPIView(APIView):